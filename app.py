@@ -2,7 +2,7 @@
 
 Responsibilities:
     - Load environment (.env), config, and logging.
-    - Initialize CSRF protection, DB (schema + pragmas), and blueprints.
+    - Initialize CSRF protection, DB (schema + pragmas + connection pool), blueprints and CLI commands.
     - Provide common Jinja filters/context (e.g., ``fmt_ts``, ``today``, version)
     - Register friendly error handlers (404/500, CSRF).
 """
@@ -16,8 +16,10 @@ from flask import Flask, flash, g, redirect, render_template, request, url_for
 from flask_wtf import CSRFProtect
 from flask_wtf.csrf import CSRFError, generate_csrf
 
-from db import ensure_pragmas, init_db
+from commands import register_commands
+from db import ensure_pragmas, init_db, release_database
 from routes import register_routes
+from utils import zip_index
 from utils.config import Config
 from utils.logger import setup_logger
 from utils.version import __version__
@@ -71,7 +73,7 @@ def fmt_ts(value):
 def create_app():
     """Create and configure the Flask application.
 
-    Sets up configuration, CSRF protection, logging, DB initialization, Jinja filters/context, error handlers, and registers all blueprints.
+    Sets up configuration, CSRF protection, logging, DB initialization, Jinja filters/context, error handlers, and registers all blueprints and CLI commands.
 
     Raises:
         RuntimeError: SECRET_KEY must be set in production.
@@ -121,17 +123,21 @@ def create_app():
 
     init_db()
     ensure_pragmas()
+    zip_index.warm()
 
     @app.teardown_appcontext
-    def close_db(_exc):
-        """Commit/rollback and close any DB connection stored on ``g``."""
+    def close_db(exc):
+        """Commit/rollback any DB connection stored on ``g`` and return it to the pool."""
         db = g.pop("db", None)
         if db is not None:
             try:
-                db.commit()
+                if exc is None:
+                    db.commit()
+                else:
+                    db.rollback()
             except Exception:
                 db.rollback()
-            db.close()
+            release_database(db)
 
     @app.context_processor
     def inject_globals():
@@ -144,6 +150,7 @@ def create_app():
         return {"APP_VERSION": __version__}
 
     register_routes(app)
+    register_commands(app)
 
     return app
 
@@ -0,0 +1,163 @@
+"""Benchmark: automatic technician assignment for a month of unassigned jobs.
+
+Builds a throwaway database through the normal migrations, loads a synthetic assigned history plus time off, locks and two-man jobs, adds a month of unassigned jobs, then times ``utils.auto_assign.solve`` and ``apply`` and reports how evenly the load was spread.
+
+Usage:
+    python bench/bench_assign.py [--jobs 2000] [--techs 30] [--history 20000] [--runs 5]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db  # noqa: E402
+from utils import auto_assign  # noqa: E402
+
+
+def build(
+    path: str, month: date, jobs: int, techs: int, history: int, seed: int
+) -> None:
+    """Create the schema at ``path`` and load a schedule around ``month``."""
+    db.DATABASE = path
+    db.init_db()
+    rng = random.Random(seed)
+    conn = db._connect()
+    conn.executemany(
+        "INSERT INTO technicians (name) VALUES (?)",
+        [(f"Tech {i}",) for i in range(techs)],
+    )
+    first = month - timedelta(days=365 * 2)
+
+    def slot():
+        if rng.random() < 0.4:
+            return None, None
+        h = rng.randrange(7, 16)
+        return f"{h:02d}:00", f"{h + rng.choice((1, 2, 3)):02d}:00"
+
+    def span():
+        return rng.choice((0, 0, 0, 0, 0, 1, 1, 2))
+
+    def history_rows():
+        for _ in range(history):
+            sd = first + timedelta(days=rng.randrange(365 * 2 + 60))
+            st, et = slot()
+            yield (
+                "History job",
+                sd.isoformat(),
+                (sd + timedelta(days=span())).isoformat(),
+                st,
+                et,
+                rng.randrange(1, techs + 1),
+                0,
+            )
+
+    def month_rows():
+        for i in range(jobs):
+            sd = month + timedelta(days=rng.randrange(28))
+            st, et = slot()
+            two_man = int(i % 50 == 0)
+            yield (
+                "Unassigned job",
+                sd.isoformat(),
+                (sd + timedelta(days=span())).isoformat(),
+                st,
+                et,
+                None,
+                two_man,
+            )
+
+    sql = "INSERT INTO jobs (title, start_date, end_date, start_time, end_time, technician_id, two_man) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    conn.executemany(sql, history_rows())
+    conn.executemany(sql, month_rows())
+    off = []
+    for t in range(1, techs + 1):
+        for _ in range(3):
+            sd = month + timedelta(days=rng.randrange(-10, 35))
+            off.append(
+                (
+                    t,
+                    sd.isoformat(),
+                    (sd + timedelta(days=rng.randrange(4))).isoformat(),
+                    "vacation",
+                )
+            )
+    conn.executemany(
+        "INSERT INTO time_off (technician_id, start_date, end_date, reason) VALUES (?, ?, ?, ?)",
+        off,
+    )
+    conn.executemany(
+        "INSERT INTO locks (date) VALUES (?)",
+        [((month + timedelta(days=d)).isoformat(),) for d in (3, 17)],
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--techs", type=int, default=30)
+    parser.add_argument("--history", type=int, default=20_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    month = date.today().replace(day=1) + timedelta(days=32)
+    month = month.replace(day=1)
+    end = (month + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        build(
+            str(Path(tmp) / "bench.sqlite3"),
+            month,
+            args.jobs,
+            args.techs,
+            args.history,
+            args.seed,
+        )
+        print(
+            f"loaded {args.history:,} history + {args.jobs:,} unassigned jobs in {time.perf_counter() - started:.1f}s"
+        )
+        conn = db._connect()
+
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            plan = auto_assign.solve(conn, month, end)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(
+            f"solve {month:%Y-%m}: p50 {statistics.median(timings):.0f} ms   max {max(timings):.0f} ms"
+        )
+        reasons = {}
+        for reason in plan.left.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+        print(
+            f"  assigned {len(plan.assignments):,} of {len(plan.jobs):,}; left {reasons or 'none'}"
+        )
+        added = [plan.load_after[t] - plan.load_before[t] for t in plan.technicians]
+        after = list(plan.load_after.values())
+        print(
+            f"  job-days per tech after: min {min(after)}  max {max(after)}  stdev {statistics.pstdev(after):.1f}"
+            f"   (added min {min(added)}  max {max(added)})"
+        )
+
+        started = time.perf_counter()
+        applied, rejected = auto_assign.apply(conn, plan.assignments, month, end)
+        conn.commit()
+        print(
+            f"apply: {len(applied):,} written, {len(rejected)} rejected in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark: ``start_day``/``end_day`` index overlap vs. the ``job_days`` fan-out.
+
+Builds a throwaway database through the normal migrations, loads a synthetic multi-year job history, then times the month-grid and single-day overlap queries: the span predicate on the 0003 indexes, and the ``job_days`` range scan that ``calendar.index`` / ``calendar.day_view`` use.
+
+Usage:
+    python bench/bench_overlap.py [--jobs 500000] [--years 10] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db  # noqa: E402
+
+
+def build(path: str, jobs: int, years: int, seed: int) -> None:
+    """Create the schema at ``path`` and insert ``jobs`` synthetic rows."""
+    db.DATABASE = path
+    db.init_db()
+    rng = random.Random(seed)
+    first = date.today().replace(month=1, day=1) - timedelta(days=365 * years)
+    horizon = 365 * years + 365
+    conn = db._connect()
+    conn.executemany(
+        "INSERT INTO technicians (name) VALUES (?)",
+        [(f"Tech {i}",) for i in range(30)],
+    )
+
+    def rows():
+        for _ in range(jobs):
+            sd = first + timedelta(days=rng.randrange(horizon))
+            # Mostly single/short jobs, with a tail of long fumigations/exclusions.
+            span = (
+                rng.choice((0, 0, 0, 0, 1, 1, 2, 3, 5))
+                if rng.random() < 0.97
+                else rng.randrange(7, 45)
+            )
+            yield (
+                "Bench job",
+                sd.isoformat(),
+                (sd + timedelta(days=span)).isoformat(),
+                rng.randrange(1, 31),
+            )
+
+    started = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO jobs (title, start_date, end_date, technician_id) VALUES (?, ?, ?, ?)",
+        rows(),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    print(f"loaded {jobs:,} jobs in {time.perf_counter() - started:.1f}s")
+
+
+QUERIES = {
+    "btree": """
+        SELECT j.id, j.title, j.start_date, j.end_date, t.name
+        FROM jobs j
+        LEFT JOIN technicians t ON t.id = j.technician_id
+        WHERE j.start_day <= :hi AND j.end_day >= :lo
+    """,
+    "fan-out": """
+        SELECT jd.day, j.id, j.title, j.start_date, j.end_date, t.name
+        FROM job_days jd
+        JOIN jobs j ON j.id = jd.job_id
+        LEFT JOIN technicians t ON t.id = j.technician_id
+        WHERE jd.day BETWEEN :lo AND :hi
+        ORDER BY jd.day
+    """,
+}
+
+
+def time_queries(conn, windows, sql: str) -> list[float]:
+    """Run ``sql`` for each ``(lo, hi)`` window; return per-query ms."""
+    timings = []
+    for lo, hi in windows:
+        started = time.perf_counter()
+        conn.execute(sql, {"lo": lo, "hi": hi}).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    """Print p50/p95/max for a list of millisecond timings."""
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"  {label:<8} p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms   max {timings[-1]:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build(str(Path(tmp) / "bench.sqlite3"), args.jobs, args.years, args.seed)
+        conn = db._connect()
+        rng = random.Random(args.seed + 1)
+        today = date.today().toordinal()
+        span = 365 * args.years
+        starts = [today - rng.randrange(span) for _ in range(args.queries)]
+        cases = {
+            "month grid (42 days)": [(s, s + 41) for s in starts],
+            "single day": [(s, s) for s in starts],
+        }
+        for name, windows in cases.items():
+            print(name)
+            for label, sql in QUERIES.items():
+                time_queries(conn, windows[:10], sql)  # warm cache
+                report(label, time_queries(conn, windows, sql))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Flask CLI commands for ExTerminus.
+
+Run with ``flask --app app <command>``.
+
+Provides:
+    - ``import-jobs PATH``: bulk-import jobs from a CSV or JSONL file.
+    - ``archive-jobs``: move finished jobs, time off and locks into yearly archive databases.
+    - ``backup-db``: take a compressed, verified online snapshot of the database.
+"""
+
+from pathlib import Path
+
+import click
+from flask import g
+
+from db import get_database, release_database
+from utils import archive, audit, backup
+from utils.job_import import import_jobs, read_rows
+
+
+def _flush_audit() -> None:
+    """Commit and hand back the command's writer connection, then wait for the audit log.
+
+    The audit thread writes through the same serialized writer, so it can only drain once the command lets go of it (as the request teardown does).
+    """
+    conn = g.pop("db", None)
+    if conn is not None:
+        conn.commit()
+        release_database(conn)
+    audit.flush()
+
+
+def register_commands(app) -> None:
+    """Register CLI commands on the given Flask app.
+
+    Args:
+        app (Flask): The application instance to configure.
+
+    Returns:
+        None
+    """
+
+    @app.cli.command("import-jobs")
+    @click.argument(
+        "path", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+    )
+    @click.option(
+        "--format",
+        "fmt",
+        type=click.Choice(["csv", "jsonl"]),
+        help="File format (default: from the extension).",
+    )
+    @click.option("--user", "username", help="Username recorded as created_by.")
+    @click.option(
+        "--chunk-size", default=500, show_default=True, help="Rows per transaction."
+    )
+    @click.option(
+        "--allow-conflicts",
+        is_flag=True,
+        help="Import rows despite technician conflicts (locked days still reject).",
+    )
+    def import_jobs_command(
+        path: Path,
+        fmt: str | None,
+        username: str | None,
+        chunk_size: int,
+        allow_conflicts: bool,
+    ):
+        """Bulk-import jobs from PATH (CSV with a header row, or JSONL)."""
+        fmt = fmt or (
+            "jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv"
+        )
+        conn = get_database(readonly=False)
+        created_by = None
+        if username:
+            row = conn.execute(
+                "SELECT id FROM users WHERE username = ?", (username,)
+            ).fetchone()
+            if not row:
+                raise click.ClickException(f"No such user: {username}")
+            created_by = row["id"]
+
+        with path.open("r", encoding="utf-8-sig", newline="") as fh:
+            report = import_jobs(
+                conn, read_rows(fh, fmt), created_by, chunk_size, allow_conflicts
+            )
+
+        for row_no, message in report.errors:
+            click.echo(f"row {row_no}: {message}", err=True)
+        click.echo(
+            f"Imported {report.inserted}/{report.total} rows in {report.seconds:.2f}s "
+            f"({report.rows_per_second:,.0f} rows/s); {len(report.errors)} rejected."
+        )
+        audit.record(
+            "job",
+            None,
+            "import",
+            after={
+                "file": path.name,
+                "inserted": report.inserted,
+                "rejected": len(report.errors),
+            },
+        )
+        _flush_audit()
+
+    @app.cli.command("archive-jobs")
+    @click.option(
+        "--months",
+        default=12,
+        show_default=True,
+        type=click.IntRange(min=0),
+        help="Keep this many whole months (plus the current one) live.",
+    )
+    @click.option("--dry-run", is_flag=True, help="Only report what would move.")
+    @click.option("--vacuum", is_flag=True, help="VACUUM the live database afterwards.")
+    def archive_jobs_command(months: int, dry_run: bool, vacuum: bool):
+        """Move jobs, time off and locks that ended before the cutoff into archive/<year>.sqlite3."""
+        cutoff = archive.cutoff_for(months)
+        conn = get_database(readonly=False)
+        results = archive.archive_before(conn, cutoff, dry_run=dry_run)
+        if not results:
+            click.echo(f"Nothing ends before {cutoff.isoformat()}.")
+            return
+
+        verb = "Would archive" if dry_run else "Archived"
+        for year, counts in results.items():
+            click.echo(
+                f"{verb} {year}: {counts['jobs']} jobs, {counts['time_off']} time off, "
+                f"{counts['locks']} locks"
+            )
+        if dry_run:
+            return
+
+        if vacuum:
+            conn.execute("VACUUM")
+        audit.record(
+            "job",
+            None,
+            "archive",
+            after={"cutoff": cutoff.isoformat(), "years": sorted(results)},
+        )
+        _flush_audit()
+
+    @app.cli.command("backup-db")
+    @click.option(
+        "--pages",
+        default=backup.BACKUP_PAGES,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Pages copied per step.",
+    )
+    @click.option(
+        "--sleep",
+        default=backup.BACKUP_SLEEP,
+        show_default=True,
+        type=click.FloatRange(min=0),
+        help="Seconds to pause between steps.",
+    )
+    @click.option(
+        "--keep",
+        default=backup.BACKUP_KEEP,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Snapshots to keep.",
+    )
+    @click.option("--no-verify", is_flag=True, help="Skip the restore check.")
+    def backup_db_command(pages: int, sleep: float, keep: int, no_verify: bool):
+        """Snapshot the live database into DB_BACKUP_DIR without stopping the app."""
+        report = backup.run_backup(
+            pages=pages, sleep=sleep, keep=keep, verify=not no_verify
+        )
+        _flush_audit()
+        if report.error:
+            raise click.ClickException(f"Backup failed ({report.error}).")
+
+        click.echo(
+            f"{report.path}: {report.pages} pages in {report.copy_steps} steps "
+            f"({report.restarts} restarts, max step {report.max_step_ms:.1f} ms), "
+            f"{report.raw_bytes:,} -> {report.gz_bytes:,} bytes"
+        )
+        for phase, seconds in report.timings.items():
+            click.echo(f"  {phase:<9}{seconds:8.3f}s")
+        if report.verified:
+            click.echo("Restore check passed.")
+        for name in report.removed:
+            click.echo(f"Removed {name}")
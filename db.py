@@ -1,18 +1,33 @@
 """Database utilities for ExTerminus (SQLite).
 
 Provides:
-    - ``get_database()``: open a configured SQLite connection (WAL, FKs on).
-    - ``ensure_pragmas()``: no-op that touches a connection to apply PRAGMAs.
-    - ``init_db()``: create tables if missing and bootstrap a default admin.
+    - ``get_database()``: return the request's connection -- a pooled read-only one for ``GET``/``HEAD``, the single serialized writer otherwise (or a fresh one outside a request).
+    - ``release_database()``: hand a request connection back to the pool/writer.
+    - ``pool_stats()``: checkout/wait counters for the read pool and the writer.
+    - ``writer()``: hold the serialized writer from a background thread (e.g. the audit log).
+    - ``ensure_pragmas()``: apply persistent PRAGMAs once and pre-warm the pool.
+    - ``init_db()``: apply pending schema migrations and bootstrap a default admin.
+    - ``migrate()`` / ``schema_version()``: versioned migration engine over ``PRAGMA user_version``.
 
 Notes:
     - File path is ``db.sqlite3`` under the package directory.
     - PRAGMAs: ``foreign_keys=ON`` and ``journal_mode=WAL``.
+    - Schema changes live in ``migrations/NNNN_description.sql``; add a new numbered file rather than editing an applied one.
+    - Inside a request, the connection lives on ``g.db`` and is returned by the ``close_db`` teardown in ``app.py``; views should not close it themselves.
+    - ``GET`` views must not write; a handler that needs to can ask for ``get_database(readonly=False)``.
 """
 
+import importlib.util
+import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
+from flask import g, has_app_context, has_request_context, request
 from werkzeug.security import generate_password_hash
 
 from utils.logger import setup_logger
@@ -20,148 +35,355 @@ from utils.logger import setup_logger
 logger = setup_logger(level=0)
 BASE_DIR = Path(__file__).parent
 DATABASE = str(BASE_DIR / "db.sqlite3")
+MIGRATIONS_DIR = BASE_DIR / "migrations"
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
 
 
-def get_database() -> sqlite3.Connection:
+def _connect(readonly: bool = False) -> sqlite3.Connection:
     """Open a SQLite connection with standard app settings.
 
     Configures:
         - ``row_factory = sqlite3.Row`` for dict-like rows.
         - ``PRAGMA foreign_keys = ON`` to enforce FK constraints.
-        - ``PRAGMA journal_mode = WAL`` for better concurrency and durability.
+        - ``check_same_thread=False`` so pooled connections can be reused by any worker thread (a connection is only ever checked out to one request at a time).
+        - URI filenames, so ``ATTACH`` can open archive files ``mode=ro`` (see ``utils/archive.py``).
+
+    Args:
+        readonly (bool, optional): Open with a ``mode=ro`` URI so the connection can never take a write lock. Defaults to False.
 
     Returns:
         sqlite3.Connection: An open connection pointing at ``DATABASE``.
     """
-    logger.debug(f"Connecting to sqlite3: {DATABASE}")
-    conn = sqlite3.connect(DATABASE, timeout=10)
+    logger.debug(f"Connecting to sqlite3: {DATABASE} ({'ro' if readonly else 'rw'})")
+    uri = Path(DATABASE).resolve().as_uri() + ("?mode=ro" if readonly else "")
+    conn = sqlite3.connect(uri, uri=True, timeout=10, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys=ON;")
-    conn.execute("PRAGMA journal_mode=WAL;")
     return conn
 
 
-def ensure_pragmas() -> None:
-    """Ensure database PRAGMAs are applied.
+class ConnectionPool:
+    """Bounded, thread-safe pool of pre-configured SQLite connections.
 
-    Opens and closes a connection so the PRAGMA settings in ``get_database()`` take effect at least once during app lifetime.
+    Connections are created lazily up to ``size`` and reused afterwards, so the connect + PRAGMA cost is paid once per connection instead of once per request.  When every connection is checked out, ``acquire`` blocks up to ``timeout`` seconds for one to come back.
 
-    Returns:
-        None
+    Attributes:
+        size (int): Maximum number of open connections.
+        timeout (float): Seconds to wait for a free connection before raising.
+        readonly (bool): Whether connections are opened ``mode=ro``.
     """
-    conn = get_database()
-    conn.close()
 
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        timeout: float = POOL_TIMEOUT,
+        readonly: bool = False,
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.readonly = readonly
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
 
-def init_db() -> None:
-    """Create all tables if they don't exist and seed a default admin.
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, creating one if the pool is not yet full.
 
-    Creates tables:
-        - ``users``: basic auth and role info.
-        - ``technicians``: technician roster.
-        - ``jobs``: scheduled work items with optional technician and audit cols.
-        - ``locks``: per-day lock to prevent scheduling.
-        - ``time_off``: technician time-off ranges (inclusive).
+        Raises:
+            TimeoutError: No connection became available within ``timeout``.
 
-    Bootstraps:
-        - When there are no users, inserts an ``admin`` user with username ``"admin"`` and password ``"changeme"`` and sets a force-reset flag.
+        Returns:
+            sqlite3.Connection: A ready-to-use connection.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    conn = _connect(readonly=self.readonly)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                started = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No database connection free after {self.timeout}s"
+                    ) from None
+                finally:
+                    with self._lock:
+                        self._waits += 1
+                        self._wait_seconds += time.perf_counter() - started
 
-    Returns:
-        None
+        with self._lock:
+            self._checkouts += 1
+        return conn
 
-    """
-    logger.debug("Initializing database...")
-    conn = get_database()
-    cur = conn.cursor()
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, rolling back any open transaction.
 
-    # USERS
-    cur.execute(
+        Args:
+            conn (sqlite3.Connection): Connection previously returned by ``acquire``.
         """
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        first_name TEXT,
-        last_name TEXT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        role TEXT NOT NULL DEFAULT 'tech',
-        must_reset_password INTEGER NOT NULL DEFAULT 0,
-        last_password_change TEXT
-    );
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            logger.warning("Discarding broken pooled connection.")
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(conn)
+
+    def stats(self) -> dict:
+        """Return pool counters (connections created/idle, checkouts, waits)."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 6),
+            }
+
+    def close_all(self) -> None:
+        """Close every idle connection (used on shutdown and in scripts)."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+class WriterConnection:
+    """The process's single read-write connection, handed to one request at a time.
+
+    Every mutating request goes through this connection, serialized by an in-process lock, so writers queue in Python instead of spinning on SQLite's busy handler.  The connection uses ``isolation_level="IMMEDIATE"``: the first write statement of a request opens ``BEGIN IMMEDIATE``, taking the database write lock up front rather than upgrading a read lock mid-transaction (which is what turns into ``database is locked`` stalls across processes).
+
+    Attributes:
+        timeout (float): Seconds to wait for the writer before raising.
     """
-    )
 
-    # TECHNICIANS
-    cur.execute(
+    def __init__(self, timeout: float = POOL_TIMEOUT) -> None:
+        self.timeout = timeout
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take exclusive use of the writer connection.
+
+        Raises:
+            TimeoutError: Another request held the writer for longer than ``timeout``.
+
+        Returns:
+            sqlite3.Connection: The writer connection.
         """
-    CREATE TABLE IF NOT EXISTS technicians (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL UNIQUE
-    );
+        waited = 0.0
+        if not self._lock.acquire(blocking=False):
+            started = time.perf_counter()
+            if not self._lock.acquire(timeout=self.timeout):
+                raise TimeoutError(
+                    f"Database writer busy for more than {self.timeout}s"
+                )
+            waited = time.perf_counter() - started
+        try:
+            if self._conn is None:
+                self._conn = _connect()
+                self._conn.isolation_level = "IMMEDIATE"
+        except Exception:
+            self._lock.release()
+            raise
+        with self._stats_lock:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_seconds += waited
+        return self._conn
+
+    def owns(self, conn: sqlite3.Connection) -> bool:
+        """Return whether ``conn`` is the writer connection."""
+        return conn is self._conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Roll back anything left uncommitted and let the next writer in."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            logger.warning("Reopening broken writer connection.")
+            conn.close()
+            self._conn = None
+        finally:
+            self._lock.release()
+
+    def stats(self) -> dict:
+        """Return writer counters (checkouts, waits)."""
+        with self._stats_lock:
+            return {
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 6),
+            }
+
+
+_read_pool = ConnectionPool(readonly=True)
+_writer = WriterConnection()
+
+
+def get_database(readonly: bool | None = None) -> sqlite3.Connection:
+    """Return a configured SQLite connection.
+
+    Inside an app/request context the connection is checked out once and cached on ``g.db``; repeated calls during the same request return the same connection, and the ``close_db`` teardown commits and returns it.  ``GET``/``HEAD`` requests get a pooled ``mode=ro`` connection; everything else gets the serialized writer.  Outside a context (CLI, scripts) a fresh, caller-owned read-write connection is opened.
+
+    Args:
+        readonly (bool | None, optional): Force a reader (``True``) or the writer (``False``).  ``None`` picks by request method. Defaults to None.
+
+    Returns:
+        sqlite3.Connection: An open connection pointing at ``DATABASE``.
     """
-    )
+    if not has_app_context():
+        return _connect()
+    if "db" not in g:
+        if readonly is None:
+            readonly = has_request_context() and request.method in ("GET", "HEAD")
+        g.db = _read_pool.acquire() if readonly else _writer.acquire()
+    return g.db
 
-    # JOBS
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        start_date TEXT NOT NULL,
-        end_date TEXT,
-        start_time TEXT,
-        end_time TEXT,
-        time_range TEXT,
-        job_type TEXT,
-        price REAL,
-        fumigation_type TEXT,
-        target_pest TEXT,
-        custom_pest TEXT,
-        exclusion_subtype TEXT,
-        notes TEXT,
-        rei_zip TEXT,
-        rei_quantity INTEGER,
-        rei_city_name TEXT,
-        technician_id INTEGER,
-        two_man INTEGER NOT NULL DEFAULT 0,
-        created_by INTEGER,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        last_modified TEXT,
-        last_modified_by INTEGER,
-        FOREIGN KEY (technician_id) REFERENCES technicians(id) ON DELETE SET NULL,
-        FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL,
-        FOREIGN KEY (last_modified_by) REFERENCES users(id) ON DELETE SET NULL
-    );
+
+def release_database(conn: sqlite3.Connection) -> None:
+    """Return a request connection obtained from ``get_database()``.
+
+    Args:
+        conn (sqlite3.Connection): The connection popped from ``g``.
     """
-    )
+    if _writer.owns(conn):
+        _writer.release(conn)
+    else:
+        _read_pool.release(conn)
 
-    # LOCKS
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS locks (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        date TEXT UNIQUE NOT NULL,
-        locked_by INTEGER,
-        locked_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (locked_by) REFERENCES users(id) ON DELETE SET NULL
-    );
+
+@contextmanager
+def writer() -> Iterator[sqlite3.Connection]:
+    """Hold the process's serialized writer connection outside a request.
+
+    For background threads that write, so they queue behind requests on the same in-process lock instead of opening a second read-write connection.  Anything left uncommitted is rolled back on exit.
+
+    Raises:
+        TimeoutError: The writer stayed busy for longer than its timeout.
+
+    Yields:
+        sqlite3.Connection: The writer connection.
     """
-    )
+    conn = _writer.acquire()
+    try:
+        yield conn
+    finally:
+        _writer.release(conn)
 
-    # TIME OFF
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS time_off (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        technician_id INTEGER NOT NULL,
-        start_date TEXT NOT NULL,
-        end_date TEXT NOT NULL,
-        reason TEXT,
-        FOREIGN KEY (technician_id) REFERENCES technicians(id) ON DELETE CASCADE
-    );
+
+def pool_stats() -> dict:
+    """Return connection counters for the read pool and the writer.
+
+    Returns:
+        dict: ``{"read": {...}, "write": {...}}``; the read side reports ``size``, ``created``, ``idle``, ``checkouts``, ``waits`` and ``wait_seconds``, the write side ``checkouts``, ``waits`` and ``wait_seconds``.
     """
-    )
+    return {"read": _read_pool.stats(), "write": _writer.stats()}
+
 
-    # bootstrap admin if not exist
+def ensure_pragmas() -> None:
+    """Ensure persistent database PRAGMAs are applied and warm the connections.
+
+    ``journal_mode=WAL`` is stored in the database file, so it only needs to be set once per process start rather than on every connection.  The writer and one reader are opened up front so the first requests don't pay the connect cost; keeping the writer open also keeps the ``-wal``/``-shm`` files around, which ``mode=ro`` readers need.
+
+    Returns:
+        None
+    """
+    conn = _connect()
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.close()
+    _writer.release(_writer.acquire())
+    _read_pool.release(_read_pool.acquire())
+
+
+def _load_migrations() -> list[tuple[int, str, Path]]:
+    """Return the numbered migrations in ``MIGRATIONS_DIR`` ordered by version.
+
+    Files are named ``NNNN_description.sql`` (or ``.py`` for steps that need to branch, exposing ``upgrade(cur)``); the numeric prefix is the schema version the file upgrades *to*.
+
+    Returns:
+        list[tuple[int, str, Path]]: ``(version, name, path)`` tuples.
+    """
+    found = []
+    for path in MIGRATIONS_DIR.iterdir():
+        prefix, _, _ = path.stem.partition("_")
+        if path.suffix in (".sql", ".py") and prefix.isdigit():
+            found.append((int(prefix), path.stem, path))
+    found.sort()
+    return found
+
+
+def _split_sql(script: str) -> list[str]:
+    """Split a migration script into complete statements.
+
+    Uses ``sqlite3.complete_statement`` so ``CREATE TRIGGER ... BEGIN ...; END;`` bodies stay intact.  ``executescript`` can't be used because it commits any open transaction, which would drop the exclusive migration lock.
+
+    Args:
+        script (str): Raw SQL file contents.
+
+    Returns:
+        list[str]: Statements in file order.
+    """
+    statements, buf = [], ""
+    for line in script.splitlines(keepends=True):
+        if not buf and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buf += line
+        if sqlite3.complete_statement(buf):
+            statements.append(buf.strip())
+            buf = ""
+    if buf.strip():
+        statements.append(buf.strip())
+    return statements
+
+
+def _run_py_migration(path: Path, cur: sqlite3.Cursor) -> None:
+    """Load a ``.py`` migration by path and call its ``upgrade(cur)``.
+
+    Args:
+        path (Path): Migration file.
+        cur (sqlite3.Cursor): Cursor inside the migration transaction.
+    """
+    spec = importlib.util.spec_from_file_location(f"migrations.{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.upgrade(cur)
+
+
+def _bootstrap_admin(cur: sqlite3.Cursor) -> None:
+    """Insert the default ``admin`` / ``changeme`` user when ``users`` is empty."""
     cur.execute("SELECT COUNT(*) AS c FROM users")
     if cur.fetchone()["c"] == 0:
         logger.warning(
@@ -172,12 +394,70 @@ def init_db() -> None:
             ("Admin", "User", "admin", generate_password_hash("changeme"), "admin", 1),
         )
 
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_start ON jobs(start_date);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_end ON jobs(end_date);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_timeoff_start ON time_off(start_date);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_timeoff_end ON time_off(end_date);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_locks_date ON locks(date);")
 
-    conn.commit()
-    conn.close()
-    logger.info("Database ready.")
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stored in ``PRAGMA user_version``."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations under an exclusive lock.
+
+    Takes ``BEGIN EXCLUSIVE`` so concurrent workers starting at the same time serialize here; the version is re-read after the lock is held, so only the first worker does any work and the rest see a current schema.  All pending migrations, the admin bootstrap and the ``user_version`` bump commit atomically.
+
+    Args:
+        conn (sqlite3.Connection): Connection to migrate (isolation level is switched to manual).
+
+    Raises:
+        sqlite3.Error: A migration failed; the transaction is rolled back and the version is unchanged.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    conn.isolation_level = None
+    cur = conn.cursor()
+    cur.execute("BEGIN EXCLUSIVE")
+    try:
+        current = schema_version(conn)
+        for version, name, path in _load_migrations():
+            if version <= current:
+                continue
+            logger.info(f"Applying migration {name}")
+            if path.suffix == ".py":
+                _run_py_migration(path, cur)
+            else:
+                for statement in _split_sql(path.read_text(encoding="utf-8")):
+                    cur.execute(statement)
+            current = version
+        _bootstrap_admin(cur)
+        cur.execute(f"PRAGMA user_version = {int(current)}")
+        cur.execute("COMMIT")
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    return current
+
+
+def init_db() -> None:
+    """Bring the schema up to date and seed a default admin on first run.
+
+    When the schema is current this is a single ``PRAGMA user_version`` read, so it is cheap to call from every worker's ``create_app()``.  Otherwise the numbered files in ``migrations/`` are applied via ``migrate()``.
+
+    Bootstraps:
+        - When there are no users, inserts an ``admin`` user with username ``"admin"`` and password ``"changeme"`` and sets a force-reset flag.
+
+    Returns:
+        None
+
+    """
+    conn = _connect()
+    try:
+        latest = max((v for v, _, _ in _load_migrations()), default=0)
+        if schema_version(conn) >= latest:
+            logger.debug(f"Database schema current (v{latest}).")
+            return
+        logger.debug("Migrating database...")
+        version = migrate(conn)
+    finally:
+        conn.close()
+    logger.info(f"Database ready (schema v{version}).")
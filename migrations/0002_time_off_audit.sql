@@ -0,0 +1,6 @@
+-- 0002: audit columns on time_off.
+-- POST /timeoff/add records who created an entry and when; the columns
+-- were referenced by the route but never existed in the schema.
+
+ALTER TABLE time_off ADD COLUMN created_at TEXT;
+ALTER TABLE time_off ADD COLUMN created_by INTEGER REFERENCES users(id) ON DELETE SET NULL;
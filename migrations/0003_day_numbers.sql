@@ -0,0 +1,62 @@
+-- 0003: integer day numbers for overlap queries.
+-- start_day/end_day hold proleptic Gregorian ordinals (Python's
+-- date.toordinal()), so "what touches [a, b]" becomes a plain indexed
+-- range predicate instead of date(...) wrapped around every column.
+-- Triggers keep them in sync on every write path; end_day is never NULL
+-- (single-day rows get end_day = start_day).
+
+ALTER TABLE jobs ADD COLUMN start_day INTEGER;
+ALTER TABLE jobs ADD COLUMN end_day INTEGER;
+ALTER TABLE time_off ADD COLUMN start_day INTEGER;
+ALTER TABLE time_off ADD COLUMN end_day INTEGER;
+
+UPDATE jobs
+   SET start_day = CAST(julianday(start_date) - 1721424.5 AS INTEGER),
+       end_day = CAST(julianday(COALESCE(end_date, start_date)) - 1721424.5 AS INTEGER);
+
+UPDATE time_off
+   SET start_day = CAST(julianday(start_date) - 1721424.5 AS INTEGER),
+       end_day = CAST(julianday(COALESCE(end_date, start_date)) - 1721424.5 AS INTEGER);
+
+CREATE TRIGGER jobs_days_ai AFTER INSERT ON jobs
+BEGIN
+    UPDATE jobs
+       SET start_day = CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+           end_day = CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+     WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER jobs_days_au AFTER UPDATE OF start_date, end_date ON jobs
+BEGIN
+    UPDATE jobs
+       SET start_day = CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+           end_day = CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+     WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER time_off_days_ai AFTER INSERT ON time_off
+BEGIN
+    UPDATE time_off
+       SET start_day = CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+           end_day = CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+     WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER time_off_days_au AFTER UPDATE OF start_date, end_date ON time_off
+BEGIN
+    UPDATE time_off
+       SET start_day = CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+           end_day = CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+     WHERE id = NEW.id;
+END;
+
+-- The text-date indexes can't serve the overlap predicate; replace them.
+DROP INDEX IF EXISTS idx_jobs_start;
+DROP INDEX IF EXISTS idx_jobs_end;
+DROP INDEX IF EXISTS idx_timeoff_start;
+DROP INDEX IF EXISTS idx_timeoff_end;
+
+CREATE INDEX idx_jobs_start_day ON jobs(start_day, end_day);
+CREATE INDEX idx_jobs_end_day ON jobs(end_day, start_day);
+CREATE INDEX idx_timeoff_start_day ON time_off(start_day, end_day);
+CREATE INDEX idx_timeoff_end_day ON time_off(end_day, start_day);
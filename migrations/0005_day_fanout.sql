@@ -0,0 +1,95 @@
+-- 0005: materialized per-day occupancy.
+-- job_days / time_off_days hold one row per (day, row id) for every day a
+-- job or time-off entry covers, so the month view is a single range scan
+-- over the primary key that already comes back grouped by day.  Triggers
+-- recompute the fan-out from the row's dates on every write.
+
+CREATE TABLE job_days (
+    day INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (day, job_id)
+) WITHOUT ROWID;
+CREATE INDEX idx_job_days_job ON job_days(job_id);
+
+CREATE TABLE time_off_days (
+    day INTEGER NOT NULL,
+    time_off_id INTEGER NOT NULL,
+    PRIMARY KEY (day, time_off_id)
+) WITHOUT ROWID;
+CREATE INDEX idx_time_off_days_time_off ON time_off_days(time_off_id);
+
+INSERT INTO job_days (day, job_id)
+WITH RECURSIVE span(job_id, day, last) AS (
+    SELECT id, start_day, end_day FROM jobs WHERE start_day IS NOT NULL
+    UNION ALL
+    SELECT job_id, day + 1, last FROM span WHERE day < last
+)
+SELECT day, job_id FROM span;
+
+INSERT INTO time_off_days (day, time_off_id)
+WITH RECURSIVE span(time_off_id, day, last) AS (
+    SELECT id, start_day, end_day FROM time_off WHERE start_day IS NOT NULL
+    UNION ALL
+    SELECT time_off_id, day + 1, last FROM span WHERE day < last
+)
+SELECT day, time_off_id FROM span;
+
+CREATE TRIGGER job_days_ai AFTER INSERT ON jobs
+BEGIN
+    INSERT OR IGNORE INTO job_days (day, job_id)
+    WITH RECURSIVE span(day, last) AS (
+        SELECT CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+               CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+        UNION ALL
+        SELECT day + 1, last FROM span WHERE day < last
+    )
+    SELECT day, NEW.id FROM span WHERE day IS NOT NULL;
+END;
+
+CREATE TRIGGER job_days_au AFTER UPDATE OF start_date, end_date ON jobs
+BEGIN
+    DELETE FROM job_days WHERE job_id = OLD.id;
+    INSERT OR IGNORE INTO job_days (day, job_id)
+    WITH RECURSIVE span(day, last) AS (
+        SELECT CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+               CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+        UNION ALL
+        SELECT day + 1, last FROM span WHERE day < last
+    )
+    SELECT day, NEW.id FROM span WHERE day IS NOT NULL;
+END;
+
+CREATE TRIGGER job_days_ad AFTER DELETE ON jobs
+BEGIN
+    DELETE FROM job_days WHERE job_id = OLD.id;
+END;
+
+CREATE TRIGGER time_off_days_fan_ai AFTER INSERT ON time_off
+BEGIN
+    INSERT OR IGNORE INTO time_off_days (day, time_off_id)
+    WITH RECURSIVE span(day, last) AS (
+        SELECT CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+               CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+        UNION ALL
+        SELECT day + 1, last FROM span WHERE day < last
+    )
+    SELECT day, NEW.id FROM span WHERE day IS NOT NULL;
+END;
+
+CREATE TRIGGER time_off_days_fan_au AFTER UPDATE OF start_date, end_date ON time_off
+BEGIN
+    DELETE FROM time_off_days WHERE time_off_id = OLD.id;
+    INSERT OR IGNORE INTO time_off_days (day, time_off_id)
+    WITH RECURSIVE span(day, last) AS (
+        SELECT CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+               CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+        UNION ALL
+        SELECT day + 1, last FROM span WHERE day < last
+    )
+    SELECT day, NEW.id FROM span WHERE day IS NOT NULL;
+END;
+
+CREATE TRIGGER time_off_days_fan_ad AFTER DELETE ON time_off
+BEGIN
+    DELETE FROM time_off_days WHERE time_off_id = OLD.id;
+END;
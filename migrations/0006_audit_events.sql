@@ -0,0 +1,18 @@
+-- 0006: structured audit log.
+-- Written in batches by utils/audit.py's background thread.  actor_name is
+-- denormalized so events stay readable after a user is deleted; changes is
+-- a JSON object of {column: [before, after]} for the columns that changed.
+
+CREATE TABLE audit_events (
+    id INTEGER PRIMARY KEY,
+    occurred_at TEXT NOT NULL,
+    actor_id INTEGER,
+    actor_name TEXT,
+    entity TEXT NOT NULL,
+    entity_id INTEGER,
+    action TEXT NOT NULL,
+    changes TEXT
+);
+
+CREATE INDEX idx_audit_entity ON audit_events(entity, entity_id, occurred_at);
+CREATE INDEX idx_audit_occurred ON audit_events(occurred_at);
@@ -0,0 +1,12 @@
+-- 0007: catalogue of yearly archive databases.
+-- utils/archive.py moves finished jobs, time off and locks into
+-- archive/<year>.sqlite3 and records the day range each file covers, so the
+-- calendar views only ATTACH the files that overlap what they are showing.
+
+CREATE TABLE archives (
+    year INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    first_day INTEGER NOT NULL,
+    last_day INTEGER NOT NULL,
+    archived_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
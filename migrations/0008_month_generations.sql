@@ -0,0 +1,139 @@
+-- 0008: per-month write generations for the month-view cache.
+-- month is year * 12 + (month - 1); month 0 is a global generation for
+-- changes that can show up in any month (technician names).  Triggers bump
+-- the generation of every month a job, time-off entry or lock touches --
+-- both the old and the new range on updates -- so every write path (routes,
+-- bulk import, archiving, other processes) invalidates exactly those months.
+
+CREATE TABLE month_generations (
+    month INTEGER PRIMARY KEY,
+    gen INTEGER NOT NULL
+);
+
+CREATE TRIGGER jobs_gen_ai AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', NEW.start_date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER jobs_gen_au AFTER UPDATE ON jobs
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', OLD.start_date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', NEW.start_date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER jobs_gen_ad AFTER DELETE ON jobs
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', OLD.start_date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER time_off_gen_ai AFTER INSERT ON time_off
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', NEW.start_date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER time_off_gen_au AFTER UPDATE ON time_off
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', OLD.start_date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', NEW.start_date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER time_off_gen_ad AFTER DELETE ON time_off
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', OLD.start_date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) - 1
+        UNION ALL
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER locks_gen_ai AFTER INSERT ON locks
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    SELECT CAST(strftime('%Y', NEW.date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.date) AS INTEGER) - 1, 1 WHERE NEW.date IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER locks_gen_ad AFTER DELETE ON locks
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    SELECT CAST(strftime('%Y', OLD.date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.date) AS INTEGER) - 1, 1 WHERE OLD.date IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER technicians_gen_ai AFTER INSERT ON technicians
+BEGIN
+    INSERT INTO month_generations (month, gen) VALUES (0, 1)
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER technicians_gen_au AFTER UPDATE ON technicians
+BEGIN
+    INSERT INTO month_generations (month, gen) VALUES (0, 1)
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER technicians_gen_ad AFTER DELETE ON technicians
+BEGIN
+    INSERT INTO month_generations (month, gen) VALUES (0, 1)
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
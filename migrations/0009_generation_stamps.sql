@@ -0,0 +1,33 @@
+-- 0009: timestamps for month generations, for Last-Modified headers.
+-- changed_at is unix seconds, stamped whenever a generation row is created
+-- or bumped.  Username changes bump the global generation (month 0) too,
+-- since the day view shows who created / last modified each job.
+
+ALTER TABLE month_generations ADD COLUMN changed_at INTEGER;
+UPDATE month_generations SET changed_at = CAST(strftime('%s', 'now') AS INTEGER);
+
+CREATE TRIGGER month_generations_stamp_ai AFTER INSERT ON month_generations
+BEGIN
+    UPDATE month_generations
+    SET changed_at = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE month = NEW.month;
+END;
+
+CREATE TRIGGER month_generations_stamp_au AFTER UPDATE OF gen ON month_generations
+BEGIN
+    UPDATE month_generations
+    SET changed_at = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE month = NEW.month;
+END;
+
+CREATE TRIGGER users_gen_au AFTER UPDATE OF username ON users
+BEGIN
+    INSERT INTO month_generations (month, gen) VALUES (0, 1)
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+CREATE TRIGGER users_gen_ad AFTER DELETE ON users
+BEGIN
+    INSERT INTO month_generations (month, gen) VALUES (0, 1)
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
@@ -0,0 +1,134 @@
+-- 0010: change feed for live calendar updates (/events).
+-- One row per committed change to a job, time-off entry, lock or technician,
+-- with the ordinal day range it affects (date.toordinal(); NULL = every day,
+-- e.g. a technician rename).  Updates record the new range, plus the old one
+-- when a job or time-off entry moves.  Rows are written by triggers, so every
+-- write path and every process feeds it; readers poll by id.  Only the
+-- newest 10000 rows are kept.
+
+CREATE TABLE change_feed (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL,
+    entity_id INTEGER,
+    first_day INTEGER,
+    last_day INTEGER,
+    changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+
+CREATE TRIGGER change_feed_trim AFTER INSERT ON change_feed
+BEGIN
+    DELETE FROM change_feed WHERE id <= NEW.id - 10000;
+END;
+
+CREATE TRIGGER jobs_feed_ai AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'job', NEW.id,
+        CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+    );
+END;
+
+-- start_day / end_day are maintained by the 0003 triggers and left out here,
+-- so their follow-up UPDATE does not record a second change
+CREATE TRIGGER jobs_feed_au AFTER UPDATE OF
+    title, start_date, end_date, start_time, end_time, time_range, job_type,
+    price, fumigation_type, target_pest, custom_pest, exclusion_subtype, notes,
+    rei_zip, rei_quantity, rei_city_name, technician_id, two_man
+ON jobs
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'job', NEW.id,
+        CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+    );
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    SELECT
+        'job', OLD.id,
+        CAST(julianday(OLD.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(OLD.end_date, OLD.start_date)) - 1721424.5 AS INTEGER)
+    WHERE OLD.start_date IS NOT NEW.start_date OR OLD.end_date IS NOT NEW.end_date;
+END;
+
+CREATE TRIGGER jobs_feed_ad AFTER DELETE ON jobs
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'job', OLD.id,
+        CAST(julianday(OLD.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(OLD.end_date, OLD.start_date)) - 1721424.5 AS INTEGER)
+    );
+END;
+
+CREATE TRIGGER time_off_feed_ai AFTER INSERT ON time_off
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'time_off', NEW.id,
+        CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+    );
+END;
+
+CREATE TRIGGER time_off_feed_au AFTER UPDATE OF technician_id, start_date, end_date, reason ON time_off
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'time_off', NEW.id,
+        CAST(julianday(NEW.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(NEW.end_date, NEW.start_date)) - 1721424.5 AS INTEGER)
+    );
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    SELECT
+        'time_off', OLD.id,
+        CAST(julianday(OLD.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(OLD.end_date, OLD.start_date)) - 1721424.5 AS INTEGER)
+    WHERE OLD.start_date IS NOT NEW.start_date OR OLD.end_date IS NOT NEW.end_date;
+END;
+
+CREATE TRIGGER time_off_feed_ad AFTER DELETE ON time_off
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'time_off', OLD.id,
+        CAST(julianday(OLD.start_date) - 1721424.5 AS INTEGER),
+        CAST(julianday(COALESCE(OLD.end_date, OLD.start_date)) - 1721424.5 AS INTEGER)
+    );
+END;
+
+CREATE TRIGGER locks_feed_ai AFTER INSERT ON locks
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'lock', NEW.id,
+        CAST(julianday(NEW.date) - 1721424.5 AS INTEGER),
+        CAST(julianday(NEW.date) - 1721424.5 AS INTEGER)
+    );
+END;
+
+CREATE TRIGGER locks_feed_ad AFTER DELETE ON locks
+BEGIN
+    INSERT INTO change_feed (entity, entity_id, first_day, last_day)
+    VALUES (
+        'lock', OLD.id,
+        CAST(julianday(OLD.date) - 1721424.5 AS INTEGER),
+        CAST(julianday(OLD.date) - 1721424.5 AS INTEGER)
+    );
+END;
+
+CREATE TRIGGER technicians_feed_ai AFTER INSERT ON technicians
+BEGIN
+    INSERT INTO change_feed (entity, entity_id) VALUES ('technician', NEW.id);
+END;
+
+CREATE TRIGGER technicians_feed_au AFTER UPDATE ON technicians
+BEGIN
+    INSERT INTO change_feed (entity, entity_id) VALUES ('technician', NEW.id);
+END;
+
+CREATE TRIGGER technicians_feed_ad AFTER DELETE ON technicians
+BEGIN
+    INSERT INTO change_feed (entity, entity_id) VALUES ('technician', OLD.id);
+END;
@@ -0,0 +1,60 @@
+"""0011: FTS5 full-text index over jobs for ``/search``.
+
+Creates ``jobs_fts`` (rowid = ``jobs.id``) over title, notes, target pest, custom pest, REI city and technician name, backfills it, and installs triggers that keep it in sync with ``jobs`` and with technician renames.  FTS5 is a compile-time SQLite option; when the running build lacks it the step is skipped and search reports itself unavailable.
+
+Prefix indexes for 2- to 5-character prefixes keep ``term*`` queries from merging every matching doclist on each lookup (notably the per-row snippet lookups in ``utils/job_search.py``).
+"""
+
+import sqlite3
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Technician label as shown on the calendar: "Two Man" or the technician's name.
+TECH_EXPR = (
+    "CASE WHEN {row}.two_man = 1 THEN 'Two Man' "
+    "ELSE (SELECT name FROM technicians WHERE id = {row}.technician_id) END"
+)
+COLUMNS = "title, notes, target_pest, custom_pest, rei_city_name, technician"
+
+
+def _insert(row: str) -> str:
+    """``INSERT`` of one jobs row (``NEW`` or ``OLD``) into the index."""
+    return (
+        f"INSERT INTO jobs_fts (rowid, {COLUMNS}) VALUES ("
+        f"{row}.id, {row}.title, {row}.notes, {row}.target_pest, {row}.custom_pest, "
+        f"{row}.rei_city_name, {TECH_EXPR.format(row=row)});"
+    )
+
+
+TRIGGERS = [
+    f"CREATE TRIGGER jobs_fts_ai AFTER INSERT ON jobs BEGIN {_insert('NEW')} END",
+    "CREATE TRIGGER jobs_fts_au AFTER UPDATE OF "
+    "title, notes, target_pest, custom_pest, rei_city_name, technician_id, two_man "
+    f"ON jobs BEGIN DELETE FROM jobs_fts WHERE rowid = OLD.id; {_insert('NEW')} END",
+    "CREATE TRIGGER jobs_fts_ad AFTER DELETE ON jobs "
+    "BEGIN DELETE FROM jobs_fts WHERE rowid = OLD.id; END",
+    "CREATE TRIGGER technicians_fts_au AFTER UPDATE OF name ON technicians BEGIN "
+    "UPDATE jobs_fts SET technician = NEW.name "
+    "WHERE rowid IN (SELECT id FROM jobs WHERE technician_id = NEW.id AND two_man = 0); END",
+]
+
+
+def upgrade(cur: sqlite3.Cursor) -> None:
+    """Create and backfill ``jobs_fts`` and install its sync triggers."""
+    try:
+        cur.execute(
+            f"CREATE VIRTUAL TABLE jobs_fts USING fts5({COLUMNS}, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4 5')"
+        )
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 unavailable ({e}); skipping job search index.")
+        return
+    cur.execute(
+        f"INSERT INTO jobs_fts (rowid, {COLUMNS}) "
+        "SELECT j.id, j.title, j.notes, j.target_pest, j.custom_pest, j.rei_city_name, "
+        f"{TECH_EXPR.format(row='j')} FROM jobs j"
+    )
+    for statement in TRIGGERS:
+        cur.execute(statement)
@@ -0,0 +1,21 @@
+-- 0012: recurring job series.
+-- A series stores its recurrence rule; its visits are ordinary jobs linked by
+-- jobs.series_id.  "This and following" edits address the series' jobs from a
+-- given day on, which (series_id, start_day) turns into one index range.
+
+CREATE TABLE job_series (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    freq TEXT NOT NULL CHECK (freq IN ('daily', 'weekly', 'monthly')),
+    interval INTEGER NOT NULL DEFAULT 1 CHECK (interval >= 1),
+    count INTEGER,
+    until TEXT,
+    skip_holidays INTEGER NOT NULL DEFAULT 0,
+    on_skip TEXT NOT NULL DEFAULT 'drop' CHECK (on_skip IN ('drop', 'next')),
+    created_by INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
+);
+
+ALTER TABLE jobs ADD COLUMN series_id INTEGER REFERENCES job_series(id) ON DELETE SET NULL;
+
+CREATE INDEX idx_jobs_series ON jobs(series_id, start_day) WHERE series_id IS NOT NULL;
@@ -0,0 +1,7 @@
+-- 0013: per-technician span indexes for conflict checks.
+-- utils/conflicts.py asks "what does this technician have that ends on or
+-- after the first day and starts on or before the last": one seek on
+-- technician_id, then a short end_day range that skips years of history.
+
+CREATE INDEX idx_jobs_tech_span ON jobs(technician_id, end_day, start_day);
+CREATE INDEX idx_time_off_tech_span ON time_off(technician_id, end_day, start_day);
@@ -0,0 +1,7 @@
+-- 0014: REI ZIP lookups for /api/nearby.
+-- The endpoint turns a ZIP and radius into the set of nearby ZIPs, then asks
+-- for jobs in those ZIPs overlapping a date range: one seek per ZIP, then a
+-- short end_day range.  Only REI jobs carry a ZIP, so the index is partial.
+
+CREATE INDEX idx_jobs_rei_zip ON jobs(rei_zip, end_day, start_day)
+WHERE rei_zip IS NOT NULL;
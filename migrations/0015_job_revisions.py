@@ -0,0 +1,160 @@
+"""0015: append-only job history (``job_revisions``) written by triggers.
+
+One row per insert, update or delete of a job.  ``changes`` is a JSON object ``{column: [before, after]}`` holding only the columns that changed; an insert records every non-null column with ``before`` null, and a delete records every non-null column with ``after`` null, so a deleted job can be rebuilt from its delete revision alone.  ``first_day``/``last_day`` are the span the job covers after the change (before it, for a delete), and ``old_first_day``/``old_last_day`` the span it left when a change moved it.
+
+``job_revision_days`` fans each revision out to every day in either span (as ``job_days`` does for jobs in 0005), so "what changed on these days" is a primary-key range scan.  Because the triggers sit on ``jobs``, every route, batch, series edit and script is recorded.  Revisions are never edited; the only rows removed are the delete revisions ``utils/archive.py`` produces when it moves old jobs out, since an archived job has not been deleted.
+
+``changed_by`` is the creator for an insert (or whoever stamped ``last_modified_by``, e.g. on a restore), the user who stamped ``last_modified`` in the same statement for an update, and NULL for a delete, which no statement stamps; the audit log has who deleted.
+
+History starts at this migration: existing jobs get no backfilled revision.
+"""
+
+import sqlite3
+
+# Columns a user can change; updates touching only start_day/end_day (the 0003 follow-up) or the last_modified stamp record nothing.
+TRACKED = (
+    "title",
+    "start_date",
+    "end_date",
+    "start_time",
+    "end_time",
+    "time_range",
+    "job_type",
+    "price",
+    "fumigation_type",
+    "target_pest",
+    "custom_pest",
+    "exclusion_subtype",
+    "notes",
+    "rei_zip",
+    "rei_quantity",
+    "rei_city_name",
+    "technician_id",
+    "two_man",
+    "series_id",
+)
+# Full snapshot for inserts and deletes: enough to restore the row as it was.
+SNAPSHOT = TRACKED + ("created_by", "created_at", "last_modified", "last_modified_by")
+
+DAY = "CAST(julianday({date}) - 1721424.5 AS INTEGER)"
+
+
+def _first_day(row: str) -> str:
+    return DAY.format(date=f"{row}.start_date")
+
+
+def _last_day(row: str) -> str:
+    return DAY.format(date=f"COALESCE({row}.end_date, {row}.start_date)")
+
+
+def _snapshot(row: str, before: bool) -> str:
+    """JSON ``{column: [value, null]}`` (or ``[null, value]``) of a row's non-null columns."""
+    pair = "json_array(v, NULL)" if before else "json_array(NULL, v)"
+    values = " UNION ALL ".join(f"SELECT '{c}' AS c, {row}.{c} AS v" for c in SNAPSHOT)
+    return f"(SELECT json_group_object(c, {pair}) FROM ({values}) WHERE v IS NOT NULL)"
+
+
+def _diff() -> str:
+    """JSON ``{column: [before, after]}`` of the tracked columns an update changed; NULL when none did."""
+    values = " UNION ALL ".join(
+        f"SELECT '{c}' AS c, OLD.{c} AS o, NEW.{c} AS n" for c in TRACKED
+    )
+    return f"NULLIF((SELECT json_group_object(c, json_array(o, n)) FROM ({values}) WHERE o IS NOT n), '{{}}')"
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE job_revisions (
+        id INTEGER PRIMARY KEY,
+        job_id INTEGER NOT NULL,
+        action TEXT NOT NULL CHECK (action IN ('insert', 'update', 'delete')),
+        changes TEXT NOT NULL,
+        first_day INTEGER,
+        last_day INTEGER,
+        old_first_day INTEGER,
+        old_last_day INTEGER,
+        changed_by INTEGER,
+        changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX idx_job_revisions_job ON job_revisions(job_id, id)",
+    # Recently deleted jobs, newest first, without scanning the whole history.
+    "CREATE INDEX idx_job_revisions_deleted ON job_revisions(id) WHERE action = 'delete'",
+    """
+    CREATE TABLE job_revision_days (
+        day INTEGER NOT NULL,
+        revision_id INTEGER NOT NULL,
+        PRIMARY KEY (day, revision_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER job_revision_days_ai AFTER INSERT ON job_revisions
+    BEGIN
+        INSERT OR IGNORE INTO job_revision_days (day, revision_id)
+        WITH RECURSIVE span(day, last) AS (
+            SELECT NEW.first_day, NEW.last_day WHERE NEW.first_day IS NOT NULL
+            UNION ALL
+            SELECT NEW.old_first_day, NEW.old_last_day WHERE NEW.old_first_day IS NOT NULL
+            UNION ALL
+            SELECT day + 1, last FROM span WHERE day < last
+        )
+        SELECT day, NEW.id FROM span;
+    END
+    """,
+    """
+    CREATE TRIGGER job_revision_days_ad AFTER DELETE ON job_revisions
+    BEGIN
+        DELETE FROM job_revision_days
+        WHERE day BETWEEN OLD.first_day AND OLD.last_day AND revision_id = OLD.id;
+        DELETE FROM job_revision_days
+        WHERE day BETWEEN OLD.old_first_day AND OLD.old_last_day AND revision_id = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER jobs_rev_ai AFTER INSERT ON jobs
+    BEGIN
+        INSERT INTO job_revisions (job_id, action, changes, first_day, last_day, changed_by)
+        VALUES (
+            NEW.id, 'insert', {_snapshot('NEW', before=False)},
+            {_first_day('NEW')}, {_last_day('NEW')},
+            COALESCE(NEW.last_modified_by, NEW.created_by)
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER jobs_rev_au AFTER UPDATE OF {", ".join(TRACKED)} ON jobs
+    BEGIN
+        INSERT INTO job_revisions (
+            job_id, action, changes, first_day, last_day, old_first_day, old_last_day, changed_by
+        )
+        SELECT
+            NEW.id, 'update', changes,
+            {_first_day('NEW')}, {_last_day('NEW')},
+            CASE WHEN moved THEN {_first_day('OLD')} END,
+            CASE WHEN moved THEN {_last_day('OLD')} END,
+            CASE WHEN NEW.last_modified IS NOT OLD.last_modified THEN NEW.last_modified_by END
+        FROM (
+            SELECT
+                {_diff()} AS changes,
+                OLD.start_date IS NOT NEW.start_date OR OLD.end_date IS NOT NEW.end_date AS moved
+        )
+        WHERE changes IS NOT NULL;
+    END
+    """,
+    f"""
+    CREATE TRIGGER jobs_rev_ad AFTER DELETE ON jobs
+    BEGIN
+        INSERT INTO job_revisions (job_id, action, changes, first_day, last_day)
+        VALUES (
+            OLD.id, 'delete', {_snapshot('OLD', before=True)},
+            {_first_day('OLD')}, {_last_day('OLD')}
+        );
+    END
+    """,
+]
+
+
+def upgrade(cur: sqlite3.Cursor) -> None:
+    """Create ``job_revisions`` and its day fan-out and install the ``jobs`` triggers."""
+    for statement in STATEMENTS:
+        cur.execute(statement)
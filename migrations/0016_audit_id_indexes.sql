@@ -0,0 +1,12 @@
+-- 0016: page the audit log by id.
+-- /admin/audit lists events newest first and pages with "id < cursor".  Ids
+-- follow the order utils/audit.py's writer drains its queue, so ordering by
+-- id is the display order and the cursor order at once.  An entity filter
+-- (with or without a row id) is then a descending walk of one of these
+-- indexes; a date range is turned into an id range through
+-- idx_audit_occurred.  (entity, entity_id, occurred_at) could not serve
+-- either ORDER BY.
+
+DROP INDEX idx_audit_entity;
+CREATE INDEX idx_audit_entity ON audit_events(entity, id);
+CREATE INDEX idx_audit_entity_row ON audit_events(entity, entity_id, id);
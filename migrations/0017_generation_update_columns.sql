@@ -0,0 +1,49 @@
+-- 0017: the 0008 update triggers on jobs and time_off fired on every column,
+-- including the start_day / end_day follow-up UPDATE of the 0003 triggers,
+-- and bumped the old and the new range separately, so a title edit bumped
+-- its month twice and a move four times.  Fire only on the columns the
+-- month grid, day view and /api/day show (start_day / end_day are left out,
+-- as in 0010), and bump the union of both ranges once per month.
+
+DROP TRIGGER jobs_gen_au;
+
+CREATE TRIGGER jobs_gen_au AFTER UPDATE OF
+    title, start_date, end_date, start_time, end_time, time_range, job_type,
+    price, fumigation_type, target_pest, custom_pest, exclusion_subtype, notes,
+    rei_zip, rei_quantity, rei_city_name, technician_id, two_man, created_by,
+    created_at, last_modified, last_modified_by, series_id
+ON jobs
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', OLD.start_date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) - 1
+        UNION
+        SELECT CAST(strftime('%Y', NEW.start_date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) - 1
+        UNION
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT DISTINCT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
+
+DROP TRIGGER time_off_gen_au;
+
+CREATE TRIGGER time_off_gen_au AFTER UPDATE OF
+    technician_id, start_date, end_date, reason, created_at, created_by
+ON time_off
+BEGIN
+    INSERT INTO month_generations (month, gen)
+    WITH RECURSIVE span(month, last) AS (
+        SELECT CAST(strftime('%Y', OLD.start_date) AS INTEGER) * 12 + CAST(strftime('%m', OLD.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(OLD.end_date, OLD.start_date)) AS INTEGER) - 1
+        UNION
+        SELECT CAST(strftime('%Y', NEW.start_date) AS INTEGER) * 12 + CAST(strftime('%m', NEW.start_date) AS INTEGER) - 1,
+               CAST(strftime('%Y', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) * 12 + CAST(strftime('%m', COALESCE(NEW.end_date, NEW.start_date)) AS INTEGER) - 1
+        UNION
+        SELECT month + 1, last FROM span WHERE month < last
+    )
+    SELECT DISTINCT month, 1 FROM span WHERE month IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET gen = gen + 1;
+END;
@@ -4,9 +4,14 @@ Imports all route blueprints and registers them on a Flask app instance.
 """
 
 from .admin_routes import admin_bp
+from .api_routes import api_bp
+from .assign_routes import assign_bp
 from .auth_routes import auth_bp
 from .calendar_routes import calendar_bp
+from .events_routes import events_bp
+from .history_routes import history_bp
 from .job_routes import job_bp
+from .search_routes import search_bp
 
 
 def register_routes(app) -> None:
@@ -22,3 +27,8 @@ def register_routes(app) -> None:
     app.register_blueprint(auth_bp)
     app.register_blueprint(job_bp)
     app.register_blueprint(admin_bp)
+    app.register_blueprint(api_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(assign_bp)
+    app.register_blueprint(history_bp)
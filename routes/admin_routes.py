@@ -1,21 +1,27 @@
-"""Admin routes: user management (list/create/update role/reset password/delete).
+"""Admin routes: user management (list/create/update role/reset password/delete), bulk job import, backups, and the audit log.
 
 Notes:
     - Access is restricted to role ``"admin"`` via ``@role_required("admin")``.
     - Creating a user sets ``must_reset_password = 1`` so the first login forces a password change.
 """
 
+import json
+from datetime import datetime
+
 from flask import (Blueprint, flash, redirect, render_template, request,
                    session, url_for)
 from werkzeug.security import generate_password_hash
 
 from db import get_database
+from utils import audit, backup, job_import
 from utils.decorators import role_required
 from utils.logger import setup_logger
 
 admin_bp = Blueprint("admin", __name__)
 logger = setup_logger()
 
+AUDIT_PAGE_SIZE = 100
+
 
 @admin_bp.route("/admin/users", methods=["GET", "POST"])
 @role_required("admin")
@@ -71,6 +77,7 @@ def admin_users():
                 )
 
             conn.commit()
+            audit.record("user", user_id, "update_role", after={"role": new_role})
             flash("Role updated.")
             logger.info(f"Admin updated role for user ID {user_id} to {new_role}.")
             return redirect(url_for("admin.admin_users"))
@@ -82,14 +89,20 @@ def admin_users():
                 "UPDATE users SET password = ? WHERE id = ?", (new_pw_hash, user_id)
             )
             conn.commit()
+            audit.record("user", user_id, "reset_password")
             flash("Password reset to 'changeme'.")
             logger.info(f"Admin reset password for user ID {user_id}")
             return redirect(url_for("admin.admin_users"))
 
         elif action == "delete_user":
             user_id = request.form.get("update_user_id")
+            before = cursor.execute(
+                "SELECT id, first_name, last_name, username, role FROM users WHERE id = ?",
+                (user_id,),
+            ).fetchone()
             cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
             conn.commit()
+            audit.record("user", user_id, "delete", before=before)
             flash("User deleted.")
             logger.info(f"Admin deleted user ID {user_id}")
             return redirect(url_for("admin.admin_users"))
@@ -106,6 +119,7 @@ def admin_users():
                 """INSERT INTO users (first_name, last_name, username, password, role, must_reset_password) VALUES (?, ?, ?, ?, ?, 1)""",
                 (first, last, username, hashed, role),
             )
+            user_id = cursor.lastrowid
 
             if role.lower() in ("technician", "tech"):
                 full_name = (
@@ -116,11 +130,182 @@ def admin_users():
                     "INSERT OR IGNORE INTO technicians (name) VALUES (?)", (full_name,)
                 )
             conn.commit()
+            audit.record(
+                "user",
+                user_id,
+                "create",
+                after={
+                    "first_name": first,
+                    "last_name": last,
+                    "username": username,
+                    "role": role,
+                },
+            )
             flash(f"User {username} created with role {role}.")
             return redirect(url_for("admin.admin_users"))
 
     cursor.execute("SELECT * FROM users ORDER BY last_name, first_name")
     users = cursor.fetchall()
-    conn.close()
 
     return render_template("admin_users.html", users=users)
+
+
+@admin_bp.route("/admin/audit", methods=["GET"])
+@role_required("admin")
+def admin_audit():
+    """Browse the audit log (admin only).
+
+    Filters are optional and combine with AND.  Results are newest first by id (the order the audit writer committed them) and paged by id, so every filter is a descending walk of an index: the primary key, ``(entity, id)`` or ``(entity, entity_id, id)`` (migration 0016).  A date range is first turned into an id range with one seek each on ``(occurred_at)``.
+
+    Query params:
+        - ``entity`` (str): ``job`` | ``series`` | ``time_off`` | ``lock`` | ``user``.
+        - ``entity_id`` (int): Only events for this row (requires ``entity``).
+        - ``date_from`` / ``date_to`` (``YYYY-MM-DD``): Inclusive UTC date range.
+        - ``before_id`` (int): Page cursor; show events older than this id.
+
+    Returns:
+        Response: Rendered ``admin_audit.html``.
+    """
+    entity = (request.args.get("entity") or "").strip() or None
+    entity_id = request.args.get("entity_id", type=int)
+    date_from = (request.args.get("date_from") or "").strip() or None
+    date_to = (request.args.get("date_to") or "").strip() or None
+    before_id = request.args.get("before_id", type=int)
+
+    conn = get_database()
+    where, params = [], []
+    if entity:
+        where.append("entity = ?")
+        params.append(entity)
+        if entity_id is not None:
+            where.append("entity_id = ?")
+            params.append(entity_id)
+    # dates become an id range (one seek each on idx_audit_occurred), so every
+    # filter is a descending walk of the primary key or an (entity, ..., id) index
+    if date_from:
+        first = conn.execute(
+            "SELECT id FROM audit_events WHERE occurred_at >= ? "
+            "ORDER BY occurred_at, id LIMIT 1",
+            (date_from,),
+        ).fetchone()
+        where += ["id >= ?", "occurred_at >= ?"]
+        params += [first["id"] if first else -1, date_from]
+    if date_to:
+        last = conn.execute(
+            "SELECT id FROM audit_events WHERE occurred_at < date(?, '+1 day') "
+            "ORDER BY occurred_at DESC, id DESC LIMIT 1",
+            (date_to,),
+        ).fetchone()
+        where += ["id <= ?", "occurred_at < date(?, '+1 day')"]
+        params += [last["id"] if last else -1, date_to]
+    if before_id:
+        where.append("id < ?")
+        params.append(before_id)
+
+    events = conn.execute(
+        f"""
+        SELECT id, occurred_at, actor_id, actor_name, entity, entity_id, action, changes
+        FROM audit_events
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (*params, AUDIT_PAGE_SIZE),
+    ).fetchall()
+    events = [
+        {**dict(e), "changes": json.loads(e["changes"]) if e["changes"] else {}}
+        for e in events
+    ]
+    next_before_id = events[-1]["id"] if len(events) == AUDIT_PAGE_SIZE else None
+
+    return render_template(
+        "admin_audit.html",
+        events=events,
+        entity=entity,
+        entity_id=entity_id,
+        date_from=date_from,
+        date_to=date_to,
+        next_before_id=next_before_id,
+    )
+
+
+@admin_bp.route("/admin/import", methods=["GET", "POST"])
+@role_required("admin")
+def admin_import():
+    """Bulk-import jobs from an uploaded CSV or JSONL file (admin only).
+
+    The upload is streamed through ``utils.job_import`` -- the same validation and conflict checks as the add-job form, batched ZIP resolution, and chunked transactions -- and the per-row report is rendered back.
+
+    Form fields:
+        - ``file``: the upload (``.csv`` with a header row, or ``.jsonl``).
+        - ``allow_conflicts``: import rows despite technician conflicts ("Book anyway").
+
+    Returns:
+        Response: On GET, the upload form.  On POST, the form plus the import report.
+    """
+    report = None
+    if request.method == "POST":
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            flash("Choose a file to import.", "error")
+            return redirect(url_for("admin.admin_import"))
+        name = upload.filename.lower()
+        fmt = "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+
+        conn = get_database()
+        report = job_import.import_jobs(
+            conn,
+            job_import.read_rows(upload.stream, fmt),
+            created_by=session["user"].get("user_id"),
+            allow_conflicts=bool(request.form.get("allow_conflicts")),
+        )
+        audit.record(
+            "job",
+            None,
+            "import",
+            after={
+                "file": upload.filename,
+                "inserted": report.inserted,
+                "rejected": len(report.errors),
+            },
+        )
+        logger.info(
+            f"Admin imported {report.inserted}/{report.total} jobs from {upload.filename} "
+            f"({report.rows_per_second:.0f} rows/s)"
+        )
+
+    return render_template("admin_import.html", report=report)
+
+
+@admin_bp.route("/admin/backups", methods=["GET", "POST"])
+@role_required("admin")
+def admin_backups():
+    """List database snapshots and start an online backup (admin only).
+
+    A POST starts ``utils.backup.run_backup`` on a background thread and redirects straight back (PRG); the page shows whether a backup is running and the timings of the last run in this process.
+
+    Returns:
+        Response: On GET, render ``admin_backups.html``.  On POST, flash a status and redirect back to ``admin.admin_backups``.
+    """
+    if request.method == "POST":
+        if backup.start_backup():
+            logger.info(f"Backup started by {session['user'].get('username')}")
+            flash("Backup started.  Refresh to see the result.", "success")
+        else:
+            flash("A backup is already running.", "error")
+        return redirect(url_for("admin.admin_backups"))
+
+    snapshots = [
+        {
+            "name": path.name,
+            "size": path.stat().st_size,
+            "modified": datetime.fromtimestamp(path.stat().st_mtime),
+        }
+        for path in backup.list_backups()
+    ]
+    return render_template(
+        "admin_backups.html",
+        snapshots=snapshots,
+        running=backup.is_running(),
+        report=backup.last_report(),
+    )
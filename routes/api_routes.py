@@ -0,0 +1,450 @@
+"""JSON API: compact month-grid and day payloads for wallboard and mobile clients, plus helpers for the job forms and dispatch.
+
+Exposes:
+- GET /api/month?year=&month=   -> month grid
+- GET /api/day/<date>           -> one day
+- GET /api/conflicts?...         -> scheduling conflicts for a job being entered (login required)
+- GET /api/nearby?zip=&...       -> REI jobs near a ZIP in a date range, nearest first (login required)
+- POST /api/jobs/batch           -> move, reassign and delete many jobs in one transaction (login required)
+
+Notes:
+    - Jobs and time off are listed once, keyed by id; ``days`` maps ISO dates to the ids shown on that day, so a multi-day job is not repeated per cell.  Only days with something on them appear.
+    - Columns are selected explicitly and renamed to short keys; ``null`` / empty fields are dropped.
+    - Month payloads are serialized (and gzip-compressed) once per data version and kept in ``month_cache``; the same trigger-maintained generations drive ``ETag`` / ``Last-Modified``, so unchanged data is answered with 304 without querying, and clients that send ``Accept-Encoding: gzip`` get the pre-compressed bytes.
+    - Like the HTML month and day views, the month and day endpoints do not require a login.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+
+from flask import Blueprint, Response, jsonify, request, session
+
+from db import get_database
+from routes.calendar_routes import (
+    STATE_CODE,
+    _grid_months,
+    _load_month,
+    _month_weeks,
+)
+from utils import archive, audit, conflicts, http_cache, job_batch, zip_index
+from utils.decorators import login_required
+from utils.holidays_util import holidays_for_month
+from utils.job_form import normalize_hhmm, parse_date, parse_technician
+from utils.logger import setup_logger
+from utils.month_cache import month_cache, month_index, versions
+
+api_bp = Blueprint("api", __name__, url_prefix="/api")
+logger = setup_logger()
+
+# Month-grid job columns (from calendar._load_month) -> API keys.
+MONTH_JOB_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "type": "type",
+    "price": "price",
+    "start_date": "start",
+    "end_date": "end",
+    "start_time": "start_time",
+    "end_time": "end_time",
+    "time_range": "time_range",
+    "technician_id": "tech_id",
+    "technician_label": "tech",
+    "two_man": "two_man",
+    "rei_quantity": "rei_qty",
+    "rei_zip": "rei_zip",
+    "rei_city_name": "rei_city",
+}
+
+NEARBY_DEFAULT_MILES = 10
+NEARBY_MAX_MILES = 50
+NEARBY_MAX_DAYS = 31
+
+
+def _compact(row, fields: dict) -> dict:
+    """Pick ``fields`` from ``row`` under their API names, dropping null/empty values."""
+    out = {}
+    for column, key in fields.items():
+        value = row[column]
+        if value is not None and value != "":
+            out[key] = value
+    return out
+
+
+def _encode(payload: dict) -> tuple[bytes, bytes]:
+    """Serialize once, compactly, and pre-compress."""
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return body, gzip.compress(body, compresslevel=6)
+
+
+def _send(encoded: tuple[bytes, bytes], etag: str, last_modified) -> Response:
+    body, gz = encoded
+    use_gz = bool(request.accept_encodings["gzip"])
+    resp = Response(gz if use_gz else body, mimetype="application/json")
+    if use_gz:
+        resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    return http_cache.add_validators(resp, etag, last_modified, per_user=False)
+
+
+def _validators(*parts, changed):
+    """Validators for one representation (identity and gzip bodies get distinct ETags)."""
+    etag, last_modified = http_cache.validators(*parts, changed=changed, per_user=False)
+    if request.accept_encodings["gzip"]:
+        etag += "-gz"
+    return etag, last_modified
+
+
+def _month_payload(
+    year: int, month: int, grid_start: date, grid_end: date, data: dict
+) -> tuple[bytes, bytes]:
+    """Reshape ``calendar._load_month`` data into the compact API form."""
+    jobs, time_off, days = {}, {}, {}
+    for day, rows in data["jobs_by_date"].items():
+        ids = []
+        for row in rows:
+            if row["id"] not in jobs:
+                jobs[row["id"]] = _compact(row, MONTH_JOB_FIELDS)
+            ids.append(row["id"])
+        days.setdefault(day, {})["jobs"] = ids
+    for day, entries in data["time_off_by_date"].items():
+        for entry in entries:
+            time_off.setdefault(
+                entry["id"],
+                {
+                    "id": entry["id"],
+                    "tech_id": entry["owner_id"],
+                    "tech": entry["name"],
+                },
+            )
+        days.setdefault(day, {})["off"] = [entry["id"] for entry in entries]
+    for day in data["locks"]:
+        days.setdefault(day, {})["locked"] = True
+    for day, name in holidays_for_month(year, month, state=STATE_CODE).items():
+        days.setdefault(day, {})["holiday"] = name
+
+    return _encode(
+        {
+            "year": year,
+            "month": month,
+            "grid": {"start": grid_start.isoformat(), "end": grid_end.isoformat()},
+            "jobs": list(jobs.values()),
+            "time_off": list(time_off.values()),
+            "days": dict(sorted(days.items())),
+        }
+    )
+
+
+@api_bp.route("/month", methods=["GET"])
+def month():
+    """Return the month grid as compact JSON.
+
+    Query params:
+        - ``year`` (int, default current year)
+        - ``month`` (int ``1..12``, default current month)
+
+    Returns:
+        Response: ``{"year", "month", "grid": {"start", "end"}, "jobs": [...], "time_off": [...], "days": {"YYYY-MM-DD": {"jobs": [ids], "off": [ids], "locked": true, "holiday": "..."}}}``, 304 when unchanged, or 400 for an invalid month.
+    """
+    today = date.today()
+    year = request.args.get("year", type=int, default=today.year)
+    month = request.args.get("month", type=int, default=today.month)
+    if not (1 <= month <= 12 and 1 <= year <= 9999):
+        return jsonify(error="month must be 1-12 and year 1-9999"), 400
+
+    weeks = _month_weeks(year, month, firstweekday=6)
+    grid_start, grid_end = weeks[0][0], weeks[-1][-1]
+
+    conn = get_database()
+    months = _grid_months(grid_start, grid_end)
+    gens, changed = versions(conn, months)
+    etag, last_modified = _validators(year, month, gens, changed=changed)
+    if http_cache.is_fresh(etag, last_modified, per_user=False):
+        return http_cache.not_modified(etag, last_modified, per_user=False)
+
+    # shares the HTML view's cache entry; the encoded payload is cached separately
+    data = month_cache.get(
+        conn,
+        (year, month),
+        months,
+        lambda: _load_month(conn, grid_start, grid_end),
+        gens=gens,
+    )
+    encoded = month_cache.get(
+        conn,
+        ("api-month", year, month),
+        months,
+        lambda: _month_payload(year, month, grid_start, grid_end, data),
+        gens=gens,
+    )
+    return _send(encoded, etag, last_modified)
+
+
+def _day_payload(conn, dt: date) -> tuple[bytes, bytes]:
+    """Query one day (live database plus any overlapping archive) with explicit columns."""
+    sel = {"sel": dt.toordinal()}
+    schemas = archive.attach_for_range(conn, sel["sel"], sel["sel"])
+    locked = bool(
+        archive.select_across(
+            conn, schemas, "SELECT 1 FROM {db}.locks WHERE date = ?", (dt.isoformat(),)
+        )
+    )
+    time_off = archive.select_across(
+        conn,
+        schemas,
+        """
+        SELECT toff.id, toff.technician_id AS tech_id, tech.name AS tech, toff.reason
+        FROM {db}.time_off_days td
+        JOIN {db}.time_off AS toff ON toff.id = td.time_off_id
+        LEFT JOIN technicians AS tech ON tech.id = toff.technician_id
+        WHERE td.day = :sel
+        ORDER BY tech.name
+        """,
+        sel,
+        key=lambda r: r["tech"] or "",
+    )
+    jobs = archive.select_across(
+        conn,
+        schemas,
+        """
+        SELECT
+            j.id,
+            j.title,
+            j.job_type AS type,
+            j.price,
+            j.start_date AS start,
+            j.end_date AS "end",
+            j.start_time,
+            j.end_time,
+            j.time_range,
+            j.notes,
+            j.technician_id AS tech_id,
+            CASE
+                WHEN j.two_man = 1 THEN 'Two Man'
+                ELSE t.name
+            END AS tech,
+            j.two_man,
+            j.rei_quantity AS rei_qty,
+            j.rei_zip,
+            j.rei_city_name AS rei_city,
+            j.exclusion_subtype,
+            j.fumigation_type,
+            j.target_pest,
+            j.custom_pest,
+            cu.username AS created_by,
+            mu.username AS modified_by
+        FROM {db}.job_days jd
+        JOIN {db}.jobs j ON j.id = jd.job_id
+        LEFT JOIN technicians t ON t.id = j.technician_id
+        LEFT JOIN users cu ON cu.id = j.created_by
+        LEFT JOIN users mu ON mu.id = j.last_modified_by
+        WHERE jd.day = :sel
+        ORDER BY j.start_date, j.id
+        """,
+        sel,
+        key=itemgetter("start", "id"),
+    )
+    holiday = holidays_for_month(dt.year, dt.month, state=STATE_CODE).get(
+        dt.isoformat()
+    )
+    payload = {
+        "date": dt.isoformat(),
+        "locked": locked,
+        "jobs": [_compact(row, {k: k for k in row.keys()}) for row in jobs],
+        "time_off": [_compact(row, {k: k for k in row.keys()}) for row in time_off],
+    }
+    if holiday:
+        payload["holiday"] = holiday
+    return _encode(payload)
+
+
+@api_bp.route("/day/<selected_date>", methods=["GET"])
+def day(selected_date: str):
+    """Return one day's jobs, time off, lock and holiday as compact JSON.
+
+    Args:
+        selected_date (str): ISO date ``YYYY-MM-DD``.
+
+    Returns:
+        Response: ``{"date", "locked", "jobs": [...], "time_off": [...], "holiday"?}``, 304 when unchanged, or 400 for a malformed date.
+    """
+    try:
+        dt = datetime.fromisoformat(selected_date).date()
+    except ValueError:
+        return jsonify(error="date must be YYYY-MM-DD"), 400
+
+    conn = get_database()
+    months = [month_index(dt.year, dt.month)]
+    gens, changed = versions(conn, months)
+    etag, last_modified = _validators(dt, gens, changed=changed)
+    if http_cache.is_fresh(etag, last_modified, per_user=False):
+        return http_cache.not_modified(etag, last_modified, per_user=False)
+
+    return _send(_day_payload(conn, dt), etag, last_modified)
+
+
+@api_bp.route("/conflicts", methods=["GET"])
+@login_required
+def job_conflicts():
+    """Check a job being entered for conflicts, as the add/edit forms and the move dialog do on change.
+
+    Query params:
+        - ``start_date`` (required) / ``end_date`` (``YYYY-MM-DD``): The job's span.
+        - ``technician_id``: Technician id or ``"__BOTH__"`` (two-man).
+        - ``start_time`` / ``end_time`` (``HH:MM``): Time of day; double booking is only checked when both are given.
+        - ``job_id`` (int): The job being edited or moved, excluded from its own check.
+
+    Returns:
+        Response: ``{"conflicts": [{"kind", "first_date", "last_date", "ref_id", "detail", "message"}, ...], "blocking": bool}`` (``blocking`` when a conflict cannot be overridden), or 400 for a missing/malformed start date.
+    """
+    start = parse_date(request.args.get("start_date"))
+    if start is None:
+        return jsonify(error="start_date must be YYYY-MM-DD"), 400
+    end = parse_date(request.args.get("end_date")) or start
+    if end < start:
+        return jsonify(error="end_date cannot be before start_date"), 400
+    technician_id, two_man = parse_technician(request.args.get("technician_id"))
+    try:
+        start_time = normalize_hhmm(request.args.get("start_time"))
+        end_time = normalize_hhmm(request.args.get("end_time"))
+    except ValueError:
+        return jsonify(error="times must be HH:MM"), 400
+    found = conflicts.check(
+        get_database(),
+        start,
+        end,
+        technician_id,
+        two_man,
+        start_time,
+        end_time,
+        exclude_job_id=request.args.get("job_id", type=int),
+    )
+    return jsonify(
+        conflicts=[c.to_dict() for c in found],
+        blocking=any(c.kind in conflicts.BLOCKING for c in found),
+    )
+
+
+@api_bp.route("/nearby", methods=["GET"])
+@login_required
+def nearby():
+    """List jobs scheduled near a ZIP code, nearest first, e.g. to group REIs for one technician's day.
+
+    Query params:
+        - ``zip`` (required): Origin ZIP code.
+        - ``date_from`` / ``date_to`` (``YYYY-MM-DD``): Jobs overlapping this range; defaults to the seven days from today.  At most ``NEARBY_MAX_DAYS`` days.
+        - ``radius`` (float): Miles between ZIP centroids; defaults to ``NEARBY_DEFAULT_MILES``, at most ``NEARBY_MAX_MILES``.
+
+    Only jobs with a ZIP (REIs) in the live database are found.  Nearby ZIPs come from the in-memory grid in ``utils.zip_index``; their jobs are then read with one seek per ZIP on ``(rei_zip, end_day, start_day)`` (migration 0014).
+
+    Returns:
+        Response: ``{"zip", "city", "radius", "date_from", "date_to", "jobs": [{..., "miles"}]}`` sorted by distance then date, 400 for bad parameters, or 404 for a ZIP with no known location.
+    """
+    code = (request.args.get("zip") or "").strip()
+    if not zip_index.is_zip(code):
+        return jsonify(error="zip must be 5 digits"), 400
+    date_from = parse_date(request.args.get("date_from")) or date.today()
+    date_to = parse_date(request.args.get("date_to")) or date_from + timedelta(days=6)
+    if date_to < date_from:
+        return jsonify(error="date_to cannot be before date_from"), 400
+    if (date_to - date_from).days >= NEARBY_MAX_DAYS:
+        return jsonify(error=f"date range is limited to {NEARBY_MAX_DAYS} days"), 400
+    radius = request.args.get("radius", type=float, default=NEARBY_DEFAULT_MILES)
+    if not 0 <= radius <= NEARBY_MAX_MILES:
+        return jsonify(error=f"radius must be 0-{NEARBY_MAX_MILES} miles"), 400
+
+    miles = zip_index.zips_near(code, radius)
+    if miles is None:
+        return jsonify(error="unknown ZIP"), 404
+    rows = (
+        get_database()
+        .execute(
+            """
+        SELECT
+            j.id,
+            j.title,
+            j.job_type AS type,
+            j.start_date AS start,
+            j.end_date AS "end",
+            j.start_time,
+            j.end_time,
+            j.technician_id AS tech_id,
+            CASE
+                WHEN j.two_man = 1 THEN 'Two Man'
+                ELSE t.name
+            END AS tech,
+            j.rei_quantity AS rei_qty,
+            j.rei_zip,
+            j.rei_city_name AS rei_city
+        FROM jobs j
+        LEFT JOIN technicians t ON t.id = j.technician_id
+        WHERE j.rei_zip IN (SELECT value FROM json_each(:zips))
+          AND j.end_day >= :lo AND j.start_day <= :hi
+        """,
+            {
+                "zips": json.dumps(list(miles)),
+                "lo": date_from.toordinal(),
+                "hi": date_to.toordinal(),
+            },
+        )
+        .fetchall()
+    )
+    jobs = [
+        {
+            **_compact(row, {k: k for k in row.keys()}),
+            "miles": round(miles[row["rei_zip"]], 1),
+        }
+        for row in rows
+    ]
+    jobs.sort(key=itemgetter("miles", "start", "id"))
+    return jsonify(
+        zip=code,
+        city=zip_index.city_for(code),
+        radius=radius,
+        date_from=date_from.isoformat(),
+        date_to=date_to.isoformat(),
+        jobs=jobs,
+    )
+
+
+@api_bp.route("/jobs/batch", methods=["POST"])
+@login_required
+def jobs_batch():
+    """Apply many job moves, reassignments and deletes at once, all or nothing.
+
+    JSON body:
+        - ``ops`` (list, required): ``{"op": "move", "job_id", "new_date"}``, ``{"op": "reassign", "job_id", "technician_id"}`` (an id, ``"__BOTH__"`` or ``null``) and ``{"op": "delete", "job_id"}``, applied in order.  At most ``job_batch.MAX_OPS``.
+        - ``allow_conflicts`` (bool): Apply despite technician conflicts; locked days still refuse.
+
+    Like every POST, the request needs the CSRF token (``X-CSRFToken`` header).  Each operation is checked as the single-job routes would, against the schedule left by the operations before it (see ``utils.job_batch``).
+
+    Returns:
+        Response: ``{"ok", "results": [{"index", "op", "job_id", "ok", "error"?, "conflicts"?}], "days": [ISO dates changed]}``.  200 when every operation was applied, 409 when any was refused (nothing is written), or 400 for a malformed body.
+    """
+    body = request.get_json(silent=True)
+    ops = body.get("ops") if isinstance(body, dict) else None
+    if not isinstance(ops, list) or not ops:
+        return jsonify(error="ops must be a non-empty list"), 400
+    if len(ops) > job_batch.MAX_OPS:
+        return jsonify(error=f"at most {job_batch.MAX_OPS} ops per batch"), 400
+
+    user = session["user"]
+    results, days, events = job_batch.run(
+        get_database(),
+        ops,
+        role=user.get("role"),
+        user_id=user.get("user_id"),
+        allow_conflicts=bool(body.get("allow_conflicts")),
+    )
+    ok = all(r["ok"] for r in results)
+    if not ok:
+        return jsonify(ok=False, results=results, days=[]), 409
+    for event in events:
+        audit.record(*event)
+    logger.info(
+        f"Batch of {len(ops)} job changes by user ID {user.get('user_id')} ({', '.join(sorted({r['op'] for r in results}))}) touching {days[0]} to {days[-1]}"
+    )
+    return jsonify(ok=True, results=results, days=days)
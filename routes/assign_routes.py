@@ -0,0 +1,156 @@
+"""Automatic technician assignment for jobs saved without a technician.
+
+Exposes:
+- GET  /assign        -> date range form; with a range, a preview of the proposed assignments
+- POST /assign/apply  -> write a previewed proposal in one transaction
+
+Notes:
+    Solving is in ``utils/auto_assign.py``.  The preview runs on a reader connection and writes nothing; applying re-checks every assignment against the schedule as it is then.
+"""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date
+
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from db import get_database
+from routes.calendar_routes import STATE_CODE
+from utils import audit, auto_assign
+from utils.decorators import login_required, role_required
+from utils.job_form import parse_date
+from utils.logger import setup_logger
+
+assign_bp = Blueprint("assign", __name__)
+logger = setup_logger()
+
+
+def _read_options(values) -> tuple[dict, str | None]:
+    """Parse the range and solver options shared by the preview and apply forms.
+
+    Args:
+        values (Mapping): ``request.args`` or ``request.form``.
+
+    Returns:
+        tuple[dict, str | None]: ``(options, error)``; ``options`` holds ``start``, ``end``, ``max_per_day`` and ``skip_holidays``.
+    """
+    start = parse_date(values.get("date_from"))
+    end = parse_date(values.get("date_to"))
+    try:
+        max_per_day = int(values.get("max_per_day") or auto_assign.MAX_PER_DAY)
+    except ValueError:
+        max_per_day = 0
+    options = {
+        "start": start,
+        "end": end,
+        "max_per_day": max_per_day,
+        "skip_holidays": not values.get("include_holidays"),
+    }
+    if not start or not end:
+        return options, "Choose a start and end date."
+    if end < start:
+        return options, "End date must be on or after the start date."
+    if (end - start).days >= auto_assign.MAX_RANGE_DAYS:
+        return (
+            options,
+            f"Choose a range of at most {auto_assign.MAX_RANGE_DAYS} days.",
+        )
+    if not 1 <= max_per_day <= 20:
+        return options, "Jobs per technician per day must be between 1 and 20."
+    return options, None
+
+
+@assign_bp.route("/assign", methods=["GET"])
+@login_required
+@role_required("admin", "manager")
+def assign():
+    """Show the range form and, once a range is given, the proposed assignments.
+
+    Query params:
+        - ``date_from`` / ``date_to`` (``YYYY-MM-DD``): Jobs overlapping this range are considered.
+        - ``max_per_day`` (int): Most jobs per technician per day.
+        - ``include_holidays``: Also assign jobs that fall on a holiday.
+
+    Returns:
+        Response: Rendered ``assign.html``.
+    """
+    plan = None
+    if request.args.get("date_from") or request.args.get("date_to"):
+        options, error = _read_options(request.args)
+        if error:
+            flash(error, "error")
+        else:
+            plan = auto_assign.solve(get_database(), state=STATE_CODE, **options)
+    else:
+        today = date.today()
+        last = calendar.monthrange(today.year, today.month)[1]
+        options = {
+            "start": today,
+            "end": today.replace(day=last),
+            "max_per_day": auto_assign.MAX_PER_DAY,
+            "skip_holidays": True,
+        }
+
+    rows, left = [], []
+    if plan:
+        by_day = lambda pair: (pair[0]["start_day"], pair[0]["id"])  # noqa: E731
+        rows = sorted(
+            ((plan.jobs[job_id], tech) for job_id, tech in plan.assignments.items()),
+            key=by_day,
+        )
+        left = sorted(
+            ((plan.jobs[job_id], why) for job_id, why in plan.left.items()),
+            key=by_day,
+        )
+    return render_template(
+        "assign.html", options=options, plan=plan, rows=rows, left=left
+    )
+
+
+@assign_bp.route("/assign/apply", methods=["POST"])
+@login_required
+@role_required("admin", "manager")
+def assign_apply():
+    """Apply a previewed proposal.
+
+    Form fields:
+        - The preview's ``date_from``, ``date_to``, ``max_per_day`` and ``include_holidays``.
+        - ``assign`` (repeated): ``<job id>:<technician id>`` pairs.
+
+    All assignments are re-checked and written in the request's single write transaction.  Jobs assigned, booked over, locked or otherwise changed since the preview are skipped and counted in the flash.
+
+    Returns:
+        Response: Redirect to the month of the range's start.
+    """
+    options, error = _read_options(request.form)
+    if error:
+        flash(error, "error")
+        return redirect(url_for("assign.assign"))
+    proposal = {}
+    for pair in request.form.getlist("assign"):
+        job_id, _, tech = pair.partition(":")
+        if job_id.isdigit() and tech.isdigit():
+            proposal[int(job_id)] = int(tech)
+
+    user_id = session.get("user", {}).get("user_id")
+    applied, rejected = auto_assign.apply(
+        get_database(), proposal, state=STATE_CODE, user_id=user_id, **options
+    )
+    for job_id, tech in applied.items():
+        audit.record(
+            "job",
+            job_id,
+            "assign",
+            before={"technician_id": None},
+            after={"technician_id": tech},
+        )
+    message = f"Assigned {len(applied)} jobs."
+    if rejected:
+        message += f"  Skipped {len(rejected)} that no longer fit the schedule; preview again to place them."
+    flash(message, "success" if applied else "error")
+    logger.info(
+        f"Auto-assigned {len(applied)} jobs ({len(rejected)} skipped) for {options['start']} to {options['end']} by user ID {user_id}"
+    )
+    start = options["start"]
+    return redirect(url_for("calendar.index", year=start.year, month=start.month))
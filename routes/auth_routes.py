@@ -35,7 +35,8 @@ def login():
     if request.method == "POST":
         username = request.form["username"]
         password = request.form["password"]
-        connection = get_database()
+        # Read-only: don't hold the writer while the password hash is checked.
+        connection = get_database(readonly=True)
         cursor = connection.cursor()
         cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
         user = cursor.fetchone()
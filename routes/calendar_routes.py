@@ -2,28 +2,80 @@
 
 Exposes:
 - GET  /                    -> month view (index)
+- GET  /cells               -> selected month-view day cells (live refresh)
 - GET  /day/<date>          -> day view
+- GET  /day/<date>/jobs     -> the day view's job list only (after batch edits)
+- GET  /year                -> year-at-a-glance heatmap
 - POST /time_off/add        -> add time off
 - POST /lock/toggle         -> lock/unlock a day
 
 Notes:
     Uses state code ``VA`` for holidays via ``holidays_for_month``.
+    Month and day views read the trigger-maintained ``job_days`` / ``time_off_days`` fan-out tables (one row per covered day, keyed by ``date.toordinal()``), so rows come back bucketed by day without expanding spans in Python.
+    Past months also read any yearly archive covering the visible range (``utils/archive.py``); queries name archived tables as ``{db}.<table>``.
+    Month-view query results are cached per (year, month) in ``utils/month_cache.py`` and invalidated by trigger-maintained per-month write generations.
+    The month template receives precomputed view models (``JobCell`` / ``OffCell``, built once per job and cached with the query results) with each day's jobs already sorted, so per-cell work in Jinja is limited to output.
+    Rendered day cells are cached as HTML fragments (``utils/fragment_cache.py``) keyed by the day's content digest, lock, holiday, date state and the viewer's permissions; a month render re-renders only cells whose key changed and fills in the CSRF token once.
+    Both views answer conditional GETs (``If-None-Match`` / ``If-Modified-Since``) with 304 from those generations alone, before querying or rendering (``utils/http_cache.py``).
 """
 
-from collections import defaultdict
+import hashlib
 from calendar import Calendar, month_name
 from datetime import date, datetime, timedelta
-
-from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+from itertools import groupby
+from operator import itemgetter
+
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+from flask_wtf.csrf import generate_csrf
+from markupsafe import Markup
 
 from db import get_database
+from utils import archive, audit, http_cache
 from utils.decorators import login_required, role_required
 from utils.holidays_util import holidays_for_month
 from utils.logger import setup_logger
+from utils.fragment_cache import cell_cache
+from utils.month_cache import month_cache, month_index, versions
 
 calendar_bp = Blueprint("calendar", __name__)
 log = setup_logger()
 
+STATE_CODE = "VA"
+HEAT_LEVELS = 4
+
+TYPE_ABBR = {
+    "termite": "T",
+    "borate": "BOR",
+    "pretreat": "PT",
+    "retreat": "RT",
+    "bird work": "BRD",
+    "power spray": "PS",
+    "fumigation": "FUME",
+    "insulation": "INSU",
+    "exclusion": "EXC",
+    "rei": "REIs",
+    "reis": "REIs",
+    "pest control special service": "PCSS",
+    "vapor barrier": "VAPR",
+    "shop work": "SHOP",
+    "misc": "MISC",
+    "miscellaneous": "MISC",
+}
+REI_TYPES = ("rei", "reis")
+# Stands in for the CSRF token inside cached cell fragments; autoescaped user
+# content can never produce a literal "<!--".
+CSRF_PLACEHOLDER = Markup("<!--csrf-token-->")
+
 
 def _month_weeks(year: int, month: int, firstweekday: int = 6) -> list[list[date]]:
     """Return a month as a list of week rows, each a list of 7 dates (Sunday-first by default)."""
@@ -42,35 +94,253 @@ def _expand_multi_day(sd_str: str, ed_str: str | None):
         d += timedelta(days=1)
 
 
-@calendar_bp.route("/", endpoint="index")
-def index():
-    today = date.today()
-    month = request.args.get("month", type=int, default=today.month)
-    year = request.args.get("year", type=int, default=today.year)
+def _grid_months(grid_start: date, grid_end: date) -> range:
+    """Return the ``month_index`` keys of every month a grid touches."""
+    return range(
+        month_index(grid_start.year, grid_start.month),
+        month_index(grid_end.year, grid_end.month) + 1,
+    )
 
-    # build week grid
-    weeks = _month_weeks(year, month, firstweekday=6)
-    grid_start = weeks[0][0]
-    grid_end = weeks[-1][-1]
-    grid_start_s, grid_end_s = grid_start.isoformat(), grid_end.isoformat()
 
-    prev_month, prev_year = (12, year - 1) if month == 1 else (month - 1, year)
-    next_month, next_year = (1, year + 1) if month == 12 else (month + 1, year)
+def _short_name(name: str | None) -> str:
+    """Return ``"F.Lastname"`` for a full name (the name unchanged if it has no parts)."""
+    parts = (name or "").split()
+    if not parts:
+        return name or ""
+    return f"{parts[0][0]}.{parts[1] if len(parts) > 1 else ''}"
 
-    conn = get_database()
-    cur = conn.cursor()
+
+def _format_price(price) -> str | None:
+    """Format a job price like ``$125`` / ``$99.5``; ``None`` when there is no price."""
+    if price in (None, "", 0):
+        return None
+    try:
+        value = float(price)
+    except (TypeError, ValueError):
+        value = 0.0
+    return ("%0.2f" % value).rstrip("0").rstrip(".")
+
+
+class JobCell:
+    """Display fields for one job on the month grid, computed once per job however many days it covers.
+
+    Attributes:
+        id (int): Job id.
+        rei (bool): Whether the job renders as an REI tile.
+        label (str): Title shown on the tile (``"Unknown"`` if blank).
+        abbr (str): Job-type tag from ``TYPE_ABBR``.
+        time (str | None): ``time_range`` unless ``any``, else ``start-end`` if both are set.
+        tech (str): ``"Two Men"``, the technician's name, or ``""``.
+        price (str | None): Formatted price (shown on the first day only).
+        rei_qty (int): REI quantity.
+        rei_place (str | None): REI city, falling back to the ZIP.
+        start_date (str): ISO start date.
+        end_date (str | None): ISO end date.
+        multi_day (bool): Whether the job spans more than one day.
+        sort_key (tuple): Per-day ordering: ``(time_range, id)``.
+    """
+
+    __slots__ = (
+        "id",
+        "rei",
+        "label",
+        "abbr",
+        "time",
+        "tech",
+        "price",
+        "rei_qty",
+        "rei_place",
+        "start_date",
+        "end_date",
+        "multi_day",
+        "sort_key",
+    )
+
+    def __init__(self, row) -> None:
+        job_type = (row["type"] or "").lower()
+        self.id = row["id"]
+        self.rei = job_type in REI_TYPES
+        self.label = row["title"] or "Unknown"
+        self.abbr = TYPE_ABBR.get(job_type, job_type[:1].upper() if job_type else "?")
+        time_range = row["time_range"]
+        if time_range and time_range != "any":
+            self.time = time_range
+        elif row["start_time"] and row["end_time"]:
+            self.time = f"{row['start_time']}-{row['end_time']}"
+        else:
+            self.time = None
+        self.tech = "Two Men" if row["two_man"] else (row["technician_name"] or "")
+        self.price = _format_price(row["price"])
+        self.rei_qty = row["rei_quantity"] or 0
+        self.rei_place = row["rei_city_name"] or row["rei_zip"]
+        self.start_date = row["start_date"]
+        self.end_date = row["end_date"]
+        self.multi_day = bool(
+            self.start_date and self.end_date and self.start_date != self.end_date
+        )
+        self.sort_key = (time_range or "", self.id)
+
+
+class OffCell:
+    """Display fields for one time-off entry on the month grid.
+
+    Attributes:
+        id (int): Time-off id.
+        owner_id (int): Technician id (for the remove permission check).
+        name (str): Technician's full name.
+        short (str): ``F.Lastname``.
+    """
+
+    __slots__ = ("id", "owner_id", "name", "short")
+
+    def __init__(self, entry: dict) -> None:
+        self.id = entry["id"]
+        self.owner_id = entry["owner_id"]
+        self.name = entry["name"]
+        self.short = _short_name(entry["name"])
+
+
+def _month_cells(data: dict) -> dict:
+    """Build the month template's per-day view model from ``_load_month`` data.
+
+    Each job becomes one ``JobCell`` shared by every day it covers; each day gets a tuple of ``(cell, first_day, continues_left, continues_right)`` already sorted by ``sort_key``.
+
+    Args:
+        data (dict): Result of ``_load_month``.
+
+    Returns:
+        dict: ``jobs`` and ``time_off`` (ISO date -> tuple) for ``_calendar_cell.html``, and ``digests`` (ISO date -> hex digest of everything those tuples display, for the fragment cache key).
+    """
+    cells: dict[int, JobCell] = {}
+    jobs = {}
+    for day, rows in data["jobs_by_date"].items():
+        placed = []
+        for row in rows:
+            cell = cells.get(row["id"])
+            if cell is None:
+                cell = cells[row["id"]] = JobCell(row)
+            first = day == cell.start_date
+            placed.append(
+                (
+                    cell,
+                    first,
+                    cell.multi_day and not first,
+                    cell.multi_day and day != cell.end_date,
+                )
+            )
+        placed.sort(key=lambda p: p[0].sort_key)
+        jobs[day] = tuple(placed)
+
+    time_off = {
+        day: tuple(OffCell(entry) for entry in entries)
+        for day, entries in data["time_off_by_date"].items()
+    }
+
+    digests = {}
+    for day in jobs.keys() | time_off.keys():
+        shown = (
+            [
+                (*(getattr(cell, f) for f in JobCell.__slots__), *flags)
+                for cell, *flags in jobs.get(day, ())
+            ],
+            [
+                tuple(getattr(off, f) for f in OffCell.__slots__)
+                for off in time_off.get(day, ())
+            ],
+        )
+        digests[day] = hashlib.blake2b(repr(shown).encode(), digest_size=16).hexdigest()
+    return {"jobs": jobs, "time_off": time_off, "digests": digests}
+
+
+def _render_cells(
+    weeks: list[list[date]], today: date, cells: dict, locks: set, holidays: dict
+) -> list[list[Markup]]:
+    """Render the month grid's day cells, reusing cached fragments for unchanged days.
+
+    A cell's cache key is everything ``_calendar_cell.html`` shows: the date, the digest of its jobs and time off, its lock and holiday, whether it is past/today/future, and which time-off entries the viewer may remove.  The CSRF token is left as ``CSRF_PLACEHOLDER`` for ``index`` to fill in once per page.
+
+    Args:
+        weeks (list[list[date]]): Grid from ``_month_weeks``.
+        today (date): Today's date.
+        cells (dict): Result of ``_month_cells``.
+        locks (set): Locked ISO dates.
+        holidays (dict): ISO date -> holiday name.
+
+    Returns:
+        list[list[Markup]]: Rendered ``<td>`` fragments, one row per week.
+    """
+    template = current_app.jinja_env.get_template("_calendar_cell.html")
+    user = session.get("user") or {}
+    role, uid = (user.get("role") or "").lower(), user.get("user_id")
+    can_manage = role in ("admin", "manager")
+
+    rows = []
+    for week in weeks:
+        row = []
+        for day in week:
+            day_str = day.isoformat()
+            time_off = tuple(
+                (off, bool(can_manage or (off.owner_id and off.owner_id == uid)))
+                for off in cells["time_off"].get(day_str, ())
+            )
+            key = (
+                day_str,
+                cells["digests"].get(day_str),
+                holidays.get(day_str),
+                day_str in locks,
+                (day > today) - (day < today),
+                tuple(flag for _, flag in time_off),
+            )
+            html = cell_cache.get(key)
+            if html is None:
+                html = template.render(
+                    day=day,
+                    day_str=day_str,
+                    is_past=day < today,
+                    is_today=day == today,
+                    holiday=key[2],
+                    is_locked=key[3],
+                    time_off=time_off,
+                    jobs=cells["jobs"].get(day_str, ()),
+                    csrf_placeholder=CSRF_PLACEHOLDER,
+                )
+                cell_cache.put(key, html)
+            row.append(Markup(html))
+        rows.append(row)
+    return rows
+
+
+def _load_month(conn, grid_start: date, grid_end: date) -> dict:
+    """Query locks, jobs and time off for a month grid (live database plus any overlapping archive).
+
+    Args:
+        conn (sqlite3.Connection): Request connection.
+        grid_start (date): First date shown.
+        grid_end (date): Last date shown.
+
+    Returns:
+        dict: ``locks`` (set of ISO dates), ``jobs_by_date`` and ``time_off_by_date`` (ISO date -> list of rows); shaped for the template by ``_month_cells`` and reused by the JSON API.
+    """
+    grid_start_s, grid_end_s = grid_start.isoformat(), grid_end.isoformat()
+    days = {"grid_start": grid_start.toordinal(), "grid_end": grid_end.toordinal()}
+    schemas = archive.attach_for_range(conn, days["grid_start"], days["grid_end"])
 
     # Locks spanning the visible grid
-    cur.execute(
-        "SELECT date FROM locks WHERE date BETWEEN ? AND ?",
+    rows = archive.select_across(
+        conn,
+        schemas,
+        "SELECT date FROM {db}.locks WHERE date BETWEEN ? AND ?",
         (grid_start_s, grid_end_s),
     )
-    locks = {row["date"] for row in cur.fetchall()}
+    locks = {row["date"] for row in rows}
 
-    # Jobs spanning the visible grid
-    cur.execute(
+    # Jobs per visible day: one range scan over job_days, already ordered by day
+    rows = archive.select_across(
+        conn,
+        schemas,
         """
         SELECT
+            date(jd.day + 1721424.5) AS day,
             j.id,
             j.title,
             j.job_type AS type,
@@ -91,82 +361,115 @@ def index():
                 WHEN t.name IS NOT NULL THEN t.name
                 ELSE ''
             END AS technician_label
-        FROM jobs j
+        FROM {db}.job_days jd
+        JOIN {db}.jobs j ON j.id = jd.job_id
         LEFT JOIN technicians t ON t.id = j.technician_id
-        WHERE date(j.start_date) <= date(:grid_end)
-          AND date(COALESCE(j.end_date, j.start_date)) >= date(:grid_start)
+        WHERE jd.day BETWEEN :grid_start AND :grid_end
+        ORDER BY jd.day
         """,
-        {"grid_start": grid_start_s, "grid_end": grid_end_s},
+        days,
+        key=itemgetter("day", "id"),
     )
-
-    jobs_by_date: dict[str, list] = defaultdict(list)
-    for job in cur.fetchall():
-        sd = datetime.fromisoformat(job["start_date"]).date()
-        ed = datetime.fromisoformat(job["end_date"]).date() if job["end_date"] else sd
-        start = sd if sd >= grid_start else grid_start
-        end = ed if ed <= grid_end else grid_end
-        d = start
-        while d <= end:
-            jobs_by_date[d.isoformat()].append(job)
-            d += timedelta(days=1)
+    jobs_by_date = {
+        day: list(group) for day, group in groupby(rows, key=itemgetter("day"))
+    }
 
     # --- Time off for the grid (OBJECTS, not just names) ---
-    cur.execute(
+    rows = archive.select_across(
+        conn,
+        schemas,
         """
         SELECT
+          date(td.day + 1721424.5) AS day,
           toff.id,
           toff.technician_id AS owner_id,
-          toff.start_date,
-          COALESCE(toff.end_date, toff.start_date) AS end_date,
           tech.name AS name
-        FROM time_off AS toff
+        FROM {db}.time_off_days td
+        JOIN {db}.time_off AS toff ON toff.id = td.time_off_id
         JOIN technicians AS tech ON tech.id = toff.technician_id
-        WHERE date(toff.start_date) <= date(:grid_end)
-          AND date(COALESCE(toff.end_date, toff.start_date)) >= date(:grid_start)
+        WHERE td.day BETWEEN :grid_start AND :grid_end
+        ORDER BY td.day
         """,
-        {"grid_start": grid_start_s, "grid_end": grid_end_s},
+        days,
+        key=itemgetter("day", "id"),
     )
+    time_off_by_date = {
+        day: [
+            {"id": r["id"], "owner_id": r["owner_id"], "name": r["name"]} for r in group
+        ]
+        for day, group in groupby(rows, key=itemgetter("day"))
+    }
 
-    time_off_by_date: dict[str, list[dict]] = defaultdict(list)
-    for row in cur.fetchall():
-        sd = datetime.fromisoformat(row["start_date"]).date()
-        ed = datetime.fromisoformat(row["end_date"]).date()
-        start = sd if sd >= grid_start else grid_start
-        end = ed if ed <= grid_end else grid_end
-        d = start
-        while d <= end:
-            time_off_by_date[d.isoformat()].append(
-                {"id": row["id"], "owner_id": row["owner_id"], "name": row["name"]}
-            )
-            d += timedelta(days=1)
+    return {
+        "locks": locks,
+        "jobs_by_date": jobs_by_date,
+        "time_off_by_date": time_off_by_date,
+    }
 
-    conn.close()
 
-    STATE_CODE = "VA"
-    holidays_map = holidays_for_month(year, month, state=STATE_CODE)
+def _month_grid(
+    conn, year: int, month: int, grid_start: date, grid_end: date, months, gens
+) -> tuple[dict, dict]:
+    """Return a month grid's cached query results and cell view models.
+
+    Args:
+        conn (sqlite3.Connection): Request connection.
+        year (int): Year shown.
+        month (int): Month shown.
+        grid_start (date): First date of the grid.
+        grid_end (date): Last date of the grid.
+        months (range): ``month_generations`` keys the grid covers.
+        gens (dict): Their generations, as read by ``versions``.
+
+    Returns:
+        tuple[dict, dict]: ``_load_month`` data and ``_month_cells`` view models.
+    """
+    data = month_cache.get(
+        conn,
+        (year, month),
+        months,
+        lambda: _load_month(conn, grid_start, grid_end),
+        gens=gens,
+    )
+    # view models are cached separately so the API can keep sharing the raw rows
+    cells = month_cache.get(
+        conn, ("cells", year, month), months, lambda: _month_cells(data), gens=gens
+    )
+    return data, cells
 
-    TYPE_ABBR = {
-        "termite": "T",
-        "borate": "BOR",
-        "pretreat": "PT",
-        "retreat": "RT",
-        "bird work": "BRD",
-        "power spray": "PS",
-        "fumigation": "FUME",
-        "insulation": "INSU",
-        "exclusion": "EXC",
-        "rei": "REIs",
-        "reis": "REIs",
-        "pest control special service": "PCSS",
-        "vapor barrier": "VAPR",
-        "shop work": "SHOP",
-        "misc": "MISC",
-        "miscellaneous": "MISC",
-    }
 
-    return render_template(
+@calendar_bp.route("/", endpoint="index")
+def index():
+    """Render the month view.
+
+    The grid's query results come from ``month_cache`` and are rebuilt only when a write has bumped the generation of a month the grid shows (see migration 0008).  The same generations drive the ETag/Last-Modified validators, so a revalidation of an unchanged month is answered with 304 without querying or rendering.
+    """
+    today = date.today()
+    month = request.args.get("month", type=int, default=today.month)
+    year = request.args.get("year", type=int, default=today.year)
+
+    # build week grid
+    weeks = _month_weeks(year, month, firstweekday=6)
+    grid_start = weeks[0][0]
+    grid_end = weeks[-1][-1]
+
+    prev_month, prev_year = (12, year - 1) if month == 1 else (month - 1, year)
+    next_month, next_year = (1, year + 1) if month == 12 else (month + 1, year)
+
+    conn = get_database()
+    months = _grid_months(grid_start, grid_end)
+    gens, changed = versions(conn, months)
+    etag, last_modified = http_cache.validators(year, month, gens, changed=changed)
+    if http_cache.is_fresh(etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    data, cells = _month_grid(conn, year, month, grid_start, grid_end, months, gens)
+    holidays_map = holidays_for_month(year, month, state=STATE_CODE)
+    week_cells = _render_cells(weeks, today, cells, data["locks"], holidays_map)
+
+    page = render_template(
         "index.html",
-        weeks=weeks,
+        week_cells=week_cells,
         month=month,
         year=year,
         month_name=month_name[month],
@@ -174,49 +477,194 @@ def index():
         next_month=next_month,
         prev_year=prev_year,
         next_year=next_year,
-        locks=locks,
-        jobs_by_date=jobs_by_date,
-        time_off_by_date=time_off_by_date,
         today=today,
-        type_abbr=TYPE_ABBR,
-        holidays=holidays_map,
     )
+    page = page.replace(CSRF_PLACEHOLDER, generate_csrf())
+    return http_cache.add_validators(make_response(page), etag, last_modified)
 
 
-@calendar_bp.route("/day/<selected_date>", endpoint="day_view")
-def day_view(selected_date: str):
-    """Render the day view for a specific date."""
-    try:
-        dt = datetime.fromisoformat(selected_date).date()
-    except Exception:
-        return redirect(url_for("calendar.index"))
+@calendar_bp.route("/cells", endpoint="month_cells")
+def month_cells():
+    """Render only some day cells of a month grid, for the live month view to swap in.
+
+    Query params:
+        - ``year`` / ``month`` (int): Month shown (default: this month).
+        - ``date`` (repeatable, ``YYYY-MM-DD``): Days to render; days outside the grid are skipped.
+
+    Returns:
+        Response: A ``<table>`` with one row of the requested ``<td>`` cells, built from the same cached results and fragments as the month view.
+    """
+    today = date.today()
+    month = request.args.get("month", type=int, default=today.month)
+    year = request.args.get("year", type=int, default=today.year)
+    weeks = _month_weeks(year, month, firstweekday=6)
+    grid_start, grid_end = weeks[0][0], weeks[-1][-1]
+
+    wanted = set(request.args.getlist("date"))
+    days = [day for week in weeks for day in week if day.isoformat() in wanted]
 
     conn = get_database()
-    cur = conn.cursor()
+    months = _grid_months(grid_start, grid_end)
+    gens, _ = versions(conn, months)
+    data, cells = _month_grid(conn, year, month, grid_start, grid_end, months, gens)
+    holidays_map = holidays_for_month(year, month, state=STATE_CODE)
+    (row,) = _render_cells([days], today, cells, data["locks"], holidays_map)
+
+    # <td> only parses inside a table
+    fragment = Markup("<table><tr>{}</tr></table>").format(Markup("").join(row))
+    return fragment.replace(CSRF_PLACEHOLDER, generate_csrf())
+
+
+def _load_year(conn, first: date, last: date) -> dict:
+    """Aggregate per-day job counts, REI totals, time-off counts and locks over ``[first, last]`` in one query.
+
+    Reads the ``job_days`` / ``time_off_days`` fan-out tables (and any overlapping archive), so multi-day jobs count on every day they cover without expanding spans in Python.
+
+    Args:
+        conn (sqlite3.Connection): Request connection.
+        first (date): First date shown.
+        last (date): Last date shown.
 
-    cur.execute("SELECT 1 FROM locks WHERE date = ?", (selected_date,))
-    locked = cur.fetchone() is not None
+    Returns:
+        dict: ``days`` (ISO date -> ``{"jobs", "reis", "off", "locked", "level"}`` for days with anything on them) and ``peak`` (busiest day's job count); ``level`` is ``1..HEAT_LEVELS`` relative to ``peak``.
+    """
+    params = {
+        "lo": first.toordinal(),
+        "hi": last.toordinal(),
+        "lo_iso": first.isoformat(),
+        "hi_iso": last.isoformat(),
+    }
+    schemas = archive.attach_for_range(conn, params["lo"], params["hi"])
+    rows = archive.select_across(
+        conn,
+        schemas,
+        """
+        SELECT day, SUM(jobs) AS jobs, SUM(reis) AS reis, SUM(off) AS off, MAX(locked) AS locked
+        FROM (
+            SELECT
+                jd.day,
+                1 AS jobs,
+                CASE
+                    WHEN LOWER(j.job_type) IN ('rei', 'reis') THEN COALESCE(j.rei_quantity, 0)
+                    ELSE 0
+                END AS reis,
+                0 AS off,
+                0 AS locked
+            FROM {db}.job_days jd
+            JOIN {db}.jobs j ON j.id = jd.job_id
+            WHERE jd.day BETWEEN :lo AND :hi
+            UNION ALL
+            SELECT td.day, 0, 0, 1, 0
+            FROM {db}.time_off_days td
+            WHERE td.day BETWEEN :lo AND :hi
+            UNION ALL
+            SELECT CAST(julianday(l.date) - 1721424.5 AS INTEGER), 0, 0, 0, 1
+            FROM {db}.locks l
+            WHERE l.date BETWEEN :lo_iso AND :hi_iso
+        )
+        GROUP BY day
+        """,
+        params,
+    )
+
+    days: dict[str, dict] = {}
+    for row in rows:
+        counts = days.setdefault(
+            date.fromordinal(row["day"]).isoformat(),
+            {"jobs": 0, "reis": 0, "off": 0, "locked": False},
+        )
+        counts["jobs"] += row["jobs"]
+        counts["reis"] += row["reis"]
+        counts["off"] += row["off"]
+        counts["locked"] = counts["locked"] or bool(row["locked"])
+
+    peak = max((c["jobs"] for c in days.values()), default=0)
+    for counts in days.values():
+        counts["level"] = -(-counts["jobs"] * HEAT_LEVELS // peak) if peak else 0
+    return {"days": days, "peak": peak}
+
+
+@calendar_bp.route("/year", endpoint="year_view")
+def year_view():
+    """Render a year-at-a-glance heatmap of daily occupancy.
+
+    All twelve month grids come from ``_month_weeks``; their counts come from one aggregate query (``_load_year``), cached per year in ``month_cache`` and revalidated with the same ETag/Last-Modified scheme as the month view.
+    """
+    today = date.today()
+    year = request.args.get("year", type=int, default=today.year)
+    if not 1 < year < 9999:
+        return redirect(url_for("calendar.year_view"))
+
+    grids = [(m, _month_weeks(year, m, firstweekday=6)) for m in range(1, 13)]
+    first, last = grids[0][1][0][0], grids[-1][1][-1][-1]
+
+    conn = get_database()
+    months = _grid_months(first, last)
+    gens, changed = versions(conn, months)
+    etag, last_modified = http_cache.validators(year, gens, changed=changed)
+    if http_cache.is_fresh(etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    data = month_cache.get(
+        conn, ("year", year), months, lambda: _load_year(conn, first, last), gens=gens
+    )
+
+    page = render_template(
+        "year.html",
+        year=year,
+        months=[
+            {"month": m, "name": month_name[m], "weeks": weeks} for m, weeks in grids
+        ],
+        days=data["days"],
+        peak=data["peak"],
+        today=today,
+    )
+    return http_cache.add_validators(make_response(page), etag, last_modified)
+
+
+def _load_day(conn, dt: date) -> tuple[bool, list, list]:
+    """Query a day's lock, time off and jobs (live database plus any archive covering it).
+
+    Args:
+        conn (sqlite3.Connection): Request connection.
+        dt (date): Day shown.
+
+    Returns:
+        tuple[bool, list, list]: Whether the day is locked, its time-off rows and its job rows, as ``day.html`` shows them.
+    """
+    sel = {"sel": dt.toordinal()}
+    schemas = archive.attach_for_range(conn, sel["sel"], sel["sel"])
+
+    locked = bool(
+        archive.select_across(
+            conn, schemas, "SELECT 1 FROM {db}.locks WHERE date = ?", (dt.isoformat(),)
+        )
+    )
 
     # Day-specific time off (list of rows)
-    cur.execute(
+    time_off = archive.select_across(
+        conn,
+        schemas,
         """
         SELECT
           toff.id,
           toff.technician_id AS owner_id,
           tech.name AS tech_name,
           toff.reason
-        FROM time_off AS toff
+        FROM {db}.time_off_days td
+        JOIN {db}.time_off AS toff ON toff.id = td.time_off_id
         LEFT JOIN technicians AS tech ON tech.id = toff.technician_id
-        WHERE date(:sel) BETWEEN date(toff.start_date)
-                            AND date(COALESCE(toff.end_date, toff.start_date))
+        WHERE td.day = :sel
         ORDER BY tech.name
         """,
-        {"sel": selected_date},
+        sel,
+        key=lambda r: r["tech_name"] or "",
     )
-    time_off = cur.fetchall()
 
     # Jobs overlapping the day
-    cur.execute(
+    jobs = archive.select_across(
+        conn,
+        schemas,
         """
         SELECT
             j.*,
@@ -231,25 +679,69 @@ def day_view(selected_date: str):
                 WHEN LOWER(COALESCE(j.job_type, '')) = 'rei' THEN 'REIs'
                 ELSE COALESCE(NULLIF(j.title, ''), '(Untitled)')
             END AS display_title
-        FROM jobs j
+        FROM {db}.job_days jd
+        JOIN {db}.jobs j ON j.id = jd.job_id
         LEFT JOIN technicians t ON t.id = j.technician_id
         LEFT JOIN users cu ON cu.id = j.created_by
         LEFT JOIN users mu ON mu.id = j.last_modified_by
-        WHERE j.start_date <= ? AND (j.end_date IS NULL OR j.end_date >= ?)
+        WHERE jd.day = :sel
         ORDER BY j.start_date, j.id
         """,
-        (selected_date, selected_date),
+        sel,
+        key=itemgetter("start_date", "id"),
     )
-    jobs = cur.fetchall()
+    return locked, time_off, jobs
 
-    conn.close()
-    return render_template(
+
+@calendar_bp.route("/day/<selected_date>", endpoint="day_view")
+def day_view(selected_date: str):
+    """Render the day view for a specific date.
+
+    Conditional GETs are answered with 304 when the day's month generation (and the global one) is unchanged.
+    """
+    try:
+        dt = datetime.fromisoformat(selected_date).date()
+    except Exception:
+        return redirect(url_for("calendar.index"))
+
+    conn = get_database()
+    gens, changed = versions(conn, [month_index(dt.year, dt.month)])
+    etag, last_modified = http_cache.validators(dt, gens, changed=changed)
+    if http_cache.is_fresh(etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    locked, time_off, jobs = _load_day(conn, dt)
+    technicians = conn.execute(
+        "SELECT id, name FROM technicians ORDER BY name"
+    ).fetchall()
+
+    page = render_template(
         "day.html",
         default_date=request.args.get("date") or date.today().isoformat(),
         selected_date=dt,
         locked=locked,
         jobs=jobs,
         time_off=time_off,
+        technicians=technicians,
+    )
+    return http_cache.add_validators(make_response(page), etag, last_modified)
+
+
+@calendar_bp.route("/day/<selected_date>/jobs", endpoint="day_jobs")
+def day_jobs(selected_date: str):
+    """Render only the day view's job and time-off cards (``#day-jobs``), for ``job-batch.js`` to swap in after a batch.
+
+    Returns:
+        Response: The ``_day_jobs.html`` fragment, or 400 for a malformed date.
+    """
+    try:
+        dt = datetime.fromisoformat(selected_date).date()
+    except ValueError:
+        return "date must be YYYY-MM-DD", 400
+
+    locked, time_off, jobs = _load_day(get_database(), dt)
+    return render_template(
+        "_day_jobs.html", locked=locked, jobs=jobs, time_off=time_off
     )
 
 
@@ -291,6 +783,17 @@ def add_time_off():
             )
 
     conn.commit()
+    audit.record(
+        "time_off",
+        cur.lastrowid,
+        "create",
+        after={
+            "technician_id": tech_id or user["user_id"],
+            "start_date": start,
+            "end_date": end,
+            "reason": reason,
+        },
+    )
     flash("Time off added.", "success")
     return redirect(request.referrer or url_for("calendar.index"))
 
@@ -324,6 +827,7 @@ def delete_time_off(time_off_id: int):
 
     cur.execute("DELETE FROM time_off WHERE id = ?", (time_off_id,))
     conn.commit()
+    audit.record("time_off", time_off_id, "delete", before=row)
     flash("Time off removed.", "success")
     return redirect(request.referrer or url_for("calendar.index"))
 
@@ -349,6 +853,7 @@ def toggle_lock():
     if row:
         cur.execute("DELETE FROM locks WHERE date = ?", (selected_date,))
         conn.commit()
+        audit.record("lock", row["id"], "unlock", before={"date": selected_date})
         flash(f"Unlocked {selected_date}.", "success")
     else:
         cur.execute(
@@ -356,7 +861,7 @@ def toggle_lock():
             (selected_date, user_id),
         )
         conn.commit()
+        audit.record("lock", cur.lastrowid, "lock", after={"date": selected_date})
         flash(f"Locked {selected_date}.", "success")
 
-    conn.close()
     return redirect(url_for("calendar.day_view", selected_date=selected_date))
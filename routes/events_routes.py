@@ -0,0 +1,90 @@
+"""Live updates: a Server-Sent Events stream of calendar change notices.
+
+Exposes:
+- GET /events   -> ``text/event-stream`` of ``change`` events
+
+Notes:
+    - Each ``change`` event's data is ``{"changes": [{"entity", "id", "from", "to"}, ...]}`` (or ``{"reload": true}``) and its id is the newest ``change_feed`` id it covers; browsers send it back as ``Last-Event-ID`` when they reconnect, and missed changes are replayed.
+    - Notices come from ``utils.change_feed`` (one poller thread per process); a stream itself never touches the database after it starts, apart from the replay.
+    - A comment line is sent every ``HEARTBEAT`` seconds so proxies keep the connection open and closed clients are noticed.
+    - Each open stream occupies a worker thread; run with a threaded server (the default ``flask run`` / ``app.run``) or async workers.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+
+from flask import Blueprint, Response, request
+
+from db import _connect
+from utils.change_feed import change_feed, changes_since, latest_id, notice
+
+events_bp = Blueprint("events", __name__)
+
+HEARTBEAT = 15.0
+RETRY_MS = 5000
+
+
+def _message(event_id: int, payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":"))
+    return f"id: {event_id}\nevent: change\ndata: {data}\n\n"
+
+
+def _replay(last_event_id: int) -> tuple[int, dict | None]:
+    """Return ``(newest_id, payload)`` for changes after ``last_event_id`` (payload ``None`` if there are none)."""
+    conn = _connect(readonly=True)
+    try:
+        newest = latest_id(conn)
+        if newest <= last_event_id:
+            return last_event_id, None
+        rows = changes_since(conn, last_event_id, change_feed.batch)
+        # trimmed past the client's position, or too many to list
+        if rows[0]["id"] != last_event_id + 1 or len(rows) >= change_feed.batch:
+            return newest, notice([], reload=True)
+        return rows[-1]["id"], notice(rows)
+    finally:
+        conn.close()
+
+
+@events_bp.route("/events", methods=["GET"])
+def events():
+    """Stream calendar change notices as Server-Sent Events.
+
+    Like the month and day views, the stream does not require a login; notices carry only entity ids and date ranges.
+
+    Returns:
+        Response: A ``text/event-stream`` response, or 503 when the per-process stream limit is reached.
+    """
+    q = change_feed.subscribe()
+    if q is None:
+        return Response(
+            "Too many live streams", status=503, headers={"Retry-After": "30"}
+        )
+
+    last_event_id = request.headers.get("Last-Event-ID", type=int)
+
+    def stream():
+        seen = 0
+        yield f"retry: {RETRY_MS}\n\n"
+        if last_event_id is not None:
+            seen, payload = _replay(last_event_id)
+            if payload is not None:
+                yield _message(seen, payload)
+        while True:
+            try:
+                event_id, payload = q.get(timeout=HEARTBEAT)
+            except queue.Empty:
+                yield ": ping\n\n"
+                continue
+            if event_id <= seen:
+                continue  # already covered by the replay
+            seen = event_id
+            yield _message(event_id, payload)
+
+    resp = Response(stream(), mimetype="text/event-stream")
+    resp.cache_control.no_cache = True
+    resp.headers["X-Accel-Buffering"] = "no"
+    # runs when the server closes the response, even if the stream never started
+    resp.call_on_close(lambda: change_feed.unsubscribe(q))
+    return resp
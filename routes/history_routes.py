@@ -0,0 +1,110 @@
+"""Job change history: what changed on a range of days or to one job, and restoring deleted jobs.
+
+Exposes:
+- GET  /history                        -> revisions touching a day range (defaults to today, changes from the last week)
+- GET  /history/job/<job_id>           -> every revision of one job
+- POST /history/job/<job_id>/restore   -> put a deleted job back
+
+Notes:
+    Revisions are written by triggers on ``jobs`` (migration 0015) and read through ``utils/job_history.py``; both listings are index lookups.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from db import get_database
+from utils import audit, job_history
+from utils.decorators import login_required, role_required
+from utils.job_form import parse_date
+from utils.logger import setup_logger
+
+history_bp = Blueprint("history", __name__)
+logger = setup_logger()
+
+# "Changed within" choices in days; 0 = any time.
+WITHIN_DAYS = (1, 7, 30, 0)
+
+
+@history_bp.route("/history", methods=["GET"])
+@login_required
+def day_history():
+    """List changes to jobs on a range of days.
+
+    Query params:
+        - ``date_from`` / ``date_to`` (``YYYY-MM-DD``): Days the changed jobs covered, before or after the change. Default today; at most ``job_history.MAX_DAYS`` days.
+        - ``within`` (int): Only changes made in the last this-many days; ``0`` for any time. Default 7.
+
+    Returns:
+        Response: Rendered ``history.html``.
+    """
+    start = parse_date(request.args.get("date_from")) or date.today()
+    end = parse_date(request.args.get("date_to")) or start
+    within = request.args.get("within", default=7, type=int)
+    if within not in WITHIN_DAYS:
+        within = 7
+    if end < start:
+        start, end = end, start
+    if (end - start).days >= job_history.MAX_DAYS:
+        flash(f"Showing the first {job_history.MAX_DAYS} days of the range.", "error")
+        end = start + timedelta(days=job_history.MAX_DAYS - 1)
+    since = None
+    if within:
+        since = (datetime.now(timezone.utc) - timedelta(days=within)).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+    revisions = job_history.for_days(get_database(), start, end, since)
+    return render_template(
+        "history.html",
+        revisions=revisions,
+        start=start,
+        end=end,
+        within=within,
+        within_days=WITHIN_DAYS,
+        job_id=None,
+    )
+
+
+@history_bp.route("/history/job/<int:job_id>", methods=["GET"])
+@login_required
+def job_history_view(job_id: int):
+    """List every change to one job, newest first.
+
+    Returns:
+        Response: Rendered ``history.html``.
+    """
+    return render_template(
+        "history.html",
+        revisions=job_history.for_job(get_database(), job_id),
+        job_id=job_id,
+    )
+
+
+@history_bp.route("/history/job/<int:job_id>/restore", methods=["POST"])
+@login_required
+@role_required("admin", "manager", "sales")
+def restore_job(job_id: int):
+    """Restore a deleted job as it was when deleted, under its original id.
+
+    Refused when a day in its span is locked.  Other conflicts are reported in the flash but do not block, since the job was booked over them before it was deleted.
+
+    Returns:
+        Response: Redirect to the restored job's day, or back to the job's history when refused.
+    """
+    conn = get_database()
+    user_id = session.get("user", {}).get("user_id")
+    try:
+        values, found = job_history.restore(conn, job_id, user_id)
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("history.job_history_view", job_id=job_id))
+    conn.commit()
+    audit.record("job", job_id, "restore", after=values)
+    message = f"Restored {values.get('title') or 'job'}."
+    if found:
+        message += "  " + " ".join(c.message for c in found)
+    flash(message, "success")
+    logger.info(f"Job ID {job_id} restored by user ID {user_id}")
+    return redirect(url_for("calendar.day_view", selected_date=values["start_date"]))
@@ -1,7 +1,6 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from functools import wraps
 
-import zipcodes
 from flask import (
     Blueprint,
     Response,
@@ -14,6 +13,15 @@ from flask import (
 )
 
 from db import get_database
+from routes.calendar_routes import STATE_CODE
+from utils import audit, conflicts, job_series
+from utils.job_form import (
+    compose_job_payload,
+    derive_time_range,
+    normalize_hhmm,
+    parse_date,
+    parse_technician,
+)
 from utils.decorators import login_required, role_required
 from utils.holidays_util import is_holiday
 from utils.logger import setup_logger
@@ -22,207 +30,154 @@ job_bp = Blueprint("job", __name__)
 logger = setup_logger()
 
 
-def _parse_date(s: str | None) -> date | None:
-    """Parse a user-supplied date string into a `date`.
+def _blocked_by_conflicts(
+    conn,
+    start: date,
+    end: date | None,
+    technician_id: int | None,
+    two_man: int,
+    start_time: str | None,
+    end_time: str | None,
+    exclude_job_id: int | None = None,
+) -> bool:
+    """Check a job about to be saved for conflicts and flash the ones that stop it.
 
-    Accepts ISO ``YYYY-MM-DD`` or US ``MM/DD/YYYY``.  Returns ``None`` for blank or unparsable values.  Does not raise.
+    Locked days always stop the save.  Technician conflicts (time off, double booking, two-man crew shortage) stop it unless the form ticked ``allow_conflicts`` ("Book anyway"); overridden conflicts are logged.
 
     Args:
-        s (str | None): Raw date value from a form.
+        conn (sqlite3.Connection): Request connection.
+        start (date): First day of the job.
+        end (date | None): Last day of the job.
+        technician_id (int | None): Assigned technician.
+        two_man (int): ``1`` for a two-man job.
+        start_time (str | None): Normalized ``HH:MM`` start.
+        end_time (str | None): Normalized ``HH:MM`` end.
+        exclude_job_id (int | None, optional): Job being edited or moved. Defaults to None.
 
     Returns:
-        date | None: Parsed date, or ``None`` if parsing fails.
+        bool: ``True`` if the save must not go ahead (errors have been flashed).
     """
-    s = (s or "").strip()
-    if not s:
-        return None
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
-        try:
-            return datetime.strptime(s, fmt).date()
-        except ValueError:
-            continue
-    return None
+    found = conflicts.check(
+        conn, start, end, technician_id, two_man, start_time, end_time, exclude_job_id
+    )
+    return _refused(found)
 
 
-def _parse_technician(value: str | None, cur=None) -> tuple[int | None, int]:
-    """Interpret the technician selector from the job form.
+def _series_blocked_by_conflicts(
+    conn, series_id: int, from_day: int, start_shift: int, end_shift: int, changes=None
+) -> bool:
+    """Check every visit a "this and following" series change would move or reassign.
 
-    The form value may be an integer ID (as a string), the sentinel ``"__BOTH__"`` to indicate a Two-Man Job, or blank.  If a DB cursor is provided, the ID is validated against the ``technicians`` table.
+    Each visit's new span is checked as ``_blocked_by_conflicts`` checks a single job, against everything except the visits being changed (they move together).  Any locked day stops the whole change; technician conflicts stop it unless ``allow_conflicts`` is ticked.
 
     Args:
-        value (str | None): Form value (``"__BOTH__"``, ``""``, or int-like string).
-        cur (optional): Optional SQLite cursor for existence check.
+        conn (sqlite3.Connection): Request connection.
+        series_id (int): Series being changed.
+        from_day (int): ``start_day`` of the first visit changed.
+        start_shift (int): Days each visit's start moves.
+        end_shift (int): Days each visit's end moves.
+        changes (Mapping | None, optional): New ``technician_id``, ``two_man``, ``start_time`` and ``end_time``, where the edit sets them. Defaults to None.
 
     Returns:
-        tuple[int | None, int]: ``(technician_id, two_man)``. For ``"__BOTH__"`` returns ``(None, 1)``; for a valid technician ID returns ``(id, 0)``; otherwise ``(None, 0)``.
+        bool: ``True`` if the change must not go ahead (errors have been flashed).
     """
-    if value == "__BOTH__":
-        return None, 1
-    if value is None or str(value).strip() == "":
-        return None, 0
-    try:
-        tid = int(value)
-    except (TypeError, ValueError):
-        return None, 0
-
-    if cur is not None:
-        ok = cur.execute("SELECT 1 FROM technicians WHERE id=?", (tid,)).fetchone()
-        if not ok:
-            return None, 0
-    return tid, 0
-
+    visits = job_series.following(conn, series_id, from_day)
+    ids = [v["id"] for v in visits]
+    found = []
+    for visit in visits:
+        values = {**dict(visit), **(changes or {})}
+        start = date.fromisoformat(visit["start_date"])
+        end = date.fromisoformat(visit["end_date"] or visit["start_date"])
+        found += conflicts.check(
+            conn,
+            start + timedelta(days=start_shift),
+            end + timedelta(days=end_shift),
+            values["technician_id"],
+            values["two_man"],
+            values["start_time"],
+            values["end_time"],
+            exclude_job_id=ids,
+        )
+    return _refused(found)
 
-def lookup_zipcode(zip_code: str) -> str | None:
-    """Resolve a 5-digit ZIP code to a city name using ``zipcodes``.
 
-    Args:
-        zip_code (str): ZIP code as entered (whitespace allowed).
+def _refused(found: list) -> bool:
+    """Flash the conflicts in ``found`` that stop a save and log the overridden ones.
 
     Returns:
-        str | None: City name if found; otherwise ``None``.
+        bool: ``True`` if any conflict stops the save.
     """
-    try:
-        results = zipcodes.matching(str(zip_code).strip())
-        if not results:
-            return None
-        city = results[0].get("city")
-        return city.title() if city else None
-    except Exception:
-        return None
+    override = bool(request.form.get("allow_conflicts"))
+    blocking = [c for c in found if c.kind in conflicts.BLOCKING or not override]
+    if blocking:
+        message = "  ".join(c.message for c in blocking)
+        if any(c.kind not in conflicts.BLOCKING for c in blocking):
+            message += '  Tick "Book anyway" to save despite technician conflicts.'
+        flash(message, "error")
+    if found and not blocking:
+        logger.warning(
+            f"Conflicts overridden by user ID {session.get('user', {}).get('user_id')}: {'; '.join(c.message for c in found)}"
+        )
+    return bool(blocking)
 
 
-def normalize_hhmm(s: str | None) -> str | None:
-    """Normalize a loose time input to ``HH:MM``.
+def _add_series(conn, payload: dict, rule, uid: int | None) -> bool:
+    """Create a recurring series from a validated add-job payload and flash the outcome.
 
-    Accepts inputs like ``"9"``, ``"09"``, ``"9:30"``, ``"09:30"`` and returns canonical ``"09:00"`` or ``"09:30"``.  Returns ``None`` for blank/invalid.
+    Locked days are skipped while planning.  Every planned visit is then checked like a single job (``conflicts.check``); any conflict stops the whole series unless ``allow_conflicts`` is ticked, and a locked day in a multi-day visit always does.
 
     Args:
-        s (str | None): Raw time string.
+        conn (sqlite3.Connection): Request connection.
+        payload (dict): First visit from ``_compose_job_payload``.
+        rule (job_series.SeriesRule): Parsed Repeat fields.
+        uid (int | None): Creating user.
 
     Returns:
-        str | None: Normalized time string, or ``None``.
+        bool: ``True`` if the series was created.
     """
-    if not s:
-        return None
-    s = s.strip()
-    if not s:
-        return None
-    if s.isdigit():
-        return f"{int(s):02d}:00"
-    if ":" in s:
-        h, m = s.split(":", 1)
-        return f"{int(h):02d}:{int(m):02d}"
-    return None
-
-
-def derive_time_range(start_hhmm: str | None, end_hhmm: str | None) -> str | None:
-    """Build a compact ``H-H`` label from start/end times.
-
-    Intended for teh calendar's small badges.  Minuts are intentionally dropped (e.g., ``"09:30"`` - ``"14:00"`` => ``"9-14"``).  Returns ``None`` if either time is missing.
-
-    Args:
-        start_hhmm (str | None): Start time like ``"HH:MM"``.
-        end_hhmm (str | None): End time like ``"HH:MM"``.
+    start = date.fromisoformat(payload["start_date"])
+    duration = date.fromisoformat(payload["end_date"] or payload["start_date"]) - start
+    visits, skipped = job_series.plan_series(conn, start, rule, STATE_CODE)
+    if not visits:
+        flash("Every visit falls on a locked day or holiday.  No jobs added.", "error")
+        return False
+    found = []
+    for day in visits:
+        found += conflicts.check(
+            conn,
+            day,
+            day + duration,
+            payload["technician_id"],
+            payload["two_man"],
+            payload["start_time"],
+            payload["end_time"],
+        )
+    if _refused(found):
+        return False
 
-    Returns:
-        str | None: A label like ``"9-14"`` or ``None``.
-    """
-    if not start_hhmm or not end_hhmm:
-        return None
-    sh, sm = map(int, start_hhmm.split(":"))
-    eh, em = map(int, end_hhmm.split(":"))
-    return f"{sh}-{eh}"
-
-
-def _compose_job_payload(form, cur, start_date: date, end_date: date | None):
-    # Times
-    start_time = normalize_hhmm(form.get("start_time"))
-    end_time = normalize_hhmm(form.get("end_time"))
-    if start_time and end_time and end_time <= start_time:
-        return None, "End time must be after start time."
-    time_range = derive_time_range(start_time, end_time) or (
-        form.get("time_range", "").strip() or "any"
+    series_id, visits, skipped = job_series.create_series(
+        conn, payload, rule, created_by=uid, planned=(visits, skipped)
     )
-
-    # Technicians
-    technician_raw = form.get("technician_id")
-    technician_id, two_man = _parse_technician(technician_raw, cur)
-
-    # REI Fields (ZIP or City or None; Quantity is required)
-    rei_quantity_raw = (form.get("rei_quantity") or "").strip()
-    rei_zip = (form.get("rei_quantity") or "").strip()
-    rei_city_free = (form.get("rei_city_name") or form.get("rei_city") or "").strip()
-    rei_city_name = None
-    if rei_city_free:
-        rei_city_name = rei_city_free
-    elif rei_zip and rei_zip.isdigit() and len(rei_zip) == 5:
-        rei_city_name = lookup_zipcode(rei_zip)
-
-    # REI Fields
-    rei_quantity = form.get("rei_quantity")
-    rei_zip = (form.get("rei_zip") or "").strip()
-    rei_city_name = None
-    if rei_zip and rei_zip.isdigit() and len(rei_zip) == 5:
-        rei_city_name = lookup_zipcode(rei_zip)
-
-    # Other Fields
-    exclusion_subtype = form.get("exclusion_subtype")
-    fumigation_type = form.get("fumigation_type")
-    target_pest = form.get("target_pest")
-    custom_pest = form.get("custom_pest")
-    if custom_pest:
-        target_pest = custom_pest.strip()
-
-    # Core
-    title = (form.get("title") or "").strip()
-    job_type = (form.get("job_type") or "").strip().lower()
-    if job_type == "custom":
-        job_type = (form.get("custom_type") or "").strip()
-    price = form.get("price")
-
-    # End date normalization for REIs
-    end_final = end_date
-
-    # REI authoritative rules
-    if job_type == "rei":
-        title = "REIs"
-        price = None
-        end_final = start_date
-        try:
-            rei_quantity = int(rei_quantity_raw)
-        except ValueError:
-            return None, "Quantity required for REIs."
-        if rei_quantity <= 0:
-            return None, "Quantity required for REIs."
-    else:
-        if not title:
-            return None, "Title is required."
-
-    payload = {
-        "title": title,
-        "job_type": job_type,
-        "price": price,
-        "start_date": start_date.isoformat(),
-        "end_date": end_final.isoformat() if end_final else None,
-        "start_time": start_time,
-        "end_time": end_time,
-        "time_range": time_range,
-        "notes": (form.get("notes", "") or ""),
-        "technician_id": technician_id,
-        "two_man": two_man,
-        "rei_quantity": (
-            int(rei_quantity_raw)
-            if (job_type == "rei" and rei_quantity_raw.isdigit())
-            else form.get("rei_quantity")
-        ),
-        "rei_zip": rei_zip,
-        "rei_city_name": rei_city_name,
-        "exclusion_subtype": exclusion_subtype,
-        "fumigation_type": fumigation_type,
-        "target_pest": target_pest,
-        "custom_pest": custom_pest,
-    }
-    return payload, None
+    audit.record(
+        "series",
+        series_id,
+        "create",
+        after={
+            **payload,
+            "freq": rule.freq,
+            "interval": rule.interval,
+            "visits": len(visits),
+            "skipped": [d.isoformat() for d in skipped],
+        },
+    )
+    message = f"Added {len(visits)} visits from {visits[0]} to {visits[-1]}."
+    if skipped:
+        message += f"  Skipped {', '.join(d.isoformat() for d in skipped)}."
+    flash(message, "success")
+    logger.info(
+        f"Series {series_id} added by user ID {uid}: {len(visits)} {payload['job_type']} visits ({rule.freq}, every {rule.interval}) from {visits[0]}"
+    )
+    return True
 
 
 @job_bp.route("/add_job", methods=["GET", "POST"])
@@ -231,7 +186,7 @@ def _compose_job_payload(form, cur, start_date: date, end_date: date | None):
 def add_job():
     """Create a new job (GET shows form, POST submits).
 
-    Handles GET (render form) and POST (submit). Validates dates/times, supports REIs (ZIP -> city; ``end_date = start_date``), parses a single technician or ``"__BOTH__"`` for Two-Man, rejects locked days, inserts the job, and logs.
+    Handles GET (render form) and POST (submit). Validates dates/times, supports REIs (ZIP -> city; ``end_date = start_date``), parses a single technician or ``"__BOTH__"`` for Two-Man, rejects locked days and technician conflicts across the span (``_blocked_by_conflicts``), inserts the job, and logs.
 
     Returns:
         Response: On success, redirect to ``calendar.index``.  On validation errors, redirect back to the form.  On GET, render the form.
@@ -250,25 +205,33 @@ def add_job():
             return redirect(request.url)
         end_date_raw = request.form.get("end_date") or start_date_raw
 
-        start_date = _parse_date(start_date_raw)
-        end_date = _parse_date(end_date_raw) if end_date_raw else None
+        start_date = parse_date(start_date_raw)
+        end_date = parse_date(end_date_raw) if end_date_raw else None
         if not start_date:
             flash("Start date is required.", "error")
             return redirect(request.url)
 
         # Validate/normalize
 
-        payload, err = _compose_job_payload(request.form, cur, start_date, end_date)
+        payload, err = compose_job_payload(request.form, cur, start_date, end_date)
+        if not err:
+            rule, err = job_series.rule_from_form(request.form, start_date)
         if err:
             flash(err, "error")
             return redirect(
                 url_for("calendar.day_view", selected_date=start_date.isoformat())
             )
 
-        # Locks/auth
-        cur.execute("SELECT 1 FROM locks WHERE date = ?", (payload["start_date"],))
-        if cur.fetchone():
-            flash("Date is locked.  Cannot add job.", "error")
+        # Locks/conflicts (a series skips locked days instead)
+        if rule is None and _blocked_by_conflicts(
+            conn,
+            start_date,
+            date.fromisoformat(payload["end_date"] or payload["start_date"]),
+            payload["technician_id"],
+            payload["two_man"],
+            payload["start_time"],
+            payload["end_time"],
+        ):
             return redirect(
                 url_for("calendar.day_view", selected_date=payload["start_date"])
             )
@@ -279,6 +242,13 @@ def add_job():
             flash("Your session has expired.  Please log in again.", "error")
             return redirect(url_for("auth.login"))
 
+        if rule is not None:
+            if not _add_series(conn, payload, rule, uid):
+                return redirect(
+                    url_for("calendar.day_view", selected_date=payload["start_date"])
+                )
+            return redirect(url_for("calendar.index"))
+
         # Insert
 
         cur.execute(
@@ -315,6 +285,7 @@ def add_job():
             ),
         )
         conn.commit()
+        audit.record("job", cur.lastrowid, "create", after=payload)
         logger.info(
             f"Job added by user ID {uid}: {payload['job_type']} from {payload['start_date']} to {payload['end_date']} @ {payload['time_range']}"
         )
@@ -348,8 +319,8 @@ def add_job():
     #     # Dates
 
     #     end_date_raw = request.form.get("end_date") or start_date_raw
-    #     sd = _parse_date(start_date_raw)
-    #     ed = _parse_date(end_date_raw) if end_date_raw else None
+    #     sd = parse_date(start_date_raw)
+    #     ed = parse_date(end_date_raw) if end_date_raw else None
     #     if not sd:
     #         flash("Start date is invalid.", "error")
     #         return redirect(request.url)
@@ -408,7 +379,7 @@ def add_job():
 
     #     exclusion_subtype = request.form.get("exclusion_subtype")
     #     technician_raw = request.form.get("technician_id")
-    #     technician_id, two_man = _parse_technician(technician_raw, cur)
+    #     technician_id, two_man = parse_technician(technician_raw, cur)
 
     #     fumigation_type = request.form.get("fumigation_type")
     #     target_pest = request.form.get("target_pest")
@@ -472,7 +443,7 @@ def add_job():
 def add_job_for_date(date):
     """Create a job for a specific day.
 
-    Uses the URL date (``YYYY-MM-DD``) as both ``start_date`` and ``end_date``.  Applies the same validation rules as ``add_job`` and rejects locked days.
+    Uses the URL date (``YYYY-MM-DD``) as both ``start_date`` and ``end_date``.  Applies the same validation rules as ``add_job`` and rejects locked days and technician conflicts.
 
     Args:
         date (str): ISO date from the route segment (``YYYY-MM-DD``).
@@ -491,18 +462,29 @@ def add_job_for_date(date):
             return redirect(url_for("calendar.index"))
         ed = sd
 
-        payload, err = _compose_job_payload(request.form, cur, sd, ed)
+        payload, err = compose_job_payload(request.form, cur, sd, ed)
+        if not err:
+            rule, err = job_series.rule_from_form(request.form, sd)
         if err:
             flash(err, "error")
             return redirect(url_for("calendar.day_view", selected_date=date))
 
-        # Locks
-        cur.execute("SELECT 1 FROM locks WHERE date = ?", (payload["start_date"],))
-        if cur.fetchone():
-            flash("Date is locked. Cannot add job.", "error")
+        uid = session.get("user", {}).get("user_id")
+        if rule is not None:
+            _add_series(conn, payload, rule, uid)
             return redirect(url_for("calendar.day_view", selected_date=date))
 
-        uid = session.get("user", {}).get("user_id")
+        # Locks/conflicts
+        if _blocked_by_conflicts(
+            conn,
+            sd,
+            sd,
+            payload["technician_id"],
+            payload["two_man"],
+            payload["start_time"],
+            payload["end_time"],
+        ):
+            return redirect(url_for("calendar.day_view", selected_date=date))
 
         cur.execute(
             """
@@ -532,6 +514,7 @@ def add_job_for_date(date):
             ),
         )
         conn.commit()
+        audit.record("job", cur.lastrowid, "create", after=payload)
         logger.info(
             f"Job added by user ID {uid}: {payload['job_type']} on {date} @ {payload['time_range']}"
         )
@@ -606,7 +589,7 @@ def add_job_for_date(date):
     #             rei_city_name = None
     #     exclusion_subtype = request.form.get("exclusion_subtype")
     #     technician_raw = request.form.get("technician_id")
-    #     technician_id, two_man = _parse_technician(technician_raw, cursor)
+    #     technician_id, two_man = parse_technician(technician_raw, cursor)
     #     fumigation_type = request.form.get("fumigation_type")
     #     target_pest = request.form.get("target_pest")
     #     custom_pest = request.form.get("custom_pest")
@@ -670,7 +653,7 @@ def add_job_for_date(date):
 def move_job(job_id: int):
     """Move a job to a new start date, preserving its duration.
 
-    Reads the new start from the form field ``new_date``, computes the original span (``end_date - start_date``), applies the same duration from the new start, updates audit fields, and logs.
+    Reads the new start from the form field ``new_date``, computes the original span (``end_date - start_date``), applies the same duration from the new start, rejects locked days and technician conflicts in the new span, updates audit fields, and logs.  With ``scope=following`` on a series visit, this and every later visit of the series move by the same number of days in one ``UPDATE``, once every visit's new span passes the same checks.
 
     Args:
         job_id (int): Identifier of the job to move.
@@ -697,6 +680,43 @@ def move_job(job_id: int):
     new_start_dt = datetime.strptime(new_start, "%Y-%m-%d").date()
     new_end_dt = new_start_dt + duration
 
+    if request.form.get("scope") == "following" and job["series_id"]:
+        shift = (new_start_dt - old_start).days
+        if _series_blocked_by_conflicts(
+            conn, job["series_id"], job["start_day"], shift, shift
+        ):
+            return redirect(request.referrer or url_for("calendar.index"))
+        moved = job_series.update_following(
+            conn,
+            job["series_id"],
+            job["start_day"],
+            start_shift=shift,
+            end_shift=shift,
+            user_id=session["user"]["user_id"],
+        )
+        audit.record(
+            "series",
+            job["series_id"],
+            "move",
+            after={"from": job["start_date"], "days": shift, "jobs": moved},
+        )
+        logger.info(
+            f"Series {job['series_id']} moved {shift:+d} days from {job['start_date']} ({moved} jobs) by user ID {session['user']['user_id']}"
+        )
+        return redirect(request.referrer or url_for("calendar.index"))
+
+    if _blocked_by_conflicts(
+        conn,
+        new_start_dt,
+        new_end_dt,
+        job["technician_id"],
+        job["two_man"],
+        job["start_time"],
+        job["end_time"],
+        exclude_job_id=job_id,
+    ):
+        return redirect(request.referrer or url_for("calendar.index"))
+
     cur.execute(
         """
                 UPDATE jobs
@@ -714,6 +734,16 @@ def move_job(job_id: int):
     )
 
     conn.commit()
+    audit.record(
+        "job",
+        job_id,
+        "move",
+        before={"start_date": job["start_date"], "end_date": job["end_date"]},
+        after={
+            "start_date": new_start_dt.isoformat(),
+            "end_date": new_end_dt.isoformat(),
+        },
+    )
     logger.info(
         f"Job ID {job_id} moved by user ID {session['user']['user_id']} to {new_start_dt}"
     )
@@ -726,7 +756,7 @@ def move_job(job_id: int):
 def delete_job(job_id):
     """Delete a job permanently.
 
-    Removes the job from the ``jobs`` table and logs the action.
+    Removes the job from the ``jobs`` table and logs the action.  With ``scope=following`` on a series visit, this and every later visit of the series are deleted in one statement, except visits on locked days, which are kept.
 
     Args:
         job_id (int): Identifier of the job to delete.
@@ -738,19 +768,49 @@ def delete_job(job_id):
     if "user" not in session:
         return redirect(url_for("auth.login"))
     conn = get_database()
+    before = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if request.form.get("scope") == "following" and before and before["series_id"]:
+        deleted, kept = job_series.delete_following(
+            conn, before["series_id"], before["start_day"]
+        )
+        if kept:
+            flash(
+                f"Kept {kept} visit{'s' if kept != 1 else ''} on locked days.", "error"
+            )
+        audit.record(
+            "series",
+            before["series_id"],
+            "delete",
+            before={"from": before["start_date"], "jobs": deleted},
+        )
+        logger.info(
+            f"Series {before['series_id']} deleted from {before['start_date']} ({deleted} jobs) by user ID {session['user']['user_id']}"
+        )
+        return redirect(request.referrer or url_for("calendar.index"))
     conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
     conn.commit()
+    if before:
+        audit.record("job", job_id, "delete", before=before)
     logger.info(f"Job ID {job_id} deleted by user ID {session['user']['user_id']}")
     return redirect(request.referrer or url_for("calendar.index"))
 
 
+def _edit_form(cur, job_id: int):
+    """Render ``edit_job.html`` for ``job_id`` with the technician list."""
+    return render_template(
+        "edit_job.html",
+        job=cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone(),
+        technicians=cur.execute("SELECT * FROM technicians ORDER BY name").fetchall(),
+    )
+
+
 @job_bp.route("/edit_job/<int:job_id>", methods=["GET", "POST"])
 @login_required
 @role_required("manager", "sales")
 def edit_job(job_id):
     """Edit an existing job.
 
-    On POST, validates and normalizes dates/times (end must be >= start), enforces title for non-REI jobs.parses technician or Two-Man selection via ``_parse_technicians``, updates price/notes/fumigation/target pest, and audit columns.
+    On POST, validates and normalizes dates/times (end must be >= start), enforces title for non-REI jobs.parses technician or Two-Man selection via ``_parse_technicians``, rejects locked days and technician conflicts (``_blocked_by_conflicts``), updates price/notes/fumigation/target pest, and audit columns.  With ``scope=following`` on a series visit, the same fields are written to this and every later visit in one ``UPDATE``, and date changes move each visit by the same number of days; every visit's new span is checked first.
 
     Args:
         job_id (int): Identifier of the job to edit.
@@ -775,10 +835,7 @@ def edit_job(job_id):
 
         if start_time and end_time and end_time <= start_time:
             flash("End time must be after start time.", "error")
-            return render_template(
-                "edit_job.html",
-                job=cur.execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone(),
-            )
+            return _edit_form(cur, job_id)
 
         time_range = derive_time_range(start_time, end_time) or (
             request.form.get("time_range", "").strip() or "any"
@@ -790,24 +847,14 @@ def edit_job(job_id):
         # BUG-1018: validate and normalize dates on edit
         start_date_raw = request.form.get("start_date")
         end_date_raw = request.form.get("end_date") or start_date_raw
-        sd = _parse_date(start_date_raw)
-        ed = _parse_date(end_date_raw) if end_date_raw else None
+        sd = parse_date(start_date_raw)
+        ed = parse_date(end_date_raw) if end_date_raw else None
         if not sd:
             flash("Start date is invalid.", "error")
-            return render_template(
-                "edit_job.html",
-                job=cur.execute(
-                    "SELECT * FROM jobs WHERE id = ?", (job_id,)
-                ).fetchone(),
-            )
+            return _edit_form(cur, job_id)
         if ed and ed < sd:
             flash("End date cannot be before start date.", "error")
-            return render_template(
-                "edit_job.html",
-                job=cur.execute(
-                    "SELECT * FROM jobs WHERE id = ?", (job_id,)
-                ).fetchone(),
-            )
+            return _edit_form(cur, job_id)
 
         title = (request.form.get("title") or "").strip()
         job_type = (
@@ -824,17 +871,75 @@ def edit_job(job_id):
         else:
             if not title:
                 flash("Title is required.", "error")
-                return render_template(
-                    "edit_job.html",
-                    job=cur.execute(
-                        "SELECT * FROM jobs WHERE id = ?", (job_id,)
-                    ).fetchone(),
-                )
+                return _edit_form(cur, job_id)
             request_price = request.form.get("price")
 
         technician_raw = request.form.get("technician_id")
-        technician_id, two_man = _parse_technician(technician_raw, cur)
+        technician_id, two_man = parse_technician(technician_raw, cur)
 
+        before = cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        series = (
+            request.form.get("scope") == "following" and before and before["series_id"]
+        )
+        if not series and _blocked_by_conflicts(
+            conn,
+            sd,
+            ed,
+            technician_id,
+            two_man,
+            start_time,
+            end_time,
+            exclude_job_id=job_id,
+        ):
+            return _edit_form(cur, job_id)
+
+        if series:
+            old_start = date.fromisoformat(before["start_date"])
+            old_end = date.fromisoformat(before["end_date"] or before["start_date"])
+            changes = {
+                "title": title,
+                "job_type": job_type,
+                "price": request_price,
+                "start_time": start_time,
+                "end_time": end_time,
+                "time_range": time_range,
+                "notes": request.form.get("notes", ""),
+                "fumigation_type": fumigation_type,
+                "target_pest": target_pest,
+            }
+            if "technician_id" in request.form:
+                changes.update(technician_id=technician_id, two_man=two_man)
+            start_shift = (sd - old_start).days
+            end_shift = ((ed or sd) - old_end).days
+            if _series_blocked_by_conflicts(
+                conn,
+                before["series_id"],
+                before["start_day"],
+                start_shift,
+                end_shift,
+                changes,
+            ):
+                return _edit_form(cur, job_id)
+            updated = job_series.update_following(
+                conn,
+                before["series_id"],
+                before["start_day"],
+                changes,
+                start_shift=start_shift,
+                end_shift=end_shift,
+                user_id=session["user"]["user_id"],
+            )
+            audit.record(
+                "series",
+                before["series_id"],
+                "update",
+                before={"from": before["start_date"]},
+                after={**changes, "jobs": updated},
+            )
+            logger.info(
+                f"Series {before['series_id']} edited from {before['start_date']} ({updated} jobs) by user ID {session['user']['user_id']}"
+            )
+            return redirect(url_for("calendar.index"))
         cur.execute(
             """
             UPDATE jobs
@@ -875,11 +980,13 @@ def edit_job(job_id):
         )
 
         conn.commit()
+        if before:
+            after = cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            audit.record("job", job_id, "update", before=before, after=after)
         logger.info(f"Job ID {job_id} edited by user ID {session['user']['user_id']}")
         return redirect(url_for("calendar.index"))
 
-    job = cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
-    return render_template("edit_job.html", job=job)
+    return _edit_form(cur, job_id)
 
 
 @job_bp.post("/timeoff/add")
@@ -907,10 +1014,21 @@ def timeoff_add():
         return redirect(request.referrer or url_for("calendar.index"))
 
     cur.execute(
-        "INSERT INTO time_off (technician_id, date, reason, created_at, created_by) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)",
-        (tech_id, d, d, reason),
+        "INSERT INTO time_off (technician_id, start_date, end_date, reason, created_at, created_by) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, ?)",
+        (tech_id, d, d, reason, uid),
     )
     conn.commit()
+    audit.record(
+        "time_off",
+        cur.lastrowid,
+        "create",
+        after={
+            "technician_id": tech_id,
+            "start_date": d,
+            "end_date": d,
+            "reason": reason,
+        },
+    )
     logger.info(f"time_off added for tech {tech_id} by user {uid} on {d}")
     return redirect(request.referrer or url_for("calendar.index"))
 
@@ -975,6 +1093,7 @@ def timeoff_delete(timeoff_id: int):
 
     cur.execute("DELETE FROM time_off WHERE id = ?", (timeoff_id,))
     conn.commit()
+    audit.record("time_off", timeoff_id, "delete", before=toff)
     flash("Time off is removed.", "success")
     target_day = toff["start_date"]
     return redirect(url_for("calendar.day_view", selected_date=target_day))
@@ -0,0 +1,81 @@
+"""Job search: full-text lookup across titles, notes, pests, REI cities and technicians.
+
+Exposes:
+- GET /search   -> search form and results
+
+Notes:
+    Backed by the FTS5 index from migration 0011 (``utils/job_search.py``); no ``LIKE`` scans over ``jobs``.
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, render_template, request
+from markupsafe import Markup, escape
+
+from db import get_database
+from utils import job_search
+from utils.decorators import login_required
+from utils.job_form import parse_date
+
+search_bp = Blueprint("search", __name__)
+
+
+def _highlight(snippet: str | None) -> Markup:
+    """Escape a snippet and turn its match markers into ``<mark>`` tags."""
+    return (
+        escape(snippet or "")
+        .replace(job_search.SNIPPET_OPEN, Markup("<mark>"))
+        .replace(job_search.SNIPPET_CLOSE, Markup("</mark>"))
+    )
+
+
+@search_bp.route("/search", methods=["GET"])
+@login_required
+def search():
+    """Search jobs.
+
+    Query params:
+        - ``q`` (str): Words to find; ``word*`` matches a prefix.
+        - ``date_from`` / ``date_to`` (``YYYY-MM-DD``): Only jobs overlapping this range.
+        - ``sort`` (str): ``rank`` (default) or ``date`` (newest first).
+        - ``after`` (str): Page cursor from the previous page.
+
+    Returns:
+        Response: Rendered ``search.html``.
+    """
+    q = (request.args.get("q") or "").strip()
+    date_from = (request.args.get("date_from") or "").strip() or None
+    date_to = (request.args.get("date_to") or "").strip() or None
+    sort = request.args.get("sort") or "rank"
+    after = request.args.get("after") or None
+
+    conn = get_database()
+    available = job_search.available(conn)
+    results, next_after, truncated = [], None, False
+    if q and available:
+        rows, snippets, next_after, truncated = job_search.search(
+            conn,
+            q,
+            date_from=parse_date(date_from),
+            date_to=parse_date(date_to),
+            sort=sort,
+            after=after,
+        )
+        results = [
+            {**dict(row), "snippet": _highlight(snippets.get(row["id"]))}
+            for row in rows
+        ]
+
+    return render_template(
+        "search.html",
+        q=q,
+        date_from=date_from,
+        date_to=date_to,
+        sort=sort,
+        results=results,
+        next_after=next_after,
+        truncated=truncated,
+        rank_window=job_search.SEARCH_RANK_WINDOW,
+        paged=bool(after),
+        available=available,
+    )
@@ -0,0 +1,102 @@
+// Day view batch actions: tick several jobs, then move, reassign or delete
+// them with one POST to /api/jobs/batch.  The server applies all of them or
+// none; on success only the job list (#day-jobs) is re-fetched, from
+// /day/<date>/jobs, and swapped, and other open month views pick the change
+// up from /events.
+(function () {
+  const bar = document.getElementById('batch-bar');
+  if (!bar || !window.fetch) return;
+
+  const count = document.getElementById('batch-count');
+  const errors = document.getElementById('batch-errors');
+  const token = bar.querySelector('input[name="csrf_token"]').value;
+
+  const selected = () =>
+    Array.from(document.querySelectorAll('.batch-select:checked'), (el) => Number(el.value));
+
+  function label(jobId) {
+    const card = document.querySelector(`.batch-select[value="${jobId}"]`)?.closest('.card');
+    const heading = card?.querySelector('.job-heading');
+    return heading ? heading.textContent.trim() : `Job ${jobId}`;
+  }
+
+  function update() {
+    const n = selected().length;
+    count.textContent = n;
+    bar.hidden = n === 0;
+  }
+
+  function showErrors(messages) {
+    errors.replaceChildren(
+      ...messages.map((text) => {
+        const li = document.createElement('li');
+        li.textContent = text;
+        return li;
+      })
+    );
+  }
+
+  async function reloadJobs(days) {
+    // a batch started here always touches this day; skip the fetch otherwise
+    if (!days.includes(bar.dataset.date)) return;
+    const resp = await fetch(bar.dataset.jobsUrl, { credentials: 'same-origin', cache: 'no-cache' });
+    if (!resp.ok) {
+      window.location.reload();
+      return;
+    }
+    const doc = new DOMParser().parseFromString(await resp.text(), 'text/html');
+    const fresh = doc.getElementById('day-jobs');
+    if (fresh) document.getElementById('day-jobs').replaceWith(document.importNode(fresh, true));
+    update();
+  }
+
+  async function run(op) {
+    const ids = selected();
+    if (!ids.length) return;
+    let fields = {};
+    if (op === 'move') {
+      const newDate = document.getElementById('batch-date').value;
+      if (!newDate) {
+        showErrors(['Choose a date to move the jobs to.']);
+        return;
+      }
+      fields = { new_date: newDate };
+    } else if (op === 'reassign') {
+      const value = document.getElementById('batch-tech').value;
+      const technicianId = value === '__BOTH__' ? value : value ? Number(value) : null;
+      fields = { technician_id: technicianId };
+    } else if (!confirm(`Delete ${ids.length} jobs?`)) {
+      return;
+    }
+
+    const resp = await fetch(bar.dataset.batchUrl, {
+      method: 'POST',
+      credentials: 'same-origin',
+      headers: { 'Content-Type': 'application/json', 'X-CSRFToken': token },
+      body: JSON.stringify({
+        ops: ids.map((jobId) => ({ op, job_id: jobId, ...fields })),
+        allow_conflicts: document.getElementById('batch-allow').checked,
+      }),
+    });
+    let data = {};
+    try {
+      data = await resp.json();
+    } catch (e) {
+      // non-JSON error page (e.g. expired session)
+    }
+    if (resp.ok && data.ok) {
+      showErrors([]);
+      await reloadJobs(data.days || []);
+      return;
+    }
+    const failed = (data.results || []).filter((r) => !r.ok).map((r) => `${label(r.job_id)}: ${r.error}`);
+    showErrors(failed.length ? failed : [data.error || `Request failed (${resp.status}).`]);
+  }
+
+  document.addEventListener('change', (event) => {
+    if (event.target.classList.contains('batch-select')) update();
+  });
+  bar.querySelectorAll('[data-batch-op]').forEach((button) =>
+    button.addEventListener('click', () => run(button.dataset.batchOp))
+  );
+})();
@@ -0,0 +1,57 @@
+// Live conflict warnings for job forms.
+// A form with data-conflicts-url asks /api/conflicts whenever its dates,
+// times or technician change and lists what it finds in #conflict-warnings.
+// The server repeats the check on save; this only warns earlier.
+(function () {
+  const form = document.querySelector('form[data-conflicts-url]');
+  const box = document.getElementById('conflict-warnings');
+  if (!form || !box) return;
+
+  const list = box.querySelector('ul');
+  const override = box.querySelector('.conflict-override');
+  const FIELDS = ['start_date', 'end_date', 'start_time', 'end_time', 'technician_id'];
+  let timer = null;
+  let seq = 0;
+
+  async function refresh() {
+    const params = new URLSearchParams();
+    for (const name of FIELDS) {
+      const el = form.elements[name];
+      if (el && el.value) params.set(name, el.value);
+    }
+    if (form.dataset.jobId) params.set('job_id', form.dataset.jobId);
+    if (!params.get('start_date')) {
+      box.hidden = true;
+      return;
+    }
+
+    const mine = ++seq;
+    let data;
+    try {
+      const resp = await fetch(`${form.dataset.conflictsUrl}?${params}`, {
+        headers: { Accept: 'application/json' },
+        credentials: 'same-origin',
+      });
+      if (!resp.ok) return;
+      data = await resp.json();
+    } catch (e) {
+      return;
+    }
+    if (mine !== seq) return; // a newer check was started
+
+    list.replaceChildren(...data.conflicts.map((c) => {
+      const li = document.createElement('li');
+      li.textContent = c.message;
+      return li;
+    }));
+    box.hidden = data.conflicts.length === 0;
+    override.hidden = data.conflicts.every((c) => c.kind === 'locked');
+  }
+
+  form.addEventListener('change', (e) => {
+    if (!FIELDS.includes(e.target.name)) return;
+    clearTimeout(timer);
+    timer = setTimeout(refresh, 150);
+  });
+  refresh();
+})();
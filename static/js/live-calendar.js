@@ -0,0 +1,51 @@
+// Live month view: listen on /events and re-render only the day cells a change touches.
+document.addEventListener('DOMContentLoaded', () => {
+    const table = document.querySelector('.calendar-table[data-events]');
+    if (!table || !window.EventSource || !window.fetch) return;
+
+    const dirty = new Set();
+    let everything = false;
+    let timer = null;
+
+    const visibleDates = () =>
+        Array.from(table.querySelectorAll('.calendar-cell[data-date]'), (td) => td.dataset.date);
+
+    async function refresh() {
+        timer = null;
+        const dates = everything ? visibleDates() : Array.from(dirty);
+        dirty.clear();
+        everything = false;
+
+        // fetch just those cells; they come from the same per-month cache as the page
+        const url = new URL(table.dataset.cells, window.location.href);
+        dates.forEach((d) => url.searchParams.append('date', d));
+        const resp = await fetch(url, { credentials: 'same-origin', cache: 'no-cache' });
+        if (!resp.ok) return;
+        const doc = new DOMParser().parseFromString(await resp.text(), 'text/html');
+        doc.querySelectorAll('.calendar-cell[data-date]').forEach((fresh) => {
+            const current = table.querySelector(`.calendar-cell[data-date="${fresh.dataset.date}"]`);
+            if (current) current.replaceWith(document.importNode(fresh, true));
+        });
+    }
+
+    function schedule() {
+        // coalesce bursts (e.g. a job move touching two ranges) into one fetch
+        if (!timer && (everything || dirty.size)) timer = setTimeout(refresh, 300);
+    }
+
+    const source = new EventSource(table.dataset.events);
+    source.addEventListener('change', (event) => {
+        const notice = JSON.parse(event.data);
+        if (notice.reload) everything = true;
+        (notice.changes || []).forEach((change) => {
+            if (!change.from) {
+                everything = true;
+                return;
+            }
+            visibleDates().forEach((d) => {
+                if (d >= change.from && d <= change.to) dirty.add(d);
+            });
+        });
+        schedule();
+    });
+});
@@ -0,0 +1,322 @@
+"""Yearly archive databases for finished jobs, time off and locks.
+
+Provides:
+    - ``archive_before(conn, cutoff, dry_run=False)``: move rows that ended before ``cutoff`` into ``archive/<year>.sqlite3``; returns per-year counts.
+    - ``attach_for_range(conn, first_day, last_day)``: ``ATTACH`` (read-only) the archives overlapping a day range and return the schema names to query.
+    - ``select_across(conn, schemas, sql, params, key=None)``: run one ``{db}``-templated query against each schema and merge the rows.
+    - ``cutoff_for(months, today=None)``: first day of the month ``months`` months back.
+
+Notes:
+    - Archives live in ``DB_ARCHIVE_DIR`` (default ``archive/`` next to ``db.sqlite3``), one file per calendar year of the row's start date.  The ``archives`` table (migration 0007) records the day range each file covers, so views that stay within live dates never touch an archive.
+    - Each archive holds ``jobs``, ``time_off``, ``locks`` and the matching ``job_days`` / ``time_off_days`` fan-out rows, with the same columns as the live tables at archive time.  Archived rows are read-only history: they show up in the month and day views but edit/move/delete routes only see the live database.
+    - Job history (``job_revisions``, migration 0015) stays in the live database; the delete revisions the move would otherwise leave behind are dropped in the same transaction, so archived jobs are not offered for restore.
+    - Rows are copied into the archive and committed before they are deleted from the live database.  A run that dies in between leaves duplicates that the next run skips (``INSERT OR IGNORE`` on the archived ids) and then deletes, so re-running is always safe.
+    - Attached archives stay attached to pooled reader connections until ``MAX_ATTACHED`` is reached, so paging back and forth through old months does not re-open files.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+from db import BASE_DIR
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+ARCHIVE_DIR = Path(os.environ.get("DB_ARCHIVE_DIR", BASE_DIR / "archive"))
+# SQLite's default limit is 10 attached databases per connection.
+MAX_ATTACHED = 8
+SCHEMA_PREFIX = "archive_"
+
+# Archived tables: (table, fan-out table, fan-out id column).
+_SPAN_TABLES = (
+    ("jobs", "job_days", "job_id"),
+    ("time_off", "time_off_days", "time_off_id"),
+)
+# One archive year's rows: whole span before the cutoff, started in that year.
+_SPAN_WHERE = "{t}.end_day < :cut AND {t}.start_day BETWEEN :y_lo AND :y_hi"
+_LOCKS_WHERE = "date < :cut_iso AND substr(date, 1, 4) = :year"
+
+
+def cutoff_for(months: int, today: date | None = None) -> date:
+    """Return the first day of the month ``months`` months before ``today``'s month.
+
+    Args:
+        months (int): How many whole months to keep live.
+        today (date | None, optional): Reference date. Defaults to ``date.today()``.
+
+    Returns:
+        date: Rows ending before this date are eligible for archiving.
+    """
+    today = today or date.today()
+    index = today.year * 12 + (today.month - 1) - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _archive_path(year: int) -> Path:
+    return ARCHIVE_DIR / f"{year}.sqlite3"
+
+
+def _columns(
+    conn: sqlite3.Connection, schema: str, table: str
+) -> list[tuple[str, str]]:
+    """Return ``(name, declared_type)`` for each column of ``schema.table``."""
+    return [
+        (row[1], row[2])
+        for row in conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()
+    ]
+
+
+def _prepare_archive(conn: sqlite3.Connection) -> None:
+    """Create missing tables in the attached ``arc`` schema and add any columns the live tables gained since."""
+    for table in ("jobs", "time_off", "locks"):
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS arc.{table} AS SELECT * FROM main.{table} WHERE 0"
+        )
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS arc.{table}_id ON {table}(id)")
+        have = {name for name, _ in _columns(conn, "arc", table)}
+        for name, decl in _columns(conn, "main", table):
+            if name not in have:
+                conn.execute(f"ALTER TABLE arc.{table} ADD COLUMN {name} {decl}")
+    for _, fanout, id_col in _SPAN_TABLES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS arc.{fanout} (
+                day INTEGER NOT NULL,
+                {id_col} INTEGER NOT NULL,
+                PRIMARY KEY (day, {id_col})
+            ) WITHOUT ROWID
+            """)
+    conn.execute("CREATE INDEX IF NOT EXISTS arc.locks_date ON locks(date)")
+
+
+def _year_params(year: int, cutoff: date) -> dict:
+    """Return the parameters for ``_SPAN_WHERE`` / ``_LOCKS_WHERE`` for one archive year."""
+    return {
+        "cut": cutoff.toordinal(),
+        "cut_iso": cutoff.isoformat(),
+        "y_lo": date(year, 1, 1).toordinal(),
+        "y_hi": date(year, 12, 31).toordinal(),
+        "year": str(year),
+    }
+
+
+def _pending_years(conn: sqlite3.Connection, cutoff: date) -> list[int]:
+    """Return the start years that have rows ending before ``cutoff``."""
+    rows = conn.execute(
+        """
+        SELECT substr(start_date, 1, 4) FROM main.jobs WHERE end_day < :cut
+        UNION
+        SELECT substr(start_date, 1, 4) FROM main.time_off WHERE end_day < :cut
+        UNION
+        SELECT substr(date, 1, 4) FROM main.locks WHERE date < :cut_iso
+        """,
+        {"cut": cutoff.toordinal(), "cut_iso": cutoff.isoformat()},
+    ).fetchall()
+    return sorted(int(row[0]) for row in rows if row[0] and row[0].isdigit())
+
+
+def _count(conn: sqlite3.Connection, year: int, cutoff: date) -> dict[str, int]:
+    params = _year_params(year, cutoff)
+    counts = {}
+    for table, _, _ in _SPAN_TABLES:
+        where = _SPAN_WHERE.format(t=table)
+        counts[table] = conn.execute(
+            f"SELECT COUNT(*) FROM main.{table} WHERE {where}", params
+        ).fetchone()[0]
+    counts["locks"] = conn.execute(
+        f"SELECT COUNT(*) FROM main.locks WHERE {_LOCKS_WHERE}", params
+    ).fetchone()[0]
+    return counts
+
+
+def _archive_year(conn: sqlite3.Connection, year: int, cutoff: date) -> dict[str, int]:
+    """Copy one year's archivable rows into its archive file, then delete them from the live database."""
+    params = _year_params(year, cutoff)
+    path = _archive_path(year)
+    conn.execute("ATTACH DATABASE ? AS arc", (str(path),))
+    try:
+        _prepare_archive(conn)
+
+        # 1) copy + catalogue, committed before anything is deleted
+        for table, fanout, id_col in _SPAN_TABLES:
+            cols = ", ".join(name for name, _ in _columns(conn, "main", table))
+            where = _SPAN_WHERE.format(t=table)
+            conn.execute(
+                f"INSERT OR IGNORE INTO arc.{table} ({cols}) SELECT {cols} FROM main.{table} WHERE {where}",
+                params,
+            )
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO arc.{fanout} (day, {id_col})
+                SELECT fd.day, fd.{id_col}
+                FROM main.{fanout} fd
+                JOIN main.{table} t ON t.id = fd.{id_col}
+                WHERE {_SPAN_WHERE.format(t="t")}
+                """,
+                params,
+            )
+        cols = ", ".join(name for name, _ in _columns(conn, "main", "locks"))
+        conn.execute(
+            f"INSERT OR IGNORE INTO arc.locks ({cols}) SELECT {cols} FROM main.locks WHERE {_LOCKS_WHERE}",
+            params,
+        )
+        first, last = conn.execute("""
+            SELECT MIN(lo), MAX(hi) FROM (
+                SELECT MIN(start_day) AS lo, MAX(end_day) AS hi FROM arc.jobs
+                UNION ALL
+                SELECT MIN(start_day), MAX(end_day) FROM arc.time_off
+                UNION ALL
+                SELECT CAST(julianday(MIN(date)) - 1721424.5 AS INTEGER),
+                       CAST(julianday(MAX(date)) - 1721424.5 AS INTEGER)
+                FROM arc.locks
+            )
+            """).fetchone()
+        if first is not None:
+            conn.execute(
+                """
+                INSERT INTO main.archives (year, filename, first_day, last_day)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(year) DO UPDATE SET
+                    filename = excluded.filename,
+                    first_day = excluded.first_day,
+                    last_day = excluded.last_day,
+                    archived_at = CURRENT_TIMESTAMP
+                """,
+                (year, path.name, first, last),
+            )
+        conn.commit()
+
+        # 2) delete from the live database; triggers clear the fan-out and span rows
+        mark = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM main.job_revisions"
+        ).fetchone()[0]
+        counts = {}
+        for table, _, _ in _SPAN_TABLES:
+            counts[table] = conn.execute(
+                f"DELETE FROM main.{table} WHERE {_SPAN_WHERE.format(t=table)} AND id IN (SELECT id FROM arc.{table})",
+                params,
+            ).rowcount
+        counts["locks"] = conn.execute(
+            f"DELETE FROM main.locks WHERE {_LOCKS_WHERE} AND id IN (SELECT id FROM arc.locks)",
+            params,
+        ).rowcount
+        # archived jobs were moved, not deleted: drop the history rows that recorded them as deletes
+        conn.execute(
+            "DELETE FROM main.job_revisions WHERE id > ? AND action = 'delete'",
+            (mark,),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("DETACH DATABASE arc")
+    return counts
+
+
+def archive_before(
+    conn: sqlite3.Connection, cutoff: date, dry_run: bool = False
+) -> dict[int, dict[str, int]]:
+    """Move jobs, time off and locks that ended before ``cutoff`` into yearly archive files.
+
+    A job or time-off entry is archived only once its whole span is before ``cutoff``; it goes to the archive for the year of its start date.  Locks go by their own date.
+
+    Args:
+        conn (sqlite3.Connection): Read-write connection to the live database, with no open transaction.
+        cutoff (date): Keep everything that ends on or after this date.
+        dry_run (bool, optional): Only count what would move. Defaults to False.
+
+    Returns:
+        dict[int, dict[str, int]]: ``{year: {"jobs": n, "time_off": n, "locks": n}}``.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    results = {}
+    years = _pending_years(conn, cutoff)
+    if years and not dry_run:
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    for year in years:
+        if dry_run:
+            results[year] = _count(conn, year, cutoff)
+        else:
+            results[year] = _archive_year(conn, year, cutoff)
+            logger.info(f"Archived {year}: {results[year]}")
+    return results
+
+
+def _attached(conn: sqlite3.Connection) -> set[str]:
+    return {
+        row[1]
+        for row in conn.execute("PRAGMA database_list").fetchall()
+        if row[1].startswith(SCHEMA_PREFIX)
+    }
+
+
+def attach_for_range(
+    conn: sqlite3.Connection, first_day: int, last_day: int
+) -> list[str]:
+    """Attach the archives overlapping ``[first_day, last_day]`` and return the schemas to query.
+
+    Live-only ranges cost one lookup in the small ``archives`` table.  Archives are attached ``mode=ro`` as ``archive_<year>``; a missing file is logged and skipped rather than failing the page.
+
+    Args:
+        conn (sqlite3.Connection): Connection with no open transaction (``ATTACH`` is not allowed inside one).
+        first_day (int): First day ordinal of the range.
+        last_day (int): Last day ordinal of the range.
+
+    Returns:
+        list[str]: ``["main", "archive_<year>", ...]``.
+    """
+    rows = conn.execute(
+        "SELECT year, filename FROM main.archives WHERE first_day <= ? AND last_day >= ? ORDER BY year",
+        (last_day, first_day),
+    ).fetchall()
+    if not rows:
+        return ["main"]
+
+    attached = _attached(conn)
+    wanted = {f"{SCHEMA_PREFIX}{row[0]}": row[1] for row in rows}
+    missing = [name for name in wanted if name not in attached]
+    if len(attached) + len(missing) > MAX_ATTACHED:
+        for name in attached - wanted.keys():
+            conn.execute(f"DETACH DATABASE {name}")
+    schemas = ["main"]
+    for name, filename in wanted.items():
+        if name in missing:
+            path = ARCHIVE_DIR / filename
+            if not path.exists():
+                logger.warning(f"Archive {path} is catalogued but missing; skipping.")
+                continue
+            conn.execute(
+                "ATTACH DATABASE ? AS " + name, (path.resolve().as_uri() + "?mode=ro",)
+            )
+        schemas.append(name)
+    return schemas
+
+
+def select_across(
+    conn: sqlite3.Connection, schemas: list[str], sql: str, params=(), key=None
+) -> list[sqlite3.Row]:
+    """Run ``sql`` once per schema and return all rows.
+
+    ``sql`` names archived tables as ``{db}.jobs``, ``{db}.job_days`` and so on; shared tables such as ``technicians`` stay unqualified and resolve to the live database.  Each schema is queried separately (rather than as one ``UNION ALL``) so an archive written before a later migration added columns still works.
+
+    Args:
+        conn (sqlite3.Connection): Connection returned by ``attach_for_range``'s caller.
+        schemas (list[str]): Schema names from ``attach_for_range``.
+        sql (str): Query with a ``{db}`` placeholder.
+        params (optional): Query parameters, reused for every schema.
+        key (callable, optional): Sort key applied when more than one schema contributed rows.
+
+    Returns:
+        list[sqlite3.Row]: Rows from every schema.
+    """
+    rows = []
+    for schema in schemas:
+        rows.extend(conn.execute(sql.format(db=schema), params).fetchall())
+    if key is not None and len(schemas) > 1:
+        rows.sort(key=key)
+    return rows
@@ -0,0 +1,208 @@
+"""Write-behind audit log for ExTerminus.
+
+Provides:
+    - ``record(entity, entity_id, action, before=None, after=None)``: queue an audit event; returns immediately.
+    - ``flush(timeout=5.0)``: block until everything queued so far is written (CLI/shutdown).
+    - ``diff(before, after)``: ``{column: [old, new]}`` for columns that changed.
+
+Notes:
+    - Events are written to the ``audit_events`` table (migration 0006) by a single daemon thread that drains an in-process queue and commits in batches with ``executemany``, so request handlers never wait on the audit insert.
+    - The thread writes through the process's serialized writer (``db.writer()``), queueing behind requests rather than contending with them as a second writer.  A batch that cannot get the database (writer busy, ``database is locked``) is retried with backoff up to ``RETRY_MAX_DELAY`` seconds apart, never dropped; ids therefore follow the order events were queued, which is the order ``/admin/audit`` lists and pages by.
+    - The writer thread is started lazily on first use, which keeps it correct under pre-forking servers (each worker starts its own after the fork).
+    - Events still queued when the process exits are flushed by an ``atexit`` hook; a hard kill can lose the last batch.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import has_request_context, session
+
+import db
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 0.5
+RETRY_MAX_DELAY = 30.0
+# Never recorded: secrets, and columns derived from others by triggers.
+SKIP_COLUMNS = {"password", "start_day", "end_day"}
+
+
+def diff(before: dict | None, after: dict | None) -> dict:
+    """Return ``{column: [old, new]}`` for every column whose value changed.
+
+    Missing sides are treated as empty, so a create yields ``[None, new]`` pairs and a delete ``[old, None]`` pairs.  Passwords and trigger-derived day columns are never recorded.
+
+    Args:
+        before (dict | None): Row values before the change.
+        after (dict | None): Row values after the change.
+
+    Returns:
+        dict: Changed columns only.
+    """
+    before = before or {}
+    after = after or {}
+    changes = {}
+    for key in before.keys() | after.keys():
+        if key in SKIP_COLUMNS:
+            continue
+        old, new = before.get(key), after.get(key)
+        if old != new:
+            changes[key] = [old, new]
+    return changes
+
+
+class AuditWriter:
+    """Background thread that batches queued events into ``audit_events``."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, event: tuple) -> None:
+        """Queue one event, starting the writer thread if needed."""
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="audit-writer", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(event)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued event has been committed.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Defaults to 5.0.
+
+        Returns:
+            bool: ``True`` if the queue drained in time.
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch, waiters = [], []
+            item = self._queue.get()
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(self._row(item))
+                if len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get(timeout=FLUSH_INTERVAL if batch else 0)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    @staticmethod
+    def _write(batch: list[tuple]) -> None:
+        """Insert one batch through the serialized writer, retrying while the database is busy."""
+        delay = FLUSH_INTERVAL
+        while True:
+            try:
+                with db.writer() as conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO audit_events
+                            (occurred_at, actor_id, actor_name, entity, entity_id, action, changes)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        batch,
+                    )
+                    conn.commit()
+                return
+            except (TimeoutError, sqlite3.OperationalError) as e:
+                logger.warning(
+                    f"Audit log busy; retrying {len(batch)} events in {delay:.1f}s: {e}"
+                )
+            except sqlite3.Error as e:
+                # not contention: the rows themselves can never be written
+                logger.error(f"Dropped {len(batch)} audit events: {e}")
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+
+    @staticmethod
+    def _row(event: tuple) -> tuple:
+        occurred_at, actor_id, actor_name, entity, entity_id, action, before, after = (
+            event
+        )
+        changes = diff(before, after)
+        return (
+            occurred_at,
+            actor_id,
+            actor_name,
+            entity,
+            entity_id,
+            action,
+            json.dumps(changes, default=str) if changes else None,
+        )
+
+
+_writer = AuditWriter()
+atexit.register(_writer.flush)
+
+
+def record(
+    entity: str,
+    entity_id: int | None,
+    action: str,
+    before: dict | sqlite3.Row | None = None,
+    after: dict | sqlite3.Row | None = None,
+) -> None:
+    """Queue an audit event for the background writer.
+
+    The acting user is taken from ``session["user"]`` when called inside a request.  Diffing and serialization happen on the writer thread.
+
+    Args:
+        entity (str): Table-ish name, e.g. ``"job"``, ``"lock"``, ``"time_off"``, ``"user"``.
+        entity_id (int | None): Primary key of the affected row.
+        action (str): Verb such as ``"create"``, ``"update"``, ``"move"``, ``"delete"``.
+        before (dict | sqlite3.Row | None, optional): Row values before the change. Defaults to None.
+        after (dict | sqlite3.Row | None, optional): Row values after the change. Defaults to None.
+    """
+    user = (session.get("user") or {}) if has_request_context() else {}
+    _writer.submit(
+        (
+            datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            user.get("user_id"),
+            user.get("username"),
+            entity,
+            entity_id,
+            action,
+            dict(before) if before is not None else None,
+            dict(after) if after is not None else None,
+        )
+    )
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Block until queued audit events are written.
+
+    Args:
+        timeout (float, optional): Maximum seconds to wait. Defaults to 5.0.
+
+    Returns:
+        bool: ``True`` if everything queued so far was written.
+    """
+    return _writer.flush(timeout)
@@ -0,0 +1,358 @@
+"""Automatic technician assignment: propose a technician for every unassigned job in a date range, then apply the proposal.
+
+Provides:
+    - ``solve(conn, start, end, ...)``: a ``Plan`` assigning unassigned jobs to technicians; nothing is written.
+    - ``apply(conn, assignments, start, end, ...)``: re-check a (previewed) proposal against the current schedule and write the assignments that still fit with one ``executemany``.
+    - ``Plan``: proposed assignments, jobs left unassigned (with the reason) and per-technician load before and after.
+
+Notes:
+    - Only jobs with no technician and ``two_man = 0`` that overlap the range are assigned.  Two-man jobs have no technician to fill in; instead each one keeps two technicians free of any other job on its days, so the crew can still be found.
+    - A technician can take a job when, on every day of its span, they are not off, have fewer than ``max_per_day`` jobs and have no timed job overlapping it.  Jobs without both times never overlap (as in ``utils.conflicts``).
+    - Jobs touching a locked day are left alone (locked days can't be edited), and so are jobs touching a holiday unless ``skip_holidays`` is off.
+    - Greedy first: the most constrained jobs (longest span, then timed) go to the least-loaded technician that fits.  Local search then moves single jobs between technicians while that lowers ``sum(load^2) + sum(jobs per day^2)``, where load is a technician's job-days across the window, existing assignments included.
+    - The schedule is read with one range query each over ``jobs``, ``job_days``, ``time_off_days`` and ``locks``; solving is in memory.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Mapping, NamedTuple
+
+from utils.holidays_util import holidays_for_month
+
+MAX_PER_DAY = int(os.environ.get("AUTO_ASSIGN_MAX_PER_DAY", "6"))
+MAX_RANGE_DAYS = 92
+# Local search stops after this many passes or this many seconds, whichever is first.
+SEARCH_PASSES = 20
+SEARCH_BUDGET_S = 0.5
+
+_CANDIDATES_SQL = """
+    SELECT id, title, job_type, start_date, end_date, start_day, end_day,
+           start_time, end_time
+    FROM jobs
+    WHERE technician_id IS NULL AND two_man = 0
+      AND end_day >= :lo AND start_day <= :hi
+    ORDER BY start_day, id
+"""
+
+_BOOKED_SQL = """
+    SELECT jd.day, j.id, j.technician_id, j.two_man, j.start_time, j.end_time
+    FROM job_days jd JOIN jobs j ON j.id = jd.job_id
+    WHERE jd.day BETWEEN :lo AND :hi
+      AND (j.technician_id IS NOT NULL OR j.two_man = 1)
+"""
+
+_OFF_SQL = """
+    SELECT td.day, t.technician_id
+    FROM time_off_days td JOIN time_off t ON t.id = td.time_off_id
+    WHERE td.day BETWEEN :lo AND :hi
+"""
+
+
+class _Job(NamedTuple):
+    id: int
+    days: range
+    start_time: str | None
+    end_time: str | None
+
+
+@dataclass
+class Plan:
+    """A proposed assignment for one date range.
+
+    Attributes:
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        technicians (dict[int, str]): Technician names by id.
+        jobs (dict[int, sqlite3.Row]): Every unassigned job considered, by id.
+        assignments (dict[int, int]): Job id -> proposed technician id.
+        left (dict[int, str]): Job id -> why it was left unassigned (``locked``, ``holiday`` or ``no technician free``).
+        load_before (dict[int, int]): Job-days per technician across the window before the plan.
+        load_after (dict[int, int]): Job-days per technician with the plan applied.
+        elapsed_ms (float): Time taken to read the schedule and solve.
+    """
+
+    start: date
+    end: date
+    technicians: dict[int, str] = field(default_factory=dict)
+    jobs: dict[int, sqlite3.Row] = field(default_factory=dict)
+    assignments: dict[int, int] = field(default_factory=dict)
+    left: dict[int, str] = field(default_factory=dict)
+    load_before: dict[int, int] = field(default_factory=dict)
+    load_after: dict[int, int] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+class _Schedule:
+    """Per-technician, per-day bookings for one window, updated as jobs are placed and removed."""
+
+    def __init__(
+        self, techs: list[int], off: set[tuple[int, int]], days: range, max_per_day: int
+    ) -> None:
+        self.techs = techs
+        self.off = off
+        self.max_per_day = max_per_day
+        self.count: dict[tuple[int, int], int] = defaultdict(int)
+        self.times: dict[tuple[int, int], dict[int, tuple[str, str]]] = defaultdict(
+            dict
+        )
+        self.load = dict.fromkeys(techs, 0)
+        # technicians neither off nor booked, and how many of them two-man jobs need, per day
+        off_per_day: dict[int, int] = defaultdict(int)
+        for t, d in off:
+            off_per_day[d] += 1
+        self.free = {d: len(techs) - off_per_day[d] for d in days}
+        self.reserve: dict[int, int] = defaultdict(int)
+
+    def book_day(self, t: int, d: int, job_id: int, times) -> None:
+        """Record one day of a job for technician ``t``."""
+        if not self.count[t, d] and (t, d) not in self.off:
+            self.free[d] -= 1
+        self.count[t, d] += 1
+        if times:
+            self.times[t, d][job_id] = times
+        self.load[t] += 1
+
+    def unbook_day(self, t: int, d: int, job_id: int) -> None:
+        """Undo ``book_day``."""
+        self.count[t, d] -= 1
+        if not self.count[t, d] and (t, d) not in self.off:
+            self.free[d] += 1
+        self.times[t, d].pop(job_id, None)
+        self.load[t] -= 1
+
+    def place(self, job: _Job, t: int) -> None:
+        times = (job.start_time, job.end_time) if job.start_time else None
+        for d in job.days:
+            self.book_day(t, d, job.id, times)
+
+    def remove(self, job: _Job, t: int) -> None:
+        for d in job.days:
+            self.unbook_day(t, d, job.id)
+
+    def fits(self, job: _Job, t: int) -> bool:
+        """Whether ``t`` can take ``job`` on every day of its span."""
+        for d in job.days:
+            if (t, d) in self.off:
+                return False
+            n = self.count[t, d]
+            if n >= self.max_per_day:
+                return False
+            if not n and self.free[d] - 1 < self.reserve[d]:
+                return False
+            if job.start_time:
+                for s, e in self.times[t, d].values():
+                    if s < job.end_time and job.start_time < e:
+                        return False
+        return True
+
+    def improving(self, job: _Job, a: int) -> list[tuple[int, int]]:
+        """Technicians ``job`` could move to from ``a`` that lower the cost, as ``(change, tech)``, best first.
+
+        Moving ``s`` job-days from ``a`` to ``b`` changes the cost by ``2s(load_b - load_a + s) + sum(2(count_b - count_a + 1))`` over the job's days; the terms for ``a`` are computed once.
+        """
+        s = len(job.days)
+        count = self.count
+        fixed = 2 * s * (s + 1 - self.load[a]) - 2 * sum(count[a, d] for d in job.days)
+        better = []
+        for b in self.techs:
+            change = (
+                fixed + 2 * s * self.load[b] + 2 * sum(count[b, d] for d in job.days)
+            )
+            if change < 0 and b != a:
+                better.append((change, b))
+        better.sort()
+        return better
+
+
+def _load(
+    conn: sqlite3.Connection,
+    start: date,
+    end: date,
+    max_per_day: int,
+    skip_holidays: bool,
+    state: str | None,
+) -> tuple[Plan, _Schedule, dict[int, _Job]]:
+    """Read the window's schedule; return an empty plan, the schedule and the assignable jobs."""
+    plan = Plan(start, end)
+    lo, hi = start.toordinal(), end.toordinal()
+    rows = conn.execute(_CANDIDATES_SQL, {"lo": lo, "hi": hi}).fetchall()
+    # multi-day jobs reach past the range; their outer days must fit too
+    first = min([lo] + [r["start_day"] for r in rows])
+    last = max([hi] + [r["end_day"] for r in rows])
+    window = {"lo": first, "hi": last}
+
+    plan.technicians = dict(
+        conn.execute("SELECT id, name FROM technicians ORDER BY id").fetchall()
+    )
+    techs = list(plan.technicians)
+    off = {
+        (t, d)
+        for d, t in conn.execute(_OFF_SQL, window).fetchall()
+        if t in plan.technicians
+    }
+    sched = _Schedule(techs, off, range(first, last + 1), max_per_day)
+    for d, job_id, t, two_man, s, e in conn.execute(_BOOKED_SQL, window).fetchall():
+        if two_man:
+            sched.reserve[d] += 2
+        elif t in sched.load:
+            sched.book_day(t, d, job_id, (s, e) if s and e else None)
+    plan.load_before = dict(sched.load)
+
+    locked = {
+        date.fromisoformat(r[0]).toordinal()
+        for r in conn.execute(
+            "SELECT date FROM locks WHERE date BETWEEN ? AND ?",
+            (date.fromordinal(first).isoformat(), date.fromordinal(last).isoformat()),
+        ).fetchall()
+    }
+    holidays = set()
+    if skip_holidays:
+        for y, m in {
+            (date.fromordinal(d).year, date.fromordinal(d).month)
+            for d in range(first, last + 1)
+        }:
+            holidays.update(
+                date.fromisoformat(iso).toordinal()
+                for iso in holidays_for_month(y, m, state)
+            )
+
+    jobs = {}
+    for r in rows:
+        plan.jobs[r["id"]] = r
+        days = range(r["start_day"], r["end_day"] + 1)
+        if any(d in locked for d in days):
+            plan.left[r["id"]] = "locked"
+        elif any(d in holidays for d in days):
+            plan.left[r["id"]] = "holiday"
+        else:
+            timed = r["start_time"] and r["end_time"]
+            jobs[r["id"]] = _Job(
+                r["id"],
+                days,
+                r["start_time"] if timed else None,
+                r["end_time"] if timed else None,
+            )
+    return plan, sched, jobs
+
+
+def solve(
+    conn: sqlite3.Connection,
+    start: date,
+    end: date,
+    max_per_day: int = MAX_PER_DAY,
+    skip_holidays: bool = True,
+    state: str | None = None,
+) -> Plan:
+    """Propose a technician for every assignable unassigned job overlapping ``start``-``end``.
+
+    Args:
+        conn (sqlite3.Connection): Request (reader) connection.
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        max_per_day (int, optional): Most jobs a technician may have on one day, existing ones included. Defaults to ``MAX_PER_DAY``.
+        skip_holidays (bool, optional): Leave jobs that touch a holiday unassigned. Defaults to True.
+        state (str | None, optional): State code for holidays (see ``utils.holidays_util``). Defaults to None.
+
+    Returns:
+        Plan: The proposal; the database is not changed.
+    """
+    started = time.perf_counter()
+    plan, sched, jobs = _load(conn, start, end, max_per_day, skip_holidays, state)
+    techs = sched.techs
+
+    order = sorted(
+        jobs.values(),
+        key=lambda j: (-len(j.days), j.start_time is None, j.days.start, j.id),
+    )
+    placed = []
+    for job in order:
+        fitting = [t for t in techs if sched.fits(job, t)]
+        if not fitting:
+            plan.left[job.id] = "no technician free"
+            continue
+        d0 = job.days.start
+        best = min(fitting, key=lambda t: (sched.load[t], sched.count[t, d0], t))
+        sched.place(job, best)
+        plan.assignments[job.id] = best
+        placed.append(job)
+
+    deadline = started + SEARCH_BUDGET_S
+    for _ in range(SEARCH_PASSES):
+        improved = False
+        for job in placed:
+            a = plan.assignments[job.id]
+            better = sched.improving(job, a)
+            if not better:
+                continue
+            sched.remove(job, a)
+            for _, b in better:
+                if sched.fits(job, b):
+                    sched.place(job, b)
+                    plan.assignments[job.id] = b
+                    improved = True
+                    break
+            else:
+                sched.place(job, a)
+        if not improved or time.perf_counter() > deadline:
+            break
+
+    plan.load_after = dict(sched.load)
+    plan.elapsed_ms = (time.perf_counter() - started) * 1000
+    return plan
+
+
+def apply(
+    conn: sqlite3.Connection,
+    assignments: Mapping[int, int],
+    start: date,
+    end: date,
+    max_per_day: int = MAX_PER_DAY,
+    skip_holidays: bool = True,
+    state: str | None = None,
+    user_id: int | None = None,
+) -> tuple[dict[int, int], dict[int, str]]:
+    """Write a proposed assignment, skipping jobs it no longer fits.
+
+    The schedule is re-read in the caller's (writer) transaction, so anything booked, assigned or locked since the preview is respected.  Assignments are checked in the given order.
+
+    Args:
+        conn (sqlite3.Connection): Writer connection; the caller commits.
+        assignments (Mapping[int, int]): Job id -> technician id, usually ``Plan.assignments``.
+        start (date): First day of the range the plan was made for.
+        end (date): Last day of that range.
+        max_per_day (int, optional): As for ``solve``. Defaults to ``MAX_PER_DAY``.
+        skip_holidays (bool, optional): As for ``solve``. Defaults to True.
+        state (str | None, optional): As for ``solve``. Defaults to None.
+        user_id (int | None, optional): Applying user, stamped as ``last_modified_by``. Defaults to None.
+
+    Returns:
+        tuple[dict[int, int], dict[int, str]]: ``(applied, rejected)``: job id -> technician id written, and job id -> reason for the rest.
+    """
+    plan, sched, jobs = _load(conn, start, end, max_per_day, skip_holidays, state)
+    applied, rejected = {}, {}
+    for job_id, t in assignments.items():
+        job = jobs.get(job_id)
+        if job is None:
+            rejected[job_id] = plan.left.get(job_id, "no longer unassigned")
+        elif t not in sched.load:
+            rejected[job_id] = "technician removed"
+        elif not sched.fits(job, t):
+            rejected[job_id] = "no longer fits"
+        else:
+            sched.place(job, t)
+            applied[job_id] = t
+    conn.executemany(
+        """
+        UPDATE jobs
+        SET technician_id = ?, last_modified = CURRENT_TIMESTAMP, last_modified_by = ?
+        WHERE id = ? AND technician_id IS NULL AND two_man = 0
+        """,
+        [(t, user_id, job_id) for job_id, t in applied.items()],
+    )
+    return applied, rejected
@@ -0,0 +1,298 @@
+"""Online backups of ``db.sqlite3`` using SQLite's backup API.
+
+Provides:
+    - ``run_backup(...)``: snapshot, compress, verify and prune in one call; returns a ``BackupReport``.
+    - ``start_backup(...)``: run ``run_backup`` on a background thread (used by the admin route).
+    - ``verify_backup(path)``: decompress a snapshot to a temp file and check that it opens as a healthy database.
+    - ``list_backups()`` / ``last_report()``: what is on disk and how the latest run went.
+
+Notes:
+    - The copy uses ``sqlite3.Connection.backup`` in steps of ``BACKUP_PAGES`` pages, pausing ``BACKUP_SLEEP`` seconds between steps.  Each step holds a read transaction only briefly, so writers are never blocked for long; if another connection writes mid-copy, SQLite restarts the copy from the first page, which is why the step count can exceed ``total / pages``.  After ``BACKUP_MAX_RESTARTS`` restarts the copy finishes in a single step instead of chasing a busy writer forever.
+    - Snapshots are gzip files named ``exterminus-YYYYmmdd-HHMMSS.sqlite3.gz`` in ``DB_BACKUP_DIR`` (default ``backups/``).  Only the newest ``BACKUP_KEEP`` are kept.  A snapshot is compressed under a ``.part`` name and renamed only after it verifies, so a failed run leaves nothing that is listed or counted toward retention.
+    - Verification restores the snapshot to a temp file and runs ``PRAGMA integrity_check`` plus a schema-version and row-count read, so a passing backup is one that is known to restore.
+    - Every run is logged and recorded in the audit log (entity ``"backup"``) with its phase timings and step statistics.
+    - Yearly archive files (``utils/archive.py``) are written once and are not included; copy ``archive/`` alongside if you need them.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from db import BASE_DIR, _connect
+from utils import audit
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+BACKUP_DIR = Path(os.environ.get("DB_BACKUP_DIR", BASE_DIR / "backups"))
+BACKUP_KEEP = int(os.environ.get("BACKUP_KEEP", "14"))
+BACKUP_PAGES = int(os.environ.get("BACKUP_PAGES", "256"))
+BACKUP_SLEEP = float(os.environ.get("BACKUP_SLEEP", "0.01"))
+BACKUP_MAX_RESTARTS = int(os.environ.get("BACKUP_MAX_RESTARTS", "3"))
+PREFIX = "exterminus-"
+SUFFIX = ".sqlite3.gz"
+
+
+@dataclass
+class BackupReport:
+    """Outcome of one backup run.
+
+    Attributes:
+        path (Path | None): The compressed snapshot, once written.
+        started_at (str): Local start time, ``YYYY-mm-dd HH:MM:SS``.
+        pages (int): Database pages copied.
+        copy_steps (int): ``backup()`` steps taken, including restarts.
+        restarts (int): Times the copy started over because the source changed.
+        max_step_ms (float): Longest single step (time the source read lock was held).
+        raw_bytes (int): Size of the uncompressed snapshot.
+        gz_bytes (int): Size of the compressed snapshot.
+        timings (dict[str, float]): Seconds per phase: ``copy``, ``compress``, ``verify``, ``prune``.
+        verified (bool | None): Restore check result; ``None`` if skipped.
+        removed (list[str]): Old snapshots deleted by the retention policy.
+        error (str | None): Failure message, if the run failed.
+    """
+
+    path: Path | None = None
+    started_at: str = ""
+    pages: int = 0
+    copy_steps: int = 0
+    restarts: int = 0
+    max_step_ms: float = 0.0
+    raw_bytes: int = 0
+    gz_bytes: int = 0
+    timings: dict[str, float] = field(default_factory=dict)
+    verified: bool | None = None
+    removed: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def seconds(self) -> float:
+        """Total wall time over all phases."""
+        return sum(self.timings.values())
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly summary (for the audit log)."""
+        return {
+            "file": self.path.name if self.path else None,
+            "pages": self.pages,
+            "copy_steps": self.copy_steps,
+            "restarts": self.restarts,
+            "max_step_ms": round(self.max_step_ms, 2),
+            "raw_bytes": self.raw_bytes,
+            "gz_bytes": self.gz_bytes,
+            "timings": {k: round(v, 3) for k, v in self.timings.items()},
+            "verified": self.verified,
+            "removed": self.removed,
+            "error": self.error,
+        }
+
+
+_run_lock = threading.Lock()
+_last_report: BackupReport | None = None
+
+
+class _TooManyRestarts(Exception):
+    """Raised from the progress callback to abandon a stepped copy."""
+
+
+def _copy(dest_path: Path, pages: int, sleep: float, report: BackupReport) -> None:
+    """Copy the live database into ``dest_path`` page-step by page-step.
+
+    Falls back to a single-step copy after ``BACKUP_MAX_RESTARTS`` restarts.  Under WAL that copy runs in one read transaction, which never blocks writers; it only holds back checkpoints until it finishes.
+    """
+    src = _connect(readonly=True)
+    dest = sqlite3.connect(dest_path)
+    last = time.perf_counter()
+    prev_remaining = None
+
+    def progress(status, remaining, total):
+        nonlocal last, prev_remaining
+        now = time.perf_counter()
+        report.copy_steps += 1
+        report.pages = total
+        report.max_step_ms = max(report.max_step_ms, (now - last) * 1000)
+        if prev_remaining is not None and remaining > prev_remaining:
+            # another connection wrote to the source; SQLite started over
+            report.restarts += 1
+            if report.restarts > BACKUP_MAX_RESTARTS:
+                raise _TooManyRestarts
+        prev_remaining = remaining
+        # CPython's ``backup(sleep=...)`` only sleeps after SQLITE_BUSY/LOCKED, so
+        # pace the copy here; no lock is held between steps.
+        if remaining and sleep:
+            time.sleep(sleep)
+        last = time.perf_counter()
+
+    try:
+        try:
+            src.backup(dest, pages=pages, progress=progress)
+        except _TooManyRestarts:
+            logger.warning(
+                f"Backup restarted {report.restarts} times under write load; copying in one step."
+            )
+            started = time.perf_counter()
+            src.backup(dest)
+            report.copy_steps += 1
+            report.max_step_ms = max(
+                report.max_step_ms, (time.perf_counter() - started) * 1000
+            )
+        # a self-contained snapshot: no -wal file to carry around
+        dest.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dest.close()
+        src.close()
+
+
+def verify_backup(path: Path) -> bool:
+    """Restore a compressed snapshot to a temp file and check it.
+
+    Passes when ``PRAGMA integrity_check`` returns ``ok`` and the schema version and ``jobs`` / ``users`` tables can be read.
+
+    Args:
+        path (Path): A ``.sqlite3.gz`` snapshot.
+
+    Returns:
+        bool: ``True`` if the snapshot restores to a healthy database.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        restored = Path(tmp) / "restore.sqlite3"
+        try:
+            with gzip.open(path, "rb") as src, restored.open("wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        except (OSError, EOFError) as e:
+            # truncated or corrupt gzip (gzip.BadGzipFile is an OSError)
+            logger.error(f"Backup {path.name} failed to decompress: {e}")
+            return False
+        conn = sqlite3.connect(restored)
+        try:
+            if conn.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+                return False
+            conn.execute("PRAGMA user_version").fetchone()
+            conn.execute("SELECT COUNT(*) FROM jobs").fetchone()
+            conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Backup {path.name} failed to restore: {e}")
+            return False
+        finally:
+            conn.close()
+    return True
+
+
+def list_backups() -> list[Path]:
+    """Return the snapshots in ``BACKUP_DIR``, newest first."""
+    if not BACKUP_DIR.exists():
+        return []
+    return sorted(BACKUP_DIR.glob(f"{PREFIX}*{SUFFIX}"), reverse=True)
+
+
+def _prune(keep: int) -> list[str]:
+    removed = []
+    for old in list_backups()[keep:]:
+        old.unlink()
+        removed.append(old.name)
+    return removed
+
+
+def run_backup(
+    pages: int = BACKUP_PAGES,
+    sleep: float = BACKUP_SLEEP,
+    keep: int = BACKUP_KEEP,
+    verify: bool = True,
+) -> BackupReport:
+    """Take a compressed, verified snapshot of the live database and apply retention.
+
+    Only one backup runs at a time per process; a concurrent call waits for the running one to finish.
+
+    Args:
+        pages (int, optional): Pages copied per step. Defaults to ``BACKUP_PAGES``.
+        sleep (float, optional): Seconds to pause between steps. Defaults to ``BACKUP_SLEEP``.
+        keep (int, optional): Snapshots to keep, newest first. Defaults to ``BACKUP_KEEP``.
+        verify (bool, optional): Run the restore check. Defaults to True.
+
+    Returns:
+        BackupReport: Timings and results; ``error`` is set if a phase failed.
+    """
+    global _last_report
+    with _run_lock:
+        now = datetime.now()
+        report = BackupReport(started_at=now.strftime("%Y-%m-%d %H:%M:%S"))
+        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        final = BACKUP_DIR / f"{PREFIX}{now:%Y%m%d-%H%M%S}{SUFFIX}"
+        raw = final.with_name(final.name.removesuffix(".gz") + ".part")
+        # compressed here and renamed to ``final`` only once verified, so a
+        # failed run never leaves a snapshot that list_backups()/_prune count
+        staged = final.with_name(final.name + ".part")
+        phase = "copy"
+        try:
+            started = time.perf_counter()
+            _copy(raw, pages, sleep, report)
+            report.raw_bytes = raw.stat().st_size
+            report.timings["copy"] = time.perf_counter() - started
+
+            phase, started = "compress", time.perf_counter()
+            with raw.open("rb") as src, gzip.open(staged, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            report.gz_bytes = staged.stat().st_size
+            report.timings["compress"] = time.perf_counter() - started
+
+            if verify:
+                phase, started = "verify", time.perf_counter()
+                report.verified = verify_backup(staged)
+                report.timings["verify"] = time.perf_counter() - started
+                if not report.verified:
+                    raise RuntimeError("restore check failed")
+            os.replace(staged, final)
+            report.path = final
+
+            phase, started = "prune", time.perf_counter()
+            report.removed = _prune(keep)
+            report.timings["prune"] = time.perf_counter() - started
+        except Exception as e:
+            report.error = f"{phase}: {e}"
+            logger.error(f"Backup failed during {phase}: {e}")
+        finally:
+            raw.unlink(missing_ok=True)
+            staged.unlink(missing_ok=True)
+
+        if not report.error:
+            timings = ", ".join(f"{k} {v:.2f}s" for k, v in report.timings.items())
+            logger.info(
+                f"Backup {final.name}: {report.pages} pages in {report.copy_steps} steps "
+                f"(max step {report.max_step_ms:.1f} ms), {report.raw_bytes} -> {report.gz_bytes} bytes; {timings}"
+            )
+        audit.record("backup", None, "create", after=report.as_dict())
+        _last_report = report
+        return report
+
+
+def start_backup(**kwargs) -> bool:
+    """Run ``run_backup(**kwargs)`` on a background thread.
+
+    Returns:
+        bool: ``False`` if a backup is already running in this process (nothing is started).
+    """
+    if _run_lock.locked():
+        return False
+    threading.Thread(
+        target=run_backup, kwargs=kwargs, name="db-backup", daemon=True
+    ).start()
+    return True
+
+
+def is_running() -> bool:
+    """Return whether a backup is in progress in this process."""
+    return _run_lock.locked()
+
+
+def last_report() -> BackupReport | None:
+    """Return the report of the most recent run in this process, if any."""
+    return _last_report
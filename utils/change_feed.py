@@ -0,0 +1,180 @@
+"""Live change notices for open calendar pages, read from the trigger-fed ``change_feed`` table.
+
+Provides:
+    - ``latest_id(conn)``: id of the newest change (the stream's starting point).
+    - ``changes_since(conn, last_id, limit)``: change rows after ``last_id``.
+    - ``notice(rows)``: shape rows into the JSON payload sent to clients.
+    - ``ChangeFeed``: one polling thread per process that fans new changes out to every subscribed stream.
+    - ``change_feed``: the process-wide instance used by ``/events``.
+
+Notes:
+    - Rows are written by triggers (migration 0010) inside the writing transaction, so a change becomes visible exactly when it commits, from any route, CLI command or worker process.
+    - However many pages are open, a process reads the feed with one primary-key range query every ``FEED_POLL`` seconds, and only while at least one stream is connected.
+    - A poll that returns ``FEED_BATCH`` rows or more (bulk import, archiving) is sent as ``{"reload": true}`` instead of a list of changes.
+    - Each subscriber has a bounded queue; a stream that falls behind gets a reload notice rather than blocking the poller.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from datetime import date
+
+from db import _connect
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+FEED_POLL = float(os.environ.get("FEED_POLL", "1.0"))
+FEED_BATCH = int(os.environ.get("FEED_BATCH", "200"))
+FEED_MAX_CLIENTS = int(os.environ.get("FEED_MAX_CLIENTS", "100"))
+_QUEUE_SIZE = 32
+
+
+def latest_id(conn: sqlite3.Connection) -> int:
+    """Return the id of the newest change, or 0 if there are none."""
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_feed").fetchone()[0]
+
+
+def changes_since(
+    conn: sqlite3.Connection, last_id: int, limit: int = FEED_BATCH
+) -> list[sqlite3.Row]:
+    """Return up to ``limit`` changes with ``id > last_id``, oldest first."""
+    return conn.execute(
+        """
+        SELECT id, entity, entity_id, first_day, last_day
+        FROM change_feed
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (last_id, limit),
+    ).fetchall()
+
+
+def notice(rows: list[sqlite3.Row], reload: bool = False) -> dict:
+    """Build the payload for one SSE message.
+
+    Args:
+        rows (list[sqlite3.Row]): Rows from ``changes_since``.
+        reload (bool, optional): Tell clients to refresh everything instead. Defaults to False.
+
+    Returns:
+        dict: ``{"changes": [{"entity", "id", "from", "to"}, ...]}`` (``from`` / ``to`` are ISO dates, omitted when every day is affected), or ``{"reload": true}``.
+    """
+    if reload:
+        return {"reload": True}
+    changes = {}
+    for row in rows:
+        key = (row["entity"], row["entity_id"], row["first_day"], row["last_day"])
+        if key in changes:
+            continue  # e.g. several edits to one job within a poll
+        change = {"entity": row["entity"], "id": row["entity_id"]}
+        if row["first_day"] is not None:
+            change["from"] = date.fromordinal(row["first_day"]).isoformat()
+            change["to"] = date.fromordinal(row["last_day"]).isoformat()
+        changes[key] = change
+    return {"changes": list(changes.values())}
+
+
+class ChangeFeed:
+    """Polls ``change_feed`` on a background thread and broadcasts notices to subscriber queues.
+
+    Each queued item is ``(last_id, payload)``, where ``last_id`` is the id of the newest change the payload covers (sent as the SSE event id so clients can resume).
+
+    Attributes:
+        poll (float): Seconds between polls.
+        batch (int): Rows per poll before a reload notice is sent instead.
+        max_clients (int): Maximum concurrent subscribers per process.
+    """
+
+    def __init__(
+        self,
+        poll: float = FEED_POLL,
+        batch: int = FEED_BATCH,
+        max_clients: int = FEED_MAX_CLIENTS,
+    ) -> None:
+        self.poll = poll
+        self.batch = batch
+        self.max_clients = max_clients
+        self._subscribers: set[queue.Queue] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_id = 0
+
+    def subscribe(self) -> queue.Queue | None:
+        """Register a stream and start the poller if needed.
+
+        Returns:
+            queue.Queue | None: The stream's queue, or ``None`` if ``max_clients`` streams are already open.
+        """
+        q: queue.Queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            self._subscribers.add(q)
+            if self._thread is None or not self._thread.is_alive():
+                conn = _connect(readonly=True)
+                self._last_id = latest_id(conn)
+                self._thread = threading.Thread(
+                    target=self._run, args=(conn,), name="change-feed", daemon=True
+                )
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        """Remove a stream; the poller stops once none are left."""
+        with self._lock:
+            self._subscribers.discard(q)
+            if not self._subscribers:
+                self._wake.set()
+
+    def subscribers(self) -> int:
+        """Return the number of connected streams."""
+        with self._lock:
+            return len(self._subscribers)
+
+    def _broadcast(self, last_id: int, payload: dict) -> None:
+        with self._lock:
+            targets = list(self._subscribers)
+        for q in targets:
+            try:
+                q.put_nowait((last_id, payload))
+            except queue.Full:
+                # slow client: replace its backlog with a single reload
+                try:
+                    while True:
+                        q.get_nowait()
+                except queue.Empty:
+                    pass
+                q.put_nowait((last_id, notice([], reload=True)))
+
+    def _run(self, conn: sqlite3.Connection) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                try:
+                    rows = changes_since(conn, self._last_id, self.batch)
+                except sqlite3.Error as e:
+                    logger.error(f"Change feed poll failed: {e}")
+                    rows = []
+                if rows:
+                    self._last_id = rows[-1]["id"]
+                    if len(rows) >= self.batch:
+                        self._last_id = latest_id(conn)
+                        self._broadcast(self._last_id, notice(rows, reload=True))
+                    else:
+                        self._broadcast(self._last_id, notice(rows))
+                self._wake.wait(self.poll)
+                self._wake.clear()
+        finally:
+            conn.close()
+
+
+change_feed = ChangeFeed()
@@ -0,0 +1,192 @@
+"""Scheduling conflict checks for a job being saved: locks, time off, double booking and two-man crews.
+
+Provides:
+    - ``Conflict``: one structured conflict (kind, affected dates, the row it is about).
+    - ``check(conn, start, end, ...)``: every conflict for a proposed job, from a single query.
+    - ``BLOCKING``: kinds that can never be overridden.
+
+Notes:
+    - Everything is checked across the job's whole span, not just its start date:
+        - ``locked``: a locked day inside the span.
+        - ``time_off``: the assigned technician has time off overlapping the span.
+        - ``double_booked``: the technician has another job on a shared day whose ``start_time``-``end_time`` overlaps this one.  Jobs without both times are open-ended and never double-book.
+        - ``crew``: fewer than two technicians per concurrent two-man job are free on a day.  Checked for a two-man job and for a job with a technician, since booking one can take away a crew member a two-man job needs; the job's own technician counts as busy.  A technician is busy if they are off or on an overlapping job.  A two-man job without both times holds its crew all day; an untimed single-technician job is open-ended and overlaps only those.
+    - The branches run as one ``UNION ALL`` statement.  Per-technician lookups seek ``(technician_id, end_day, start_day)`` (migration 0013), so years of history are skipped.  Locks use their unique date index, and the per-day crew counts use the ``job_days`` / ``time_off_days`` fan-out tables.
+    - Only the live database is checked; archived years are history.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Iterable
+
+KINDS = ("locked", "time_off", "double_booked", "crew")
+# Conflicts the "book anyway" override does not lift.
+BLOCKING = frozenset({"locked"})
+
+# Crew capacity: does job ``j`` share time with the proposed job on a common day?  A two-man job without both times holds its crew all day; otherwise only overlapping timed jobs do (untimed single-technician jobs are open-ended, as for double booking).
+_CREW_OVERLAP = """(
+    :all_day
+    OR (j.two_man = 1 AND (j.start_time IS NULL OR j.end_time IS NULL))
+    OR (j.start_time < :end_time AND :start_time < j.end_time)
+)"""
+
+_CHECK_SQL = """
+    WITH RECURSIVE span(day) AS (
+        SELECT :lo WHERE :two_man OR :tech IS NOT NULL
+        UNION ALL
+        SELECT day + 1 FROM span WHERE day < :hi
+    ),
+    -- jobs sharing time with this one on each day, read from the fan-out once
+    concurrent(day, technician_id, two_man) AS MATERIALIZED (
+        SELECT jd.day, j.technician_id, j.two_man
+        FROM job_days jd
+        JOIN jobs j ON j.id = jd.job_id
+        WHERE jd.day BETWEEN :lo AND :hi AND (:two_man OR :tech IS NOT NULL)
+          AND j.id NOT IN (SELECT value FROM json_each(:exclude)) AND (j.two_man = 1 OR j.technician_id IS NOT NULL)
+          AND {overlap}
+    ),
+    demand(day, two_man_jobs) AS (
+        SELECT day, SUM(two_man) FROM concurrent GROUP BY day
+    ),
+    busy(day, technicians) AS (
+        SELECT day, COUNT(*) FROM (
+            SELECT day, technician_id FROM concurrent WHERE technician_id IS NOT NULL
+            UNION
+            SELECT td.day, t.technician_id
+            FROM time_off_days td JOIN time_off t ON t.id = td.time_off_id
+            WHERE td.day BETWEEN :lo AND :hi AND (:two_man OR :tech IS NOT NULL)
+            UNION
+            SELECT day, :tech FROM span WHERE :tech IS NOT NULL
+        )
+        GROUP BY day
+    ),
+    crew(day, needed, free) AS (
+        SELECT s.day,
+               2 * (:two_man + COALESCE(d.two_man_jobs, 0)),
+               (SELECT COUNT(*) FROM technicians) - COALESCE(b.technicians, 0)
+        FROM span s
+        LEFT JOIN demand d ON d.day = s.day
+        LEFT JOIN busy b ON b.day = s.day
+    )
+    SELECT 'locked' AS kind, l.id AS ref_id, l.date AS first_date, l.date AS last_date,
+           NULL AS detail
+    FROM locks l
+    WHERE l.date BETWEEN :start_date AND :end_date
+    UNION ALL
+    SELECT 'time_off', t.id, max(t.start_date, :start_date), min(t.end_date, :end_date),
+           t.reason
+    FROM time_off t
+    WHERE t.technician_id = :tech AND t.end_day >= :lo AND t.start_day <= :hi
+    UNION ALL
+    SELECT 'double_booked', j.id, max(j.start_date, :start_date),
+           min(COALESCE(j.end_date, j.start_date), :end_date),
+           j.title || ' ' || j.start_time || '-' || j.end_time
+    FROM jobs j
+    WHERE j.technician_id = :tech AND j.end_day >= :lo AND j.start_day <= :hi
+      AND j.id NOT IN (SELECT value FROM json_each(:exclude))
+      AND j.start_time < :end_time AND :start_time < j.end_time
+    UNION ALL
+    SELECT 'crew', NULL, date(day + 1721424.5), date(day + 1721424.5),
+           free || ' free, ' || needed || ' needed'
+    FROM crew
+    WHERE needed > 0 AND free < needed
+""".replace("{overlap}", _CREW_OVERLAP)
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """One reason a job cannot be booked as proposed.
+
+    Attributes:
+        kind (str): One of ``KINDS``.
+        first_date (str): First affected ISO date within the job's span.
+        last_date (str): Last affected ISO date within the job's span.
+        ref_id (int | None): The lock, time-off entry or job the conflict is with (``None`` for ``crew``).
+        detail (str | None): Time-off reason, the other job's title and times, or the crew count.
+    """
+
+    kind: str
+    first_date: str
+    last_date: str
+    ref_id: int | None = None
+    detail: str | None = None
+
+    @property
+    def message(self) -> str:
+        """Human-readable summary for flashes and form warnings."""
+        days = (
+            self.first_date
+            if self.first_date == self.last_date
+            else f"{self.first_date} to {self.last_date}"
+        )
+        if self.kind == "locked":
+            return f"{days} is locked."
+        if self.kind == "time_off":
+            reason = f" ({self.detail})" if self.detail else ""
+            return f"Technician is off {days}{reason}."
+        if self.kind == "double_booked":
+            return f"Technician is already booked {days}: {self.detail}."
+        return f"Not enough technicians for the two-man jobs on {days} ({self.detail})."
+
+    def to_dict(self) -> dict:
+        """Return the fields plus ``message`` (for JSON)."""
+        return {**asdict(self), "message": self.message}
+
+
+def check(
+    conn: sqlite3.Connection,
+    start: date,
+    end: date | None = None,
+    technician_id: int | None = None,
+    two_man: int = 0,
+    start_time: str | None = None,
+    end_time: str | None = None,
+    exclude_job_id: int | Iterable[int] | None = None,
+) -> list[Conflict]:
+    """Return every conflict for a job with this span, assignment and times.
+
+    Args:
+        conn (sqlite3.Connection): Request connection.
+        start (date): First day of the job.
+        end (date | None, optional): Last day; ``None`` for a single-day job. Defaults to None.
+        technician_id (int | None, optional): Assigned technician, if any. Defaults to None.
+        two_man (int, optional): ``1`` for a two-man job. Defaults to 0.
+        start_time (str | None, optional): ``HH:MM`` start; double booking needs both times. Defaults to None.
+        end_time (str | None, optional): ``HH:MM`` end. Defaults to None.
+        exclude_job_id (int | Iterable[int] | None, optional): The job being edited or moved, so it never conflicts with itself; several ids when a series change moves them together. Defaults to None.
+
+    Returns:
+        list[Conflict]: Conflicts ordered by kind (as in ``KINDS``), then date.
+    """
+    end = end or start
+    if exclude_job_id is None:
+        excluded = []
+    elif isinstance(exclude_job_id, int):
+        excluded = [exclude_job_id]
+    else:
+        excluded = list(exclude_job_id)
+    rows = conn.execute(
+        _CHECK_SQL,
+        {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "lo": start.toordinal(),
+            "hi": end.toordinal(),
+            "tech": technician_id,
+            "two_man": int(bool(two_man)),
+            "all_day": int(bool(two_man) and not (start_time and end_time)),
+            "start_time": start_time if start_time and end_time else None,
+            "end_time": end_time if start_time and end_time else None,
+            "exclude": json.dumps(excluded),
+        },
+    ).fetchall()
+    found = [
+        Conflict(kind, first_date, last_date, ref_id, detail)
+        for kind, ref_id, first_date, last_date, detail in rows
+    ]
+    found.sort(key=lambda c: (KINDS.index(c.kind), c.first_date))
+    return found
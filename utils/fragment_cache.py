@@ -0,0 +1,72 @@
+"""In-process cache of rendered HTML fragments, keyed by what they display.
+
+Provides:
+    - ``FragmentCache``: bounded LRU of ``key -> html``.
+    - ``cell_cache``: the process-wide instance holding month-view day cells.
+
+Notes:
+    - Keys are content-addressed (e.g. a day's date plus a digest of its jobs and time off, its lock and holiday state, and the viewer's permissions), so entries never need invalidating: a changed day simply looks up a new key and the old one ages out.
+    - Size via ``CELL_CACHE_SIZE`` (default ``4096`` fragments); ``0`` disables caching.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+CELL_CACHE_SIZE = int(os.environ.get("CELL_CACHE_SIZE", "4096"))
+
+
+class FragmentCache:
+    """Bounded, thread-safe LRU of rendered fragments.
+
+    Attributes:
+        maxsize (int): Maximum number of fragments; ``0`` disables storing.
+    """
+
+    def __init__(self, maxsize: int = CELL_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> str | None:
+        """Return the fragment for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return html
+
+    def put(self, key: Hashable, html: str) -> None:
+        """Store a fragment, evicting the least recently used ones beyond ``maxsize``."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every fragment."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current entry count."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+cell_cache = FragmentCache()
@@ -0,0 +1,129 @@
+"""Conditional GET helpers (``ETag`` / ``Last-Modified``) for server-rendered pages.
+
+Provides:
+    - ``validators(*parts, changed=None, per_user=True)``: ``(etag, last_modified)`` for the current request, user and data version.
+    - ``is_fresh(etag, last_modified)``: whether the client's ``If-None-Match`` / ``If-Modified-Since`` still matches.
+    - ``not_modified(etag, last_modified)``: an empty ``304`` response carrying the validators.
+    - ``add_validators(response, etag, last_modified)``: stamp validators and revalidation headers on a rendered page.
+
+Notes:
+    - The data version comes from ``utils.month_cache.versions`` (trigger-maintained generations), so deciding on a 304 costs one small primary-key read and skips the page's queries and rendering entirely.
+    - Pages embed the user's name, role-dependent controls, a CSRF token and "today", so the ETag also covers the session user, the session's CSRF secret, the date, and a time bucket of half ``WTF_CSRF_TIME_LIMIT`` -- a revalidated page never carries an expired token.  Responses are ``private, no-cache`` with ``Vary: Cookie``.
+    - Requests with pending flash messages always get a fresh render so the messages are shown.
+    - JSON responses that don't depend on the session pass ``per_user=False`` so every client shares one validator per data version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time as _time
+from datetime import date, datetime, time, timezone
+
+from flask import Response, current_app, request, session
+from flask_wtf.csrf import generate_csrf
+from werkzeug.http import is_resource_modified
+
+
+def _csrf_bucket() -> tuple[int, int]:
+    """Return ``(bucket_number, bucket_seconds)`` for the CSRF token lifetime (``(0, 0)`` if tokens never expire)."""
+    limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    if not limit:
+        return 0, 0
+    size = max(int(limit) // 2, 1)
+    return int(_time.time()) // size, size
+
+
+def validators(
+    *parts, changed: datetime | None = None, per_user: bool = True
+) -> tuple[str, datetime]:
+    """Build the ETag and Last-Modified for the page being served.
+
+    Args:
+        *parts: Data version of what the page displays, e.g. the generation tuple from ``versions``.
+        changed (datetime | None, optional): When that data last changed (UTC). Defaults to None.
+        per_user (bool, optional): Whether the response embeds session state (user, CSRF token, "today"). Defaults to True.
+
+    Returns:
+        tuple[str, datetime]: ``(etag, last_modified)``.  For per-user pages ``last_modified`` is never earlier than local midnight or the start of the current CSRF bucket.
+    """
+    if not per_user:
+        raw = repr((request.endpoint, parts))
+        etag = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        stamp = changed or datetime.fromtimestamp(0, timezone.utc)
+        return etag, stamp.replace(microsecond=0)
+
+    user = session.get("user") or {}
+    # make sure the session's CSRF secret exists before hashing it, so the
+    # first render and later revalidations agree (the template reuses it)
+    generate_csrf()
+    today = date.today()
+    bucket, size = _csrf_bucket()
+    raw = repr(
+        (
+            request.endpoint,
+            parts,
+            user.get("user_id"),
+            user.get("username"),
+            user.get("role"),
+            today.isoformat(),
+            bucket,
+            session.get("csrf_token"),
+        )
+    )
+    etag = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    floor = datetime.combine(today, time()).astimezone(timezone.utc)
+    if size:
+        floor = max(floor, datetime.fromtimestamp(bucket * size, timezone.utc))
+    last_modified = max(changed, floor) if changed else floor
+    return etag, last_modified.replace(microsecond=0)
+
+
+def is_fresh(etag: str, last_modified: datetime, per_user: bool = True) -> bool:
+    """Return whether the client's cached copy is still valid.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since`` when both are sent.
+
+    Args:
+        etag (str): From ``validators``.
+        last_modified (datetime): From ``validators``.
+        per_user (bool, optional): Page shows flash messages (checked without touching the session otherwise). Defaults to True.
+
+    Returns:
+        bool: ``True`` if a 304 can be sent.
+    """
+    if per_user and session.get("_flashes"):
+        return False
+    if not (request.if_none_match or request.if_modified_since):
+        return False
+    return not is_resource_modified(
+        request.environ, etag=etag, last_modified=last_modified
+    )
+
+
+def add_validators(
+    response: Response, etag: str, last_modified: datetime, per_user: bool = True
+) -> Response:
+    """Attach ``ETag``, ``Last-Modified`` and revalidation headers.
+
+    Args:
+        response (Response): The response to decorate (rendered page or 304).
+        etag (str): From ``validators``.
+        last_modified (datetime): From ``validators``.
+        per_user (bool, optional): Mark the response ``private`` and ``Vary: Cookie``. Defaults to True.
+
+    Returns:
+        Response: The same response.
+    """
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    if per_user:
+        response.cache_control.private = True
+        response.vary.add("Cookie")
+    return response
+
+
+def not_modified(etag: str, last_modified: datetime, per_user: bool = True) -> Response:
+    """Return an empty ``304 Not Modified`` carrying the validators."""
+    return add_validators(Response(status=304), etag, last_modified, per_user)
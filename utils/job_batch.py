@@ -0,0 +1,208 @@
+"""Batch job changes: validate and apply many moves, reassignments and deletes in one transaction.
+
+Provides:
+    - ``OPS``: operation names and the roles allowed to run each one.
+    - ``MAX_OPS``: largest batch accepted.
+    - ``run(conn, ops, role, user_id, allow_conflicts)``: apply a list of operations all-or-nothing; returns per-item results, the affected dates and the audit events to record.
+
+Notes:
+    - Operations run in order inside a savepoint on the caller's write transaction.  Each one is checked against the schedule as the earlier ones left it, so two jobs moved onto the same technician and time conflict with each other.  Every operation is checked even after one fails; if any failed, the savepoint is rolled back and nothing is written.
+    - Checks mirror the single-job routes and the day view: a job on a locked day can't be changed, a move keeps the job's duration and may not land on a locked day, and technician conflicts (``utils.conflicts``) in the resulting span block unless ``allow_conflicts`` is set.  Locks never yield.
+    - Operations apply to single jobs; "this and following" series changes stay on the single-job routes.
+    - Audit events are returned rather than queued, so nothing is recorded for a batch that was rolled back.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import date, timedelta
+
+from utils import conflicts
+
+OPS = {
+    "move": ("manager", "technician", "sales"),
+    "reassign": ("manager", "sales"),
+    "delete": ("manager", "sales"),
+}
+MAX_OPS = int(os.environ.get("BATCH_MAX_OPS", "500"))
+
+
+class _Refused(Exception):
+    """An operation that cannot be applied; carries the conflicts behind it, if any."""
+
+    def __init__(self, message: str, found: list | None = None) -> None:
+        super().__init__(message)
+        self.conflicts = found or []
+
+
+def _span(job: sqlite3.Row) -> tuple[date, date]:
+    start = date.fromisoformat(job["start_date"])
+    return start, date.fromisoformat(job["end_date"] or job["start_date"])
+
+
+def _check(conn, job, start, end, technician_id, two_man, allow_conflicts) -> None:
+    """Refuse if the job would conflict in ``start``-``end`` with this assignment."""
+    found = conflicts.check(
+        conn,
+        start,
+        end,
+        technician_id,
+        two_man,
+        job["start_time"],
+        job["end_time"],
+        exclude_job_id=job["id"],
+    )
+    blocking = [c for c in found if c.kind in conflicts.BLOCKING or not allow_conflicts]
+    if blocking:
+        raise _Refused(" ".join(c.message for c in blocking), blocking)
+
+
+def _technician(conn, value) -> tuple[int | None, int]:
+    """Parse a ``reassign`` target: a technician id, ``"__BOTH__"`` (two-man) or ``None`` (unassigned)."""
+    if value == "__BOTH__":
+        return None, 1
+    if value is None or value == "":
+        return None, 0
+    try:
+        tid = int(value)
+    except (TypeError, ValueError):
+        raise _Refused('technician_id must be an id, "__BOTH__" or null') from None
+    if not conn.execute("SELECT 1 FROM technicians WHERE id = ?", (tid,)).fetchone():
+        raise _Refused(f"Technician {tid} not found.")
+    return tid, 0
+
+
+def _apply(conn, op, role, user_id, allow_conflicts, days, events) -> None:
+    """Apply one operation, adding its dates to ``days`` and its audit event to ``events``."""
+    if not isinstance(op, dict) or op.get("op") not in OPS:
+        raise _Refused(f"op must be one of {', '.join(OPS)}")
+    name = op["op"]
+    if role not in OPS[name]:
+        raise _Refused(f"Your role may not {name} jobs.")
+    job_id = op.get("job_id")
+    job = (
+        conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if isinstance(job_id, int)
+        else None
+    )
+    if job is None:
+        raise _Refused("Job not found.")
+    start, end = _span(job)
+    locked = conn.execute(
+        "SELECT date FROM locks WHERE date BETWEEN ? AND ? ORDER BY date LIMIT 1",
+        (start.isoformat(), end.isoformat()),
+    ).fetchone()
+    if locked:
+        raise _Refused(f"{locked['date']} is locked.")
+    old_days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+    if name == "move":
+        try:
+            new_start = date.fromisoformat(op.get("new_date") or "")
+        except (TypeError, ValueError):
+            raise _Refused("new_date must be YYYY-MM-DD") from None
+        new_end = new_start + (end - start)
+        _check(
+            conn,
+            job,
+            new_start,
+            new_end,
+            job["technician_id"],
+            job["two_man"],
+            allow_conflicts,
+        )
+        conn.execute(
+            """
+            UPDATE jobs
+            SET start_date = ?, end_date = ?,
+                last_modified = CURRENT_TIMESTAMP, last_modified_by = ?
+            WHERE id = ?
+            """,
+            (new_start.isoformat(), new_end.isoformat(), user_id, job["id"]),
+        )
+        days.update(old_days)
+        days.update(
+            new_start + timedelta(days=n) for n in range((new_end - new_start).days + 1)
+        )
+        events.append(
+            (
+                "job",
+                job["id"],
+                "move",
+                {"start_date": job["start_date"], "end_date": job["end_date"]},
+                {"start_date": new_start.isoformat(), "end_date": new_end.isoformat()},
+            )
+        )
+    elif name == "reassign":
+        technician_id, two_man = _technician(conn, op.get("technician_id"))
+        _check(conn, job, start, end, technician_id, two_man, allow_conflicts)
+        conn.execute(
+            """
+            UPDATE jobs
+            SET technician_id = ?, two_man = ?,
+                last_modified = CURRENT_TIMESTAMP, last_modified_by = ?
+            WHERE id = ?
+            """,
+            (technician_id, two_man, user_id, job["id"]),
+        )
+        days.update(old_days)
+        events.append(
+            (
+                "job",
+                job["id"],
+                "update",
+                {"technician_id": job["technician_id"], "two_man": job["two_man"]},
+                {"technician_id": technician_id, "two_man": two_man},
+            )
+        )
+    else:
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job["id"],))
+        days.update(old_days)
+        events.append(("job", job["id"], "delete", job, None))
+
+
+def run(
+    conn: sqlite3.Connection,
+    ops: list,
+    role: str | None,
+    user_id: int | None,
+    allow_conflicts: bool = False,
+) -> tuple[list[dict], list[str], list[tuple]]:
+    """Validate and apply ``ops`` in order; keep all of them or none.
+
+    Args:
+        conn (sqlite3.Connection): Writer connection; the caller commits.
+        ops (list): Operations, each ``{"op": "move", "job_id", "new_date"}``, ``{"op": "reassign", "job_id", "technician_id"}`` or ``{"op": "delete", "job_id"}``.
+        role (str | None): Role of the requesting user (see ``OPS``).
+        user_id (int | None): Requesting user, stamped as ``last_modified_by``.
+        allow_conflicts (bool, optional): Let technician conflicts through ("Book anyway"); locks still refuse. Defaults to False.
+
+    Returns:
+        tuple[list[dict], list[str], list[tuple]]: ``(results, days, events)``.  ``results`` has one ``{"index", "op", "job_id", "ok"}`` per operation, with ``error`` (and ``conflicts``) when refused.  ``days`` lists the ISO dates whose schedule changed and ``events`` the ``audit.record`` arguments; both are empty when anything was refused.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    conn.execute("SAVEPOINT job_batch")
+    results, days, events = [], set(), []
+    for index, op in enumerate(ops):
+        result = {
+            "index": index,
+            "op": op.get("op") if isinstance(op, dict) else None,
+            "job_id": op.get("job_id") if isinstance(op, dict) else None,
+            "ok": True,
+        }
+        try:
+            _apply(conn, op, role, user_id, allow_conflicts, days, events)
+        except _Refused as e:
+            result.update(ok=False, error=str(e))
+            if e.conflicts:
+                result["conflicts"] = [c.to_dict() for c in e.conflicts]
+        results.append(result)
+
+    if all(r["ok"] for r in results):
+        conn.execute("RELEASE job_batch")
+        return results, sorted(d.isoformat() for d in days), events
+    conn.execute("ROLLBACK TO job_batch")
+    conn.execute("RELEASE job_batch")
+    return results, [], []
@@ -0,0 +1,235 @@
+"""Job form parsing shared by the job routes, the JSON API and the bulk importer.
+
+Provides:
+    - ``parse_date(s)``: ISO or US date input to a ``date``.
+    - ``parse_technician(value, cur)``: the technician selector to ``(technician_id, two_man)``.
+    - ``lookup_zipcode(zip)`` / ``lookup_zipcodes(zips)``: REI ZIP -> city via ``utils.zip_index``.
+    - ``normalize_hhmm(s)`` / ``derive_time_range(start, end)``: time inputs and the calendar's ``H-H`` label.
+    - ``compose_job_payload(form, cur, start_date, end_date)``: validate add-job fields into an insertable payload.
+
+Notes:
+    - Nothing here reads the request: each function takes form-style values, so routes, CLI commands and utilities share the same rules without importing route modules.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from utils import zip_index
+
+
+def parse_date(s: str | None) -> date | None:
+    """Parse a user-supplied date string into a `date`.
+
+    Accepts ISO ``YYYY-MM-DD`` or US ``MM/DD/YYYY``.  Returns ``None`` for blank or unparsable values.  Does not raise.
+
+    Args:
+        s (str | None): Raw date value from a form.
+
+    Returns:
+        date | None: Parsed date, or ``None`` if parsing fails.
+    """
+    s = (s or "").strip()
+    if not s:
+        return None
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_technician(value: str | None, cur=None) -> tuple[int | None, int]:
+    """Interpret the technician selector from the job form.
+
+    The form value may be an integer ID (as a string), the sentinel ``"__BOTH__"`` to indicate a Two-Man Job, or blank.  If a DB cursor is provided, the ID is validated against the ``technicians`` table.
+
+    Args:
+        value (str | None): Form value (``"__BOTH__"``, ``""``, or int-like string).
+        cur (optional): Optional SQLite cursor for existence check.
+
+    Returns:
+        tuple[int | None, int]: ``(technician_id, two_man)``. For ``"__BOTH__"`` returns ``(None, 1)``; for a valid technician ID returns ``(id, 0)``; otherwise ``(None, 0)``.
+    """
+    if value == "__BOTH__":
+        return None, 1
+    if value is None or str(value).strip() == "":
+        return None, 0
+    try:
+        tid = int(value)
+    except (TypeError, ValueError):
+        return None, 0
+
+    if cur is not None:
+        ok = cur.execute("SELECT 1 FROM technicians WHERE id=?", (tid,)).fetchone()
+        if not ok:
+            return None, 0
+    return tid, 0
+
+
+def lookup_zipcode(zip_code: str) -> str | None:
+    """Resolve a 5-digit ZIP code to a city name (see ``utils.zip_index``).
+
+    Args:
+        zip_code (str): ZIP code as entered (whitespace allowed).
+
+    Returns:
+        str | None: City name if found; otherwise ``None``.
+    """
+    return zip_index.city_for(zip_code)
+
+
+def lookup_zipcodes(zip_codes) -> dict[str, str | None]:
+    """Resolve many 5-digit ZIP codes to city names with one index lookup each.
+
+    Args:
+        zip_codes: Iterable of ZIP strings (invalid ones map to ``None``).
+
+    Returns:
+        dict[str, str | None]: ``{zip: city_or_None}`` for every distinct input.
+    """
+    return zip_index.cities_for(zip_codes)
+
+
+def normalize_hhmm(s: str | None) -> str | None:
+    """Normalize a loose time input to ``HH:MM``.
+
+    Accepts inputs like ``"9"``, ``"09"``, ``"9:30"``, ``"09:30"`` and returns canonical ``"09:00"`` or ``"09:30"``.  Returns ``None`` for blank/invalid.
+
+    Args:
+        s (str | None): Raw time string.
+
+    Returns:
+        str | None: Normalized time string, or ``None``.
+    """
+    if not s:
+        return None
+    s = s.strip()
+    if not s:
+        return None
+    if s.isdigit():
+        return f"{int(s):02d}:00"
+    if ":" in s:
+        h, m = s.split(":", 1)
+        return f"{int(h):02d}:{int(m):02d}"
+    return None
+
+
+def derive_time_range(start_hhmm: str | None, end_hhmm: str | None) -> str | None:
+    """Build a compact ``H-H`` label from start/end times.
+
+    Intended for teh calendar's small badges.  Minuts are intentionally dropped (e.g., ``"09:30"`` - ``"14:00"`` => ``"9-14"``).  Returns ``None`` if either time is missing.
+
+    Args:
+        start_hhmm (str | None): Start time like ``"HH:MM"``.
+        end_hhmm (str | None): End time like ``"HH:MM"``.
+
+    Returns:
+        str | None: A label like ``"9-14"`` or ``None``.
+    """
+    if not start_hhmm or not end_hhmm:
+        return None
+    sh, sm = map(int, start_hhmm.split(":"))
+    eh, em = map(int, end_hhmm.split(":"))
+    return f"{sh}-{eh}"
+
+
+def compose_job_payload(
+    form, cur, start_date: date, end_date: date | None, zip_lookup=None
+):
+    """Validate and normalize job form fields into an insertable payload.
+
+    Shared by the add-job routes and the bulk importer (``utils.job_import``) so both apply the same rules.
+
+    Args:
+        form: Mapping with form-style string values (``request.form`` or a dict).
+        cur: SQLite cursor used to validate the technician id.
+        start_date (date): Parsed start date.
+        end_date (date | None): Parsed end date (REIs are forced single-day).
+        zip_lookup (optional): ``zip -> city | None`` callable; defaults to ``lookup_zipcode``.  The importer passes a pre-resolved batch.
+
+    Returns:
+        tuple[dict | None, str | None]: ``(payload, None)`` on success or ``(None, error_message)``.
+    """
+    zip_lookup = zip_lookup or lookup_zipcode
+
+    # Times
+    start_time = normalize_hhmm(form.get("start_time"))
+    end_time = normalize_hhmm(form.get("end_time"))
+    if start_time and end_time and end_time <= start_time:
+        return None, "End time must be after start time."
+    time_range = derive_time_range(start_time, end_time) or (
+        form.get("time_range", "").strip() or "any"
+    )
+
+    # Technicians
+    technician_raw = form.get("technician_id")
+    technician_id, two_man = parse_technician(technician_raw, cur)
+
+    # REI Fields (ZIP -> city; Quantity is required)
+    rei_quantity_raw = (form.get("rei_quantity") or "").strip()
+    rei_quantity = form.get("rei_quantity")
+    rei_zip = (form.get("rei_zip") or "").strip()
+    rei_city_name = None
+    if zip_index.is_zip(rei_zip):
+        rei_city_name = zip_lookup(rei_zip)
+
+    # Other Fields
+    exclusion_subtype = form.get("exclusion_subtype")
+    fumigation_type = form.get("fumigation_type")
+    target_pest = form.get("target_pest")
+    custom_pest = form.get("custom_pest")
+    if custom_pest:
+        target_pest = custom_pest.strip()
+
+    # Core
+    title = (form.get("title") or "").strip()
+    job_type = (form.get("job_type") or "").strip().lower()
+    if job_type == "custom":
+        job_type = (form.get("custom_type") or "").strip()
+    price = form.get("price")
+
+    # End date normalization for REIs
+    end_final = end_date
+
+    # REI authoritative rules
+    if job_type == "rei":
+        title = "REIs"
+        price = None
+        end_final = start_date
+        try:
+            rei_quantity = int(rei_quantity_raw)
+        except ValueError:
+            return None, "Quantity required for REIs."
+        if rei_quantity <= 0:
+            return None, "Quantity required for REIs."
+    else:
+        if not title:
+            return None, "Title is required."
+
+    payload = {
+        "title": title,
+        "job_type": job_type,
+        "price": price,
+        "start_date": start_date.isoformat(),
+        "end_date": end_final.isoformat() if end_final else None,
+        "start_time": start_time,
+        "end_time": end_time,
+        "time_range": time_range,
+        "notes": (form.get("notes", "") or ""),
+        "technician_id": technician_id,
+        "two_man": two_man,
+        "rei_quantity": (
+            int(rei_quantity_raw)
+            if (job_type == "rei" and rei_quantity_raw.isdigit())
+            else form.get("rei_quantity")
+        ),
+        "rei_zip": rei_zip,
+        "rei_city_name": rei_city_name,
+        "exclusion_subtype": exclusion_subtype,
+        "fumigation_type": fumigation_type,
+        "target_pest": target_pest,
+        "custom_pest": custom_pest,
+    }
+    return payload, None
@@ -0,0 +1,168 @@
+"""Job change history and restore, read from the trigger-written ``job_revisions`` table.
+
+Provides:
+    - ``MAX_DAYS``: widest day range ``for_days`` accepts.
+    - ``for_job(conn, job_id)``: every revision of one job, newest first.
+    - ``for_days(conn, start, end, since=None, limit=PAGE_SIZE)``: revisions that touched any day in a range, newest first.
+    - ``restore(conn, job_id, user_id)``: put a deleted job back from its delete revision.
+
+Notes:
+    - Revisions are written by triggers on ``jobs`` (migration 0015), so this module only reads them; ``restore`` is an ordinary insert that records its own ``insert`` revision.
+    - ``for_job`` seeks ``idx_job_revisions_job``; ``for_days`` range-scans the ``job_revision_days`` primary key and looks each revision up by id, so neither touches unrelated history.
+    - Each returned revision is a dict with ``changes`` decoded, the acting user's name, the job's title (current, or as it was when deleted) and ``restorable`` set on a delete that is still the job's latest revision.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import date
+
+from utils import conflicts
+
+MAX_DAYS = 31
+PAGE_SIZE = 200
+
+# References nulled on restore when the row they point at is gone.
+_REFERENCES = {
+    "technician_id": "technicians",
+    "series_id": "job_series",
+    "created_by": "users",
+    "last_modified_by": "users",
+}
+
+_SELECT = """
+    SELECT r.*, u.username AS changed_by_name, j.title AS current_title,
+           r.action = 'delete' AND NOT EXISTS (
+               SELECT 1 FROM job_revisions later
+               WHERE later.job_id = r.job_id AND later.id > r.id
+           ) AS restorable
+    FROM job_revisions r
+    LEFT JOIN users u ON u.id = r.changed_by
+    LEFT JOIN jobs j ON j.id = r.job_id
+"""
+
+
+def _revisions(cur: sqlite3.Cursor) -> list[dict]:
+    revisions = []
+    for row in cur:
+        rev = dict(row)
+        rev["changes"] = json.loads(rev["changes"])
+        title = rev["changes"].get("title")
+        rev["title"] = rev.pop("current_title") or (
+            title and (title[1] if title[1] is not None else title[0])
+        )
+        rev["restorable"] = bool(rev["restorable"])
+        revisions.append(rev)
+    return revisions
+
+
+def for_job(conn: sqlite3.Connection, job_id: int) -> list[dict]:
+    """Return every revision of ``job_id``, newest first."""
+    revisions = _revisions(
+        conn.execute(f"{_SELECT} WHERE r.job_id = ? ORDER BY r.id DESC", (job_id,))
+    )
+    # updates of a since-deleted job only carry a title if they changed it
+    title = next((r["title"] for r in revisions if r["title"]), None)
+    for rev in revisions:
+        rev["title"] = rev["title"] or title
+    return revisions
+
+
+def for_days(
+    conn: sqlite3.Connection,
+    start: date,
+    end: date,
+    since: str | None = None,
+    limit: int = PAGE_SIZE,
+) -> list[dict]:
+    """Return revisions that touched any day from ``start`` to ``end``, newest first.
+
+    A revision touches the days the job covered after the change and, for a move or delete, the days it covered before.
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+        start (date): First day of the range.
+        end (date): Last day of the range; at most ``MAX_DAYS`` days after ``start``.
+        since (str | None, optional): Only revisions made at or after this UTC timestamp (``YYYY-MM-DD[ HH:MM:SS]``). Defaults to None.
+        limit (int, optional): Most revisions returned. Defaults to ``PAGE_SIZE``.
+
+    Returns:
+        list[dict]: Decoded revisions.
+    """
+    where = [
+        "r.id IN (SELECT revision_id FROM job_revision_days WHERE day BETWEEN ? AND ?)"
+    ]
+    params: list = [start.toordinal(), end.toordinal()]
+    if since:
+        where.append("r.changed_at >= ?")
+        params.append(since)
+    return _revisions(
+        conn.execute(
+            f"{_SELECT} WHERE {' AND '.join(where)} ORDER BY r.id DESC LIMIT ?",
+            (*params, limit),
+        )
+    )
+
+
+def restore(
+    conn: sqlite3.Connection, job_id: int, user_id: int | None
+) -> tuple[dict, list]:
+    """Re-insert a deleted job, with its original id, from its delete revision.
+
+    The job is restored as it was when deleted, stamped ``last_modified`` by ``user_id``.  A technician, series or user it referred to that has since been removed is left empty.  A locked day in its span refuses the restore; other conflicts (time off, double booking) are returned for the caller to report, since the job was booked over them before.
+
+    Args:
+        conn (sqlite3.Connection): Writer connection; the caller commits.
+        job_id (int): Id of the deleted job.
+        user_id (int | None): Restoring user.
+
+    Returns:
+        tuple[dict, list]: ``(values, conflicts)``: the restored column values and any ``utils.conflicts.Conflict`` found.
+
+    Raises:
+        ValueError: The job is not deleted, or its span has a locked day.  The message is user-facing.
+    """
+    latest = conn.execute(
+        "SELECT action, changes FROM job_revisions WHERE job_id = ? ORDER BY id DESC LIMIT 1",
+        (job_id,),
+    ).fetchone()
+    if latest is None or latest["action"] != "delete":
+        raise ValueError(f"Job {job_id} has no deletion to restore.")
+    values = {column: pair[0] for column, pair in json.loads(latest["changes"]).items()}
+    for column, table in _REFERENCES.items():
+        ref = values.get(column)
+        if (
+            ref is not None
+            and not conn.execute(
+                f"SELECT 1 FROM {table} WHERE id = ?", (ref,)
+            ).fetchone()
+        ):
+            values[column] = None
+
+    start = date.fromisoformat(values["start_date"])
+    end = date.fromisoformat(values.get("end_date") or values["start_date"])
+    found = conflicts.check(
+        conn,
+        start,
+        end,
+        values.get("technician_id"),
+        values.get("two_man") or 0,
+        values.get("start_time"),
+        values.get("end_time"),
+        exclude_job_id=job_id,
+    )
+    blocking = [c for c in found if c.kind in conflicts.BLOCKING]
+    if blocking:
+        raise ValueError(" ".join(c.message for c in blocking))
+
+    values.pop("last_modified", None)
+    values["id"] = job_id
+    values["last_modified_by"] = user_id
+    columns = ", ".join(values)
+    conn.execute(
+        f"INSERT INTO jobs ({columns}, last_modified) "
+        f"VALUES ({', '.join('?' * len(values))}, CURRENT_TIMESTAMP)",
+        tuple(values.values()),
+    )
+    return values, found
@@ -0,0 +1,250 @@
+"""Bulk job import from CSV or JSONL.
+
+Provides:
+    - ``read_rows(stream, fmt)``: stream rows from a CSV (header row) or JSONL text stream as form-style dicts.
+    - ``import_jobs(conn, rows, created_by=None, chunk_size=500, allow_conflicts=False)``: validate and insert rows in chunked transactions; returns an ``ImportReport``.
+
+Notes:
+    - Columns/keys are the add-job form fields (``start_date``, ``end_date``, ``title``, ``job_type``, ``custom_type``, ``price``, ``start_time``, ``end_time``, ``time_range``, ``technician_id`` (id or ``"__BOTH__"``), ``rei_quantity``, ``rei_zip``, ``notes``, ``exclusion_subtype``, ``fumigation_type``, ``target_pest``, ``custom_pest``).
+    - Every row goes through ``compose_job_payload`` and the conflict rules of ``POST /add_job``: a locked day anywhere in the row's span rejects it, and so do technician conflicts (time off, double booking, two-man crew shortage from ``utils.conflicts``) unless ``allow_conflicts`` is set, like the form's "Book anyway".
+    - Per chunk, ZIPs are resolved in one pass and locks are read with one range query covering every row's span.  Rows with a technician or a two-man crew are checked with ``conflicts.check`` and inserted one by one, so later rows are checked against earlier ones from the same file; the rest are inserted with a single ``executemany``.  The chunk is committed together.  A bad row is reported and skipped; it never aborts the chunk.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from utils import conflicts
+from utils.job_form import compose_job_payload, lookup_zipcodes, parse_date
+
+INSERT_SQL = """
+    INSERT INTO jobs (
+        title, job_type, price, start_date, end_date,
+        start_time, end_time, time_range, notes,
+        created_by, technician_id, two_man,
+        rei_quantity, rei_zip, rei_city_name,
+        exclusion_subtype,
+        fumigation_type, target_pest, custom_pest
+    ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import run.
+
+    Attributes:
+        total (int): Rows read.
+        inserted (int): Rows written.
+        errors (list[tuple[int, str]]): ``(row_number, message)`` for rejected rows; row numbers are 1-based data rows.
+        seconds (float): Wall time for the run.
+    """
+
+    total: int = 0
+    inserted: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput over all rows read."""
+        return self.total / self.seconds if self.seconds else 0.0
+
+
+def read_rows(stream: IO, fmt: str) -> Iterator[dict]:
+    """Yield form-style dicts from a CSV or JSONL stream without loading it all.
+
+    Args:
+        stream (IO): Text or binary stream.  Binary streams are decoded as UTF-8 (BOM tolerated).
+        fmt (str): ``"csv"`` or ``"jsonl"``.
+
+    Raises:
+        ValueError: Unknown ``fmt``.
+
+    Yields:
+        dict: One row with string values, shaped like ``request.form`` (missing/null fields are absent).
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {k.strip(): v for k, v in row.items() if k and v is not None}
+    elif fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"__error__": f"Invalid JSON: {e.msg}"}
+                continue
+            if not isinstance(obj, dict):
+                yield {"__error__": "Expected a JSON object."}
+                continue
+            yield {k: str(v) for k, v in obj.items() if v is not None}
+    else:
+        raise ValueError(f"Unsupported import format: {fmt!r}")
+
+
+def _locked_dates(cur, rows: list[dict]) -> set[str]:
+    """Return locked ISO dates between the earliest start and the latest end date in ``rows``."""
+    days = [
+        d
+        for r in rows
+        for d in (parse_date(r.get("start_date")), parse_date(r.get("end_date")))
+        if d
+    ]
+    if not days:
+        return set()
+    cur.execute(
+        "SELECT date FROM locks WHERE date BETWEEN ? AND ?",
+        (min(days).isoformat(), max(days).isoformat()),
+    )
+    return {row[0] for row in cur.fetchall()}
+
+
+def _locked_in_span(locked: set[str], start: date, end: date) -> str | None:
+    """Return the first locked ISO date from ``start`` to ``end``, if any."""
+    day = start
+    while day <= end:
+        if day.isoformat() in locked:
+            return day.isoformat()
+        day += timedelta(days=1)
+    return None
+
+
+def import_jobs(
+    conn,
+    rows: Iterable[dict],
+    created_by: int | None = None,
+    chunk_size: int = 500,
+    allow_conflicts: bool = False,
+) -> ImportReport:
+    """Validate and insert jobs in chunked transactions.
+
+    Args:
+        conn (sqlite3.Connection): Read-write connection.  Each chunk is committed before the next is read.
+        rows (Iterable[dict]): Form-style rows, e.g. from ``read_rows``.
+        created_by (int | None, optional): ``users.id`` stamped on every job. Defaults to None.
+        chunk_size (int, optional): Rows per transaction. Defaults to 500.
+        allow_conflicts (bool, optional): Import rows despite technician conflicts ("Book anyway"); locked days still reject. Defaults to False.
+
+    Returns:
+        ImportReport: Counts, per-row errors and timing.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    cur = conn.cursor()
+    rows = iter(rows)
+    row_no = 0
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        cities = lookup_zipcodes(r.get("rei_zip") for r in chunk)
+        locked = _locked_dates(cur, chunk)
+        batch = []
+        checked = 0
+        for row in chunk:
+            row_no += 1
+            report.total += 1
+            if "__error__" in row:
+                report.errors.append((row_no, row["__error__"]))
+                continue
+
+            start_raw = row.get("start_date")
+            start_date = parse_date(start_raw)
+            if not start_date:
+                report.errors.append((row_no, "Start date is required."))
+                continue
+            end_raw = row.get("end_date") or start_raw
+            end_date = parse_date(end_raw)
+            if end_date and end_date < start_date:
+                report.errors.append((row_no, "End date cannot be before start date."))
+                continue
+
+            try:
+                payload, err = compose_job_payload(
+                    row, cur, start_date, end_date, zip_lookup=cities.get
+                )
+            except ValueError:
+                err = "Invalid time value."
+            if err:
+                report.errors.append((row_no, err))
+                continue
+            last_day = date.fromisoformat(payload["end_date"] or payload["start_date"])
+            locked_day = _locked_in_span(locked, start_date, last_day)
+            if locked_day:
+                report.errors.append(
+                    (row_no, f"{locked_day} is locked.  Cannot add job.")
+                )
+                continue
+
+            values = (
+                payload["title"],
+                payload["job_type"],
+                payload["price"],
+                payload["start_date"],
+                payload["end_date"],
+                payload["start_time"],
+                payload["end_time"],
+                payload["time_range"],
+                payload["notes"],
+                created_by,
+                payload["technician_id"],
+                payload["two_man"],
+                payload["rei_quantity"],
+                payload["rei_zip"],
+                payload["rei_city_name"],
+                payload["exclusion_subtype"],
+                payload["fumigation_type"],
+                payload["target_pest"],
+                payload["custom_pest"],
+            )
+            if not (payload["technician_id"] or payload["two_man"]):
+                # unassigned jobs never take part in technician conflicts
+                batch.append(values)
+                continue
+            found = conflicts.check(
+                conn,
+                start_date,
+                last_day,
+                payload["technician_id"],
+                payload["two_man"],
+                payload["start_time"],
+                payload["end_time"],
+            )
+            blocking = [
+                c for c in found if c.kind in conflicts.BLOCKING or not allow_conflicts
+            ]
+            if blocking:
+                report.errors.append((row_no, "  ".join(c.message for c in blocking)))
+                continue
+            try:
+                # inserted now so the rows after it are checked against it
+                cur.execute(INSERT_SQL, values)
+            except Exception:
+                conn.rollback()
+                raise
+            checked += 1
+
+        try:
+            if batch:
+                cur.executemany(INSERT_SQL, batch)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        report.inserted += checked + len(batch)
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,240 @@
+"""Full-text job search over the ``jobs_fts`` index (migration 0011).
+
+Provides:
+    - ``available(conn)``: whether the FTS5 index exists in this database.
+    - ``match_expression(text)``: turn what the user typed into a safe FTS5 query.
+    - ``search(conn, text, ...)``: ranked or date-ordered results with keyset pagination, and whether ranking was limited to the newest matches.
+    - ``snippets(conn, expression, ids)``: highlighted excerpts for one page of results.
+
+Notes:
+    - Every word must match (in any indexed column); a word ending in ``*`` matches as a prefix (``term*``).  Quotes and FTS5 operators in the input are treated as plain text.
+    - ``sort="rank"`` orders by ``bm25`` (title and technician weigh most); ``sort="date"`` orders newest first.  Both page with a keyset cursor (``after``) over ``(sort value, id)`` rather than ``OFFSET``, so later pages cost the same as the first.
+    - The date filter keeps jobs overlapping ``[date_from, date_to]`` using the integer ``start_day`` / ``end_day`` columns.
+    - Only the live database is indexed; jobs moved to yearly archives (``utils/archive.py``) are not searched.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from datetime import date
+
+SEARCH_PAGE_SIZE = 25
+# Above this many matches, rank only the newest ones (see ``search``).
+SEARCH_RANK_WINDOW = 5000
+SORTS = ("rank", "date")
+
+# bm25 weights, in jobs_fts column order:
+# title, notes, target_pest, custom_pest, rei_city_name, technician
+_WEIGHTS = "10.0, 1.0, 3.0, 3.0, 2.0, 5.0"
+_WORD = re.compile(r"[^\s\"]+")
+SNIPPET_OPEN, SNIPPET_CLOSE = "\x02", "\x03"
+
+
+def available(conn: sqlite3.Connection) -> bool:
+    """Return whether ``jobs_fts`` exists (FTS5 was available when migrating)."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def match_expression(text: str) -> str | None:
+    """Build an FTS5 ``MATCH`` expression from free text.
+
+    Each word becomes a quoted string (so ``AND``, ``NEAR``, ``-`` or ``:`` are literal), words are ANDed, and a trailing ``*`` makes that word a prefix query.
+
+    Args:
+        text (str): Search box input.
+
+    Returns:
+        str | None: The expression, or ``None`` if there is nothing to search for.
+    """
+    terms = []
+    for word in _WORD.findall(text or ""):
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " AND ".join(terms) or None
+
+
+def _parse_cursor(after: str | None, sort: str):
+    """Return ``(key, id, plan)`` from a page cursor, or ``None`` if absent or malformed.
+
+    ``key`` is the last row's score (``rank``) or ``start_day`` (``date``); ``plan`` is the rank window floor, or ``1`` if the ``date`` plan probes per row.
+    """
+    if not after:
+        return None
+    try:
+        key, job_id, plan = after.split(",")
+        return (float(key) if sort == "rank" else int(key)), int(job_id), int(plan)
+    except ValueError:
+        return None
+
+
+def _rank_floor(conn: sqlite3.Connection, date_where: list[str], params: dict) -> int:
+    """Return the rowid of the ``SEARCH_RANK_WINDOW``-th newest match passing the date filter (0 if there are fewer)."""
+    if date_where:
+        sql = f"""
+            SELECT m.rowid FROM jobs_fts m JOIN jobs j ON j.id = m.rowid
+            WHERE jobs_fts MATCH :match AND {" AND ".join(date_where)}
+            ORDER BY m.rowid DESC LIMIT 1 OFFSET :offset
+        """
+    else:
+        sql = """
+            SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH :match
+            ORDER BY rowid DESC LIMIT 1 OFFSET :offset
+        """
+    row = conn.execute(sql, {**params, "offset": SEARCH_RANK_WINDOW - 1}).fetchone()
+    return row[0] if row else 0
+
+
+def search(
+    conn: sqlite3.Connection,
+    text: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    sort: str = "rank",
+    after: str | None = None,
+    limit: int = SEARCH_PAGE_SIZE,
+) -> tuple[list[sqlite3.Row], dict[int, str], str | None, bool]:
+    """Find jobs matching ``text``.
+
+    The plan depends on how many jobs match (an index-only count).  Up to ``SEARCH_RANK_WINDOW`` matches are joined, filtered and sorted directly.  Beyond that, ``rank`` scores only the newest ``SEARCH_RANK_WINDOW`` matches that pass the date filter (the window is pinned in the cursor and reported as ``truncated``, so the page can suggest narrowing the dates), and ``date`` walks ``jobs`` newest-first by ``start_day`` and probes the index per row, stopping once the page is full.
+
+    Args:
+        conn (sqlite3.Connection): Request connection.
+        text (str): Search box input (see ``match_expression``).
+        date_from (date | None, optional): Only jobs ending on or after this day. Defaults to None.
+        date_to (date | None, optional): Only jobs starting on or before this day. Defaults to None.
+        sort (str, optional): ``"rank"`` (best match first) or ``"date"`` (newest first). Defaults to ``"rank"``.
+        after (str | None, optional): Cursor from the previous page. Defaults to None.
+        limit (int, optional): Page size. Defaults to ``SEARCH_PAGE_SIZE``.
+
+    Returns:
+        tuple[list[sqlite3.Row], dict[int, str], str | None, bool]: The page of jobs (with ``score``; ``None`` on the per-row ``date`` plan), their snippets (see ``snippets``), the cursor for the next page (``None`` on the last page), and ``truncated``: whether older matches were left out of the ranking.
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return [], {}, None, False
+    if sort not in SORTS:
+        sort = "rank"
+
+    params = {
+        "match": expression,
+        "lo": date_from.toordinal() if date_from else None,
+        "hi": date_to.toordinal() if date_to else None,
+        "limit": limit + 1,
+    }
+    date_where = []
+    if params["lo"] is not None:
+        date_where.append("j.end_day >= :lo")
+    if params["hi"] is not None:
+        date_where.append("j.start_day <= :hi")
+    where = list(date_where)
+
+    cursor = _parse_cursor(after, sort)
+    if cursor:
+        params["key"], params["id"], plan = cursor
+    else:
+        matches = conn.execute(
+            "SELECT COUNT(*) FROM jobs_fts WHERE jobs_fts MATCH :match", params
+        ).fetchone()[0]
+        many = matches > SEARCH_RANK_WINDOW
+        if sort == "rank":
+            plan = _rank_floor(conn, date_where, params) if many else 0
+        else:
+            plan = int(many)
+
+    columns = """
+            j.id,
+            j.title,
+            j.job_type,
+            j.start_date,
+            j.end_date,
+            j.start_day,
+            j.rei_city_name,
+            CASE WHEN j.two_man = 1 THEN 'Two Man' ELSE t.name END AS technician"""
+
+    if sort == "date":
+        if cursor:
+            where.append("(j.start_day, j.id) < (:key, :id)")
+        if not plan:
+            # few matches: join them all and sort
+            sql = f"""
+                SELECT {columns}, NULL AS score
+                FROM jobs_fts m
+                JOIN jobs j ON j.id = m.rowid
+                LEFT JOIN technicians t ON t.id = j.technician_id
+                WHERE jobs_fts MATCH :match {"".join(" AND " + w for w in where)}
+                ORDER BY j.start_day DESC, j.id DESC
+                LIMIT :limit
+            """
+        else:
+            # many matches: newest jobs first, probing the index until the page fills
+            sql = f"""
+                SELECT {columns}, NULL AS score
+                FROM jobs j
+                LEFT JOIN technicians t ON t.id = j.technician_id
+                WHERE EXISTS (
+                    SELECT 1 FROM jobs_fts WHERE jobs_fts MATCH :match AND rowid = j.id
+                ) {"".join(" AND " + w for w in where)}
+                ORDER BY j.start_day DESC, j.id DESC
+                LIMIT :limit
+            """
+    else:
+        if cursor:
+            where.append("(m.score, j.id) > (:key, :id)")
+        params["floor"] = plan
+        sql = f"""
+            WITH m AS (
+                SELECT rowid AS id, bm25(jobs_fts, {_WEIGHTS}) AS score
+                FROM jobs_fts
+                WHERE jobs_fts MATCH :match AND rowid >= :floor
+            )
+            SELECT {columns}, m.score
+            FROM m
+            JOIN jobs j ON j.id = m.id
+            LEFT JOIN technicians t ON t.id = j.technician_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY m.score, j.id
+            LIMIT :limit
+        """
+    rows = conn.execute(sql, params).fetchall()
+
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        key = repr(last["score"]) if sort == "rank" else last["start_day"]
+        next_after = f"{key},{last['id']},{plan}"
+    truncated = sort == "rank" and plan > 0
+    return (
+        rows,
+        snippets(conn, expression, [row["id"] for row in rows]),
+        next_after,
+        truncated,
+    )
+
+
+def snippets(
+    conn: sqlite3.Connection, expression: str, ids: list[int]
+) -> dict[int, str]:
+    """Return ``{job_id: snippet}`` for one page of results.
+
+    Run separately from the ranking query so snippets are built for the rows shown, not for every match.  FTS5 does not use ``rowid IN (...)`` to narrow a scan, so each row is looked up with ``rowid = ?`` (an index seek).  Matched terms are wrapped in ``SNIPPET_OPEN`` / ``SNIPPET_CLOSE``.
+    """
+    result = {}
+    for job_id in ids:
+        row = conn.execute(
+            """
+            SELECT snippet(jobs_fts, -1, char(2), char(3), ' ... ', 12)
+            FROM jobs_fts
+            WHERE jobs_fts MATCH ? AND rowid = ?
+            """,
+            (expression, job_id),
+        ).fetchone()
+        if row:
+            result[job_id] = row[0]
+    return result
@@ -0,0 +1,430 @@
+"""Recurring job series: expand a recurrence rule into concrete jobs and edit "this and following" in one statement.
+
+Provides:
+    - ``SeriesRule``: frequency, interval, count / until and holiday / skip handling.
+    - ``rule_from_form(form)``: read the add-job form's Repeat fields.
+    - ``occurrences(start, rule)``: candidate visit dates, before skip rules.
+    - ``plan(start, rule, locked, state)``: apply skip rules to the candidates.
+    - ``plan_series(conn, start, rule, state)``: the visits a series would get, after one lock range query.
+    - ``create_series(conn, payload, rule, created_by)``: store the series and insert all of its jobs with one ``executemany`` in one transaction.
+    - ``following(conn, series_id, from_day)``: a visit and all later ones, for checking a change before it is applied.
+    - ``update_following(conn, series_id, from_day, ...)``: change or move every job of a series from one visit on with a single ``UPDATE``.
+    - ``delete_following(conn, series_id, from_day)``: remove a visit and all later ones with a single ``DELETE``, keeping those on locked days.
+
+Notes:
+    - Visits are ordinary ``jobs`` rows linked by ``jobs.series_id`` (migration 0012); ``(series_id, start_day)`` is indexed, so "this and following" is one index range however long the series is.
+    - Monthly series keep the first visit's day of the month, clamped to shorter months (Jan 31 -> Feb 28 -> Mar 31).
+    - Locked days never get a visit (as with single jobs); holidays are skipped when ``skip_holidays`` is set.  ``count`` limits candidate dates: with ``on_skip="drop"`` a skipped visit is dropped, not replaced.  With ``"next"`` it moves to the next free day, as long as that is within ``SKIP_SEARCH_DAYS`` and before the following visit.
+    - A series expands to at most ``SERIES_MAX_JOBS`` visits.
+"""
+
+from __future__ import annotations
+
+import calendar
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator, Mapping
+
+from utils.holidays_util import is_holiday
+
+SERIES_MAX_JOBS = int(os.environ.get("SERIES_MAX_JOBS", "366"))
+SKIP_SEARCH_DAYS = 7
+FREQUENCIES = ("daily", "weekly", "monthly")
+ON_SKIP = ("drop", "next")
+
+# Fields a "this and following" edit may change; dates move through the shift arguments instead.
+SERIES_COLUMNS = (
+    "title",
+    "job_type",
+    "price",
+    "start_time",
+    "end_time",
+    "time_range",
+    "notes",
+    "technician_id",
+    "two_man",
+    "rei_quantity",
+    "rei_zip",
+    "rei_city_name",
+    "exclusion_subtype",
+    "fumigation_type",
+    "target_pest",
+    "custom_pest",
+)
+
+INSERT_SQL = """
+    INSERT INTO jobs (
+        title, job_type, price, start_date, end_date,
+        start_time, end_time, time_range, notes,
+        created_by, technician_id, two_man,
+        rei_quantity, rei_zip, rei_city_name,
+        exclusion_subtype,
+        fumigation_type, target_pest, custom_pest,
+        series_id
+    ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+
+@dataclass(frozen=True)
+class SeriesRule:
+    """How a series repeats.
+
+    Attributes:
+        freq (str): ``"daily"``, ``"weekly"`` or ``"monthly"``.
+        interval (int): Repeat every ``interval`` days / weeks / months.
+        count (int | None): Number of candidate visits, including the first.
+        until (date | None): Last day a visit may start on.
+        skip_holidays (bool): Skip visits that start on a holiday.
+        on_skip (str): ``"drop"`` skipped visits or move them to the ``"next"`` free day.
+    """
+
+    freq: str
+    interval: int = 1
+    count: int | None = None
+    until: date | None = None
+    skip_holidays: bool = False
+    on_skip: str = "drop"
+
+
+def rule_from_form(form: Mapping, start: date) -> tuple[SeriesRule | None, str | None]:
+    """Parse the Repeat fields of the add-job form.
+
+    Args:
+        form (Mapping): ``request.form`` (``repeat_freq``, ``repeat_interval``, ``repeat_count``, ``repeat_until``, ``skip_holidays``, ``on_skip``).
+        start (date): First visit, used to validate ``repeat_until``.
+
+    Returns:
+        tuple[SeriesRule | None, str | None]: ``(rule, None)``, ``(None, None)`` when the job does not repeat, or ``(None, error_message)``.
+    """
+    freq = (form.get("repeat_freq") or "").strip().lower()
+    if not freq:
+        return None, None
+    if freq not in FREQUENCIES:
+        return None, "Unknown repeat frequency."
+    try:
+        interval = int(form.get("repeat_interval") or 1)
+        count_raw = (form.get("repeat_count") or "").strip()
+        count = int(count_raw) if count_raw else None
+    except ValueError:
+        return None, "Repeat interval and count must be whole numbers."
+    until_raw = (form.get("repeat_until") or "").strip()
+    try:
+        until = date.fromisoformat(until_raw) if until_raw else None
+    except ValueError:
+        return None, "Repeat until must be a date."
+    if interval < 1 or (count is not None and count < 1):
+        return None, "Repeat interval and count must be at least 1."
+    if count is None and until is None:
+        return None, "A repeating job needs a number of visits or an end date."
+    if until is not None and until < start:
+        return None, "Repeat until cannot be before the start date."
+    on_skip = (form.get("on_skip") or "drop").strip()
+    return (
+        SeriesRule(
+            freq=freq,
+            interval=interval,
+            count=count,
+            until=until,
+            skip_holidays=bool(form.get("skip_holidays")),
+            on_skip=on_skip if on_skip in ON_SKIP else "drop",
+        ),
+        None,
+    )
+
+
+def _add_months(start: date, months: int) -> date:
+    """Return ``start`` moved by ``months``, clamping the day to the target month's length."""
+    index = start.year * 12 + start.month - 1 + months
+    year, month = divmod(index, 12)
+    day = min(start.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day)
+
+
+def occurrences(start: date, rule: SeriesRule) -> Iterator[date]:
+    """Yield candidate visit dates from ``start`` (inclusive), before skip rules.
+
+    Stops after ``rule.count`` dates, past ``rule.until``, or at ``SERIES_MAX_JOBS``, whichever comes first.
+    """
+    limit = min(rule.count or SERIES_MAX_JOBS, SERIES_MAX_JOBS)
+    for n in range(limit):
+        if rule.freq == "monthly":
+            day = _add_months(start, n * rule.interval)
+        else:
+            step = 7 * rule.interval if rule.freq == "weekly" else rule.interval
+            day = start + timedelta(days=n * step)
+        if rule.until is not None and day > rule.until:
+            return
+        yield day
+
+
+def plan(
+    start: date, rule: SeriesRule, locked: set[str], state: str | None = None
+) -> tuple[list[date], list[date]]:
+    """Apply the rule's skip rules to its candidate dates.
+
+    Args:
+        start (date): First candidate visit.
+        rule (SeriesRule): Recurrence and skip rules.
+        locked (set[str]): Locked ISO dates covering the candidates (and ``SKIP_SEARCH_DAYS`` past the last one).
+        state (str | None, optional): State code for holidays (see ``utils.holidays_util``). Defaults to None.
+
+    Returns:
+        tuple[list[date], list[date]]: ``(visits, skipped)``; ``skipped`` holds the candidate dates that got no visit.
+    """
+
+    def blocked(day: date) -> bool:
+        return day.isoformat() in locked or (
+            rule.skip_holidays and is_holiday(day, state) is not None
+        )
+
+    candidates = list(occurrences(start, rule))
+    visits: list[date] = []
+    skipped: list[date] = []
+    for i, day in enumerate(candidates):
+        if not blocked(day):
+            visits.append(day)
+            continue
+        if rule.on_skip == "next":
+            horizon = day + timedelta(days=SKIP_SEARCH_DAYS)
+            if i + 1 < len(candidates):
+                horizon = min(horizon, candidates[i + 1] - timedelta(days=1))
+            moved = day + timedelta(days=1)
+            while moved <= horizon and blocked(moved):
+                moved += timedelta(days=1)
+            if moved <= horizon:
+                visits.append(moved)
+                continue
+        skipped.append(day)
+    return visits, skipped
+
+
+def _locked_between(cur: sqlite3.Cursor, first: date, last: date) -> set[str]:
+    """Return locked ISO dates in ``[first, last]`` with one range query."""
+    cur.execute(
+        "SELECT date FROM locks WHERE date BETWEEN ? AND ?",
+        (first.isoformat(), last.isoformat()),
+    )
+    return {row[0] for row in cur.fetchall()}
+
+
+def plan_series(
+    conn: sqlite3.Connection, start: date, rule: SeriesRule, state: str | None = None
+) -> tuple[list[date], list[date]]:
+    """Plan a series' visits from the live locks, read with one range query.
+
+    Returns:
+        tuple[list[date], list[date]]: ``(visits, skipped)`` as from ``plan``.
+    """
+    candidates = list(occurrences(start, rule))
+    locked = _locked_between(
+        conn.cursor(),
+        candidates[0],
+        candidates[-1] + timedelta(days=SKIP_SEARCH_DAYS),
+    )
+    return plan(start, rule, locked, state)
+
+
+def create_series(
+    conn: sqlite3.Connection,
+    payload: dict,
+    rule: SeriesRule,
+    created_by: int | None = None,
+    state: str | None = None,
+    planned: tuple[list[date], list[date]] | None = None,
+) -> tuple[int | None, list[date], list[date]]:
+    """Store a series and insert one job per visit in a single transaction.
+
+    Every visit is inserted with one ``executemany``.  Multi-day jobs keep their duration on every visit.
+
+    Args:
+        conn (sqlite3.Connection): Read-write connection; committed on success, rolled back on error.
+        payload (dict): First visit as built by ``utils.job_form.compose_job_payload``.
+        rule (SeriesRule): Recurrence and skip rules.
+        created_by (int | None, optional): ``users.id`` stamped on the series and its jobs. Defaults to None.
+        state (str | None, optional): State code for holiday skipping. Defaults to None.
+        planned (tuple[list[date], list[date]] | None, optional): ``(visits, skipped)`` from ``plan_series`` when the caller has already checked them; planned here otherwise. Defaults to None.
+
+    Returns:
+        tuple[int | None, list[date], list[date]]: ``(series_id, visits, skipped)``.  ``series_id`` is ``None`` (and nothing is written) when every visit was skipped.
+    """
+    start = date.fromisoformat(payload["start_date"])
+    end = date.fromisoformat(payload["end_date"] or payload["start_date"])
+    duration = end - start
+
+    cur = conn.cursor()
+    visits, skipped = planned or plan_series(conn, start, rule, state)
+    if not visits:
+        return None, visits, skipped
+
+    try:
+        cur.execute(
+            """
+            INSERT INTO job_series (
+                freq, interval, count, until,
+                skip_holidays, on_skip, created_by
+            ) VALUES (?,?,?,?,?,?,?)
+            """,
+            (
+                rule.freq,
+                rule.interval,
+                rule.count,
+                rule.until.isoformat() if rule.until else None,
+                int(rule.skip_holidays),
+                rule.on_skip,
+                created_by,
+            ),
+        )
+        series_id = cur.lastrowid
+        cur.executemany(
+            INSERT_SQL,
+            [
+                (
+                    payload["title"],
+                    payload["job_type"],
+                    payload["price"],
+                    day.isoformat(),
+                    (day + duration).isoformat(),
+                    payload["start_time"],
+                    payload["end_time"],
+                    payload["time_range"],
+                    payload["notes"],
+                    created_by,
+                    payload["technician_id"],
+                    payload["two_man"],
+                    payload["rei_quantity"],
+                    payload["rei_zip"],
+                    payload["rei_city_name"],
+                    payload["exclusion_subtype"],
+                    payload["fumigation_type"],
+                    payload["target_pest"],
+                    payload["custom_pest"],
+                    series_id,
+                )
+                for day in visits
+            ],
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return series_id, visits, skipped
+
+
+def following(
+    conn: sqlite3.Connection, series_id: int, from_day: int
+) -> list[sqlite3.Row]:
+    """Return the jobs of a series starting on or after ``from_day``, in date order.
+
+    Used to check each visit's new span before ``update_following`` moves or reassigns them.
+    """
+    return conn.execute(
+        """
+        SELECT id, start_date, end_date, technician_id, two_man, start_time, end_time
+        FROM jobs
+        WHERE series_id = ? AND start_day >= ?
+        ORDER BY start_day
+        """,
+        (series_id, from_day),
+    ).fetchall()
+
+
+def update_following(
+    conn: sqlite3.Connection,
+    series_id: int,
+    from_day: int,
+    changes: Mapping | None = None,
+    start_shift: int = 0,
+    end_shift: int = 0,
+    user_id: int | None = None,
+) -> int:
+    """Apply one edit to every job of a series starting on or after ``from_day``.
+
+    One ``UPDATE`` over the ``(series_id, start_day)`` index; the day fan-out, search and change-feed triggers follow per row as for any edit.  Conflicts are not checked here: the caller checks each visit's new span (see ``following``) first.
+
+    Args:
+        conn (sqlite3.Connection): Read-write connection; committed on success.
+        series_id (int): Series to edit.
+        from_day (int): ``start_day`` (date ordinal) of the first visit to change, usually the one being edited.
+        changes (Mapping | None, optional): New values for ``SERIES_COLUMNS``; other keys are ignored. Defaults to None.
+        start_shift (int, optional): Days to move each visit's start. Defaults to 0.
+        end_shift (int, optional): Days to move each visit's end (differs from ``start_shift`` when the duration changes). Defaults to 0.
+        user_id (int | None, optional): ``users.id`` stamped as ``last_modified_by``. Defaults to None.
+
+    Returns:
+        int: Number of jobs changed.
+    """
+    changes = {k: v for k, v in (changes or {}).items() if k in SERIES_COLUMNS}
+    assignments = [f"{column} = :{column}" for column in changes]
+    if start_shift:
+        assignments.append("start_date = date(start_date, :start_shift)")
+    if end_shift:
+        assignments.append(
+            "end_date = date(COALESCE(end_date, start_date), :end_shift)"
+        )
+    if not assignments:
+        return 0
+    assignments += ["last_modified = CURRENT_TIMESTAMP", "last_modified_by = :user_id"]
+    try:
+        cur = conn.execute(
+            f"""
+            UPDATE jobs
+            SET {", ".join(assignments)}
+            WHERE series_id = :series_id AND start_day >= :from_day
+            """,
+            {
+                **changes,
+                "start_shift": f"{start_shift:+d} days",
+                "end_shift": f"{end_shift:+d} days",
+                "user_id": user_id,
+                "series_id": series_id,
+                "from_day": from_day,
+            },
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return cur.rowcount
+
+
+def delete_following(
+    conn: sqlite3.Connection, series_id: int, from_day: int
+) -> tuple[int, int]:
+    """Delete every job of a series starting on or after ``from_day``; drop the series once it has no jobs left.
+
+    Visits with a locked day in their span are kept, as locked days cannot be edited.
+
+    Returns:
+        tuple[int, int]: ``(deleted, kept)``: jobs deleted and locked visits left in place.
+    """
+    try:
+        cur = conn.execute(
+            """
+            DELETE FROM jobs
+            WHERE series_id = ? AND start_day >= ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM locks l
+                  WHERE l.date BETWEEN jobs.start_date
+                                   AND COALESCE(jobs.end_date, jobs.start_date)
+              )
+            """,
+            (series_id, from_day),
+        )
+        kept = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE series_id = ? AND start_day >= ?",
+            (series_id, from_day),
+        ).fetchone()[0]
+        conn.execute(
+            """
+            DELETE FROM job_series
+            WHERE id = ? AND NOT EXISTS (SELECT 1 FROM jobs WHERE series_id = ?)
+            """,
+            (series_id, series_id),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return cur.rowcount, kept
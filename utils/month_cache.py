@@ -0,0 +1,153 @@
+"""In-process cache for month-view data, invalidated by per-month write generations.
+
+Provides:
+    - ``month_index(year, month)``: the ``month_generations.month`` key for a calendar month.
+    - ``versions(conn, months)`` / ``generations(conn, months)``: current generation of each month (plus the global one), and when they last changed.
+    - ``MonthCache``: bounded LRU of ``key -> (generations, value)`` with coalesced rebuilds.
+    - ``month_cache``: the process-wide instance used by ``calendar.index``.
+
+Notes:
+    - Generations live in the database (migration 0008) and are bumped by triggers, so a write from any route, CLI command or worker process invalidates exactly the months it touches; a lookup costs one primary-key read of a handful of rows.
+    - The cache holds query results, not rendered HTML: the page embeds per-session CSRF tokens, the user's name and role-dependent controls, which are all applied at render time.
+    - Concurrent misses on the same key are coalesced: one request rebuilds while the others wait on a striped lock and then reuse its result.
+    - Size via ``MONTH_CACHE_SIZE`` (default ``64`` entries); ``0`` disables caching.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Hashable, Iterable
+
+GLOBAL_MONTH = 0
+MONTH_CACHE_SIZE = int(os.environ.get("MONTH_CACHE_SIZE", "64"))
+_STRIPES = 32
+
+
+def month_index(year: int, month: int) -> int:
+    """Return the generation key for a calendar month (``year * 12 + month - 1``)."""
+    return year * 12 + month - 1
+
+
+def versions(
+    conn: sqlite3.Connection, months: Iterable[int]
+) -> tuple[tuple[int, ...], datetime | None]:
+    """Return the generations of the global row and ``months``, plus when the newest of them changed.
+
+    Months that have never been written have generation 0.
+
+    Args:
+        conn (sqlite3.Connection): Any connection to the live database.
+        months (Iterable[int]): Keys from ``month_index``.
+
+    Returns:
+        tuple[tuple[int, ...], datetime | None]: ``(global_gen, gen_for_months[0], ...)`` and the latest ``changed_at`` (UTC), or ``None`` if none of them was ever written.
+    """
+    keys = [GLOBAL_MONTH, *months]
+    marks = ",".join("?" * len(keys))
+    rows = conn.execute(
+        f"SELECT month, gen, changed_at FROM month_generations WHERE month IN ({marks})",
+        keys,
+    ).fetchall()
+    found = {row[0]: row[1] for row in rows}
+    stamps = [row[2] for row in rows if row[2] is not None]
+    changed = datetime.fromtimestamp(max(stamps), timezone.utc) if stamps else None
+    return tuple(found.get(key, 0) for key in keys), changed
+
+
+def generations(conn: sqlite3.Connection, months: Iterable[int]) -> tuple[int, ...]:
+    """Return just the generation tuple from ``versions``."""
+    return versions(conn, months)[0]
+
+
+class MonthCache:
+    """Bounded LRU keyed by an arbitrary hashable, valid while the stored generations match.
+
+    Attributes:
+        maxsize (int): Maximum number of entries; ``0`` disables storing.
+    """
+
+    def __init__(self, maxsize: int = MONTH_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[tuple, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = [threading.Lock() for _ in range(_STRIPES)]
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def _lookup(self, key: Hashable, gens: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == gens:
+                self._entries.move_to_end(key)
+                return True, entry[1]
+        return False, None
+
+    def get(
+        self,
+        conn: sqlite3.Connection,
+        key: Hashable,
+        months: Iterable[int],
+        build: Callable[[], object],
+        gens: tuple[int, ...] | None = None,
+    ):
+        """Return the cached value for ``key``, rebuilding it if any of ``months`` changed.
+
+        The generations are read before ``build`` runs, so a write that lands mid-build only makes the stored entry look older than its data and triggers one extra rebuild later -- never a stale hit.
+
+        Args:
+            conn (sqlite3.Connection): Connection used to read the generations.
+            key (Hashable): Cache key, e.g. ``(year, month)``.
+            months (Iterable[int]): ``month_index`` keys whose writes invalidate this entry.
+            build (Callable[[], object]): Produces the value on a miss.
+            gens (tuple[int, ...] | None, optional): Generations already read by the caller via ``versions``/``generations`` for the same ``months``. Defaults to None (read them here).
+
+        Returns:
+            object: The cached or freshly built value.
+        """
+        if self.maxsize <= 0:
+            return build()
+        if gens is None:
+            gens = generations(conn, months)
+        found, value = self._lookup(key, gens)
+        if found:
+            with self._lock:
+                self._hits += 1
+            return value
+
+        with self._build_locks[hash(key) % _STRIPES]:
+            found, value = self._lookup(key, gens)
+            if found:
+                with self._lock:
+                    self._coalesced += 1
+                return value
+            value = build()
+            with self._lock:
+                self._misses += 1
+                self._entries[key] = (gens, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current entry count."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+            }
+
+
+month_cache = MonthCache()
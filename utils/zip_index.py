@@ -0,0 +1,193 @@
+"""ZIP code -> city resolution and nearby-ZIP search from an in-memory index of the ``zipcodes`` dataset.
+
+Provides:
+    - ``is_zip(value)``: whether a string is a 5-digit ZIP.
+    - ``city_for(zip_code)``: one lookup.
+    - ``cities_for(zip_codes)``: many lookups at once (bulk REI entry, imports).
+    - ``coords_for(zip_code)``: a ZIP's centroid as ``(lat, lon)``.
+    - ``zips_near(zip_code, radius_miles)``: every ZIP whose centroid is within the radius, with its distance.
+    - ``warm()``: build the index on a background thread (called at app startup).
+
+Notes:
+    - ``zipcodes`` loads its whole JSON dataset on import (about a second) and ``zipcodes.matching`` filters it linearly per call.  Here the dataset is read once into a ``{zip: city}`` dict, so every lookup -- hit or miss -- is a single dict probe.
+    - The index is built lazily by the first lookup or in the background by ``warm()``; lookups made while it is building wait for it.
+    - Centroids are bucketed into a ``GRID_DEGREES`` lat/lon grid at build time, so ``zips_near`` only measures the ZIPs in the few cells overlapping the radius's bounding box (great-circle distance) instead of all ~42k.
+    - City names are title-cased once at build time.  If the dataset cannot be loaded, every lookup returns ``None`` (the REI city is left blank, as before).
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Iterable
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+GRID_DEGREES = 0.25
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+
+_index: dict[str, str | None] = {}
+_coords: dict[str, tuple[float, float]] = {}
+_grid: dict[tuple[int, int], list[tuple[str, float, float]]] = {}
+_ready = threading.Event()
+_lock = threading.Lock()
+_started = False
+
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    return math.floor(lat / GRID_DEGREES), math.floor(lon / GRID_DEGREES)
+
+
+def _build() -> None:
+    global _index, _coords, _grid
+    try:
+        import zipcodes
+
+        entries = zipcodes.list_all()
+        _index = {
+            entry["zip_code"]: entry["city"].title() if entry.get("city") else None
+            for entry in entries
+        }
+        coords, grid = {}, {}
+        for entry in entries:
+            try:
+                lat, lon = float(entry["lat"]), float(entry["long"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            coords[entry["zip_code"]] = (lat, lon)
+            grid.setdefault(_cell(lat, lon), []).append((entry["zip_code"], lat, lon))
+        _coords, _grid = coords, grid
+        logger.debug(f"ZIP index ready ({len(_index)} codes, {len(_grid)} grid cells).")
+    except Exception as e:
+        logger.error(f"Could not load the ZIP code dataset: {e}")
+    finally:
+        _ready.set()
+
+
+def _start(background: bool) -> None:
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    if background:
+        threading.Thread(target=_build, name="zip-index", daemon=True).start()
+    else:
+        _build()
+
+
+def warm() -> None:
+    """Start building the index on a background thread (no-op if already started)."""
+    _start(background=True)
+
+
+def _get_index() -> dict[str, str | None]:
+    if not _ready.is_set():
+        _start(background=False)
+        _ready.wait()
+    return _index
+
+
+def is_zip(value: str) -> bool:
+    """Return whether ``value`` is exactly five ASCII digits."""
+    return len(value) == 5 and value.isascii() and value.isdigit()
+
+
+def city_for(zip_code) -> str | None:
+    """Resolve one ZIP code to a city name.
+
+    Args:
+        zip_code: ZIP as entered (surrounding whitespace allowed).
+
+    Returns:
+        str | None: Title-cased city, or ``None`` for unknown or malformed ZIPs.
+    """
+    if not zip_code:
+        return None
+    code = str(zip_code).strip()
+    if not is_zip(code):
+        return None
+    return _get_index().get(code)
+
+
+def cities_for(zip_codes: Iterable) -> dict[str, str | None]:
+    """Resolve many ZIP codes at once.
+
+    Args:
+        zip_codes (Iterable): ZIP strings; blanks are skipped and malformed ones map to ``None``.
+
+    Returns:
+        dict[str, str | None]: ``{zip: city_or_None}`` for every distinct (stripped) input.
+    """
+    index = _get_index()
+    result: dict[str, str | None] = {}
+    for zip_code in zip_codes:
+        if not zip_code:
+            continue
+        code = str(zip_code).strip()
+        if code not in result:
+            result[code] = index.get(code) if is_zip(code) else None
+    return result
+
+
+def coords_for(zip_code) -> tuple[float, float] | None:
+    """Return a ZIP's centroid.
+
+    Args:
+        zip_code: ZIP as entered (surrounding whitespace allowed).
+
+    Returns:
+        tuple[float, float] | None: ``(lat, lon)`` in degrees, or ``None`` for unknown or malformed ZIPs.
+    """
+    if not zip_code:
+        return None
+    code = str(zip_code).strip()
+    if not is_zip(code):
+        return None
+    _get_index()
+    return _coords.get(code)
+
+
+def distance_miles(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Great-circle (haversine) distance between two ``(lat, lon)`` points, in miles."""
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(h)))
+
+
+def zips_near(zip_code, radius_miles: float) -> dict[str, float] | None:
+    """Find every ZIP whose centroid lies within ``radius_miles`` of ``zip_code``'s.
+
+    Args:
+        zip_code: Origin ZIP.
+        radius_miles (float): Search radius in miles.
+
+    Returns:
+        dict[str, float] | None: ``{zip: miles}`` including the origin itself (``0.0``), or ``None`` if the origin has no known centroid.
+    """
+    origin = coords_for(zip_code)
+    if origin is None:
+        return None
+    lat, lon = origin
+    dlat = radius_miles / MILES_PER_DEGREE_LAT
+    # degrees of longitude shrink with latitude; clamp near the poles
+    dlon = radius_miles / (
+        MILES_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01)
+    )
+    lat_lo, lon_lo = _cell(lat - dlat, lon - dlon)
+    lat_hi, lon_hi = _cell(lat + dlat, lon + dlon)
+    found = {}
+    for i in range(lat_lo, lat_hi + 1):
+        for j in range(lon_lo, lon_hi + 1):
+            for code, zlat, zlon in _grid.get((i, j), ()):
+                miles = distance_miles(origin, (zlat, zlon))
+                if miles <= radius_miles:
+                    found[code] = miles
+    return found